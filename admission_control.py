@@ -0,0 +1,217 @@
+"""
+DataX作业准入控制，按JVM堆内存和channel数量在每台worker主机上做资源预算
+
+每个DataX作业会启动一个独立的JVM，Celery只按任务数控制并发，容易在一台主机上
+同时启动多个大堆JVM导致OOM。这里在作业启动前根据jvm_params中的-Xmx和作业配置中的
+channel数申请资源，预算不足的作业交还broker稍后重试。
+"""
+
+import os
+import re
+import socket
+import time
+from typing import Dict, Any, Optional
+from config import (ADMISSION_MEMORY_BYTES, ADMISSION_MEMORY_FRACTION, ADMISSION_CHANNEL_BUDGET,
+                    ADMISSION_CHANNELS_PER_CPU, ADMISSION_JVM_OVERHEAD_BYTES,
+                    ADMISSION_LEASE_SECONDS, DATAX_DEFAULT_HEAP)
+from redis_utils import get_redis_client, RedisLease
+
+HEAP_PATTERN = re.compile(r'-Xmx(\d+)([kKmMgGtT]?)')
+SIZE_SUFFIXES = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3, 't': 1024 ** 4}
+
+# 原子地清理过期租约、统计已占用资源并在预算内登记新租约
+# 主机上没有其他作业时总是准入，避免超出预算的单个大作业永远无法执行
+ADMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local memory_budget = tonumber(ARGV[2])
+local channel_budget = tonumber(ARGV[3])
+local job_id = ARGV[4]
+local memory = tonumber(ARGV[5])
+local channels = tonumber(ARGV[6])
+local expires = tonumber(ARGV[7])
+local used_memory = 0
+local used_channels = 0
+local active = 0
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+    local lease_memory, lease_channels, lease_expires = string.match(entries[i + 1], '(%d+):(%d+):(%d+)')
+    if tonumber(lease_expires) <= now then
+        redis.call('HDEL', KEYS[1], entries[i])
+    elseif entries[i] ~= job_id then
+        used_memory = used_memory + tonumber(lease_memory)
+        used_channels = used_channels + tonumber(lease_channels)
+        active = active + 1
+    end
+end
+if active > 0 and (used_memory + memory > memory_budget or used_channels + channels > channel_budget) then
+    return 0
+end
+redis.call('HSET', KEYS[1], job_id, memory .. ':' .. channels .. ':' .. expires)
+return 1
+"""
+
+# 只续期仍然存在的租约
+RENEW_SCRIPT = """
+local lease = redis.call('HGET', KEYS[1], ARGV[1])
+if not lease then
+    return 0
+end
+local lease_memory, lease_channels = string.match(lease, '(%d+):(%d+):')
+redis.call('HSET', KEYS[1], ARGV[1], lease_memory .. ':' .. lease_channels .. ':' .. ARGV[2])
+return 1
+"""
+
+
+def parse_size(value: str, suffix: str) -> int:
+    """
+    解析JVM参数中的容量
+
+    Args:
+        value: 数值部分
+        suffix: 单位后缀（k/m/g/t，不区分大小写，可为空）
+
+    Returns:
+        字节数
+    """
+    return int(value) * SIZE_SUFFIXES[suffix.lower()]
+
+
+def parse_heap_bytes(jvm_params: Optional[str]) -> int:
+    """
+    从jvm_params中解析最大堆内存
+
+    datax.py把用户的JVM参数追加在默认参数之后，因此以最后一个-Xmx为准。
+
+    Args:
+        jvm_params: JVM参数
+
+    Returns:
+        最大堆内存（字节），未指定时为DataX默认堆大小
+    """
+    matches = HEAP_PATTERN.findall(jvm_params or '')
+    if not matches:
+        return DATAX_DEFAULT_HEAP
+    return parse_size(*matches[-1])
+
+
+def get_channel_count(job_config: Optional[Dict[str, Any]]) -> int:
+    """
+    从作业配置中获取channel数量
+
+    Args:
+        job_config: 已解析的DataX作业配置
+
+    Returns:
+        channel数量，未配置时按1计算
+    """
+    try:
+        channel = job_config['job']['setting']['speed']['channel']
+        return max(1, int(channel))
+    except (KeyError, TypeError, ValueError):
+        return 1
+
+
+def total_memory_bytes() -> Optional[int]:
+    """
+    获取本机物理内存
+
+    Returns:
+        物理内存字节数，平台不支持时返回None
+    """
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class AdmissionController:
+    """
+    worker主机的资源准入控制器，同一主机上的所有worker进程通过Redis共享资源账本
+    """
+
+    def __init__(self, hostname: Optional[str] = None):
+        """
+        初始化准入控制器
+
+        Args:
+            hostname: 主机名（可选，默认为本机主机名）
+        """
+        self.hostname = hostname or socket.gethostname()
+        self.key = f"datax:admission:{self.hostname}"
+
+        if ADMISSION_MEMORY_BYTES is not None:
+            self.memory_budget = ADMISSION_MEMORY_BYTES
+        else:
+            memory = total_memory_bytes()
+            self.memory_budget = int(memory * ADMISSION_MEMORY_FRACTION) if memory else 2 ** 62
+        self.channel_budget = ADMISSION_CHANNEL_BUDGET or (os.cpu_count() or 1) * ADMISSION_CHANNELS_PER_CPU
+
+        self._client = get_redis_client()
+        self._admit = self._client.register_script(ADMIT_SCRIPT)
+        self._renew = self._client.register_script(RENEW_SCRIPT)
+
+    def try_admit(self, job_id: str, jvm_params: Optional[str],
+                  job_config: Optional[Dict[str, Any]]) -> Optional[RedisLease]:
+        """
+        尝试为作业申请主机资源
+
+        Args:
+            job_id: 作业标识
+            jvm_params: JVM参数，用于解析堆内存
+            job_config: 已解析的作业配置，用于获取channel数量
+
+        Returns:
+            申请成功时返回租约，预算不足时返回None
+        """
+        memory_bytes = parse_heap_bytes(jvm_params) + ADMISSION_JVM_OVERHEAD_BYTES
+        channels = get_channel_count(job_config)
+        now = int(time.time())
+        admitted = self._admit(
+            keys=[self.key],
+            args=[now, self.memory_budget, self.channel_budget, job_id,
+                  memory_bytes, channels, now + ADMISSION_LEASE_SECONDS]
+        )
+        if not admitted:
+            return None
+        return RedisLease(job_id, self.renew, self.release, ADMISSION_LEASE_SECONDS / 3)
+
+    def renew(self, job_id: str) -> None:
+        """
+        续期作业的资源租约
+
+        Args:
+            job_id: 作业标识
+        """
+        self._renew(keys=[self.key], args=[job_id, int(time.time()) + ADMISSION_LEASE_SECONDS])
+
+    def release(self, job_id: str) -> None:
+        """
+        释放作业的资源租约
+
+        Args:
+            job_id: 作业标识
+        """
+        self._client.hdel(self.key, job_id)
+
+    def usage(self) -> Dict[str, int]:
+        """
+        获取本主机当前的资源占用情况
+
+        Returns:
+            包含已占用内存、channel、作业数以及预算的字典
+        """
+        now = int(time.time())
+        used_memory = used_channels = jobs = 0
+        for lease in self._client.hvals(self.key):
+            memory, channels, expires = (int(part) for part in lease.decode().split(':'))
+            if expires > now:
+                used_memory += memory
+                used_channels += channels
+                jobs += 1
+        return {
+            'jobs': jobs,
+            'memory_bytes': used_memory,
+            'memory_budget': self.memory_budget,
+            'channels': used_channels,
+            'channel_budget': self.channel_budget
+        }
@@ -0,0 +1,321 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Union
+from celery import states
+from celery_app import app, validate_datax_job
+from config import ASYNC_SUBMIT_WORKERS
+from execution_backends import CeleryExecutionBackend, CancelResult
+from job_templates import check_job_source
+from incremental_sync import check_watermark_key
+import metrics
+from logging_utils import setup_logging
+
+# 设置日志
+logger = setup_logging(__name__)
+
+
+class AsyncDataXTaskScheduler:
+    """
+    asyncio版DataX任务调度器，提供不阻塞事件循环的提交、查询、等待和取消方法
+
+    任务状态通过redis.asyncio客户端读取，等待任务结束时所有等待者共享一个Pub/Sub连接，
+    订阅结果后端在写入任务状态时发布的频道。提交和取消作业与DataXTaskScheduler一样
+    通过CeleryExecutionBackend完成，这些同步调用在专用线程池中执行。
+    """
+
+    def __init__(self, submit_workers: int = ASYNC_SUBMIT_WORKERS):
+        """
+        初始化异步任务调度器
+
+        Args:
+            submit_workers: 执行消息发布等同步调用的线程数
+        """
+        self.backend_url = app.conf.result_backend
+        if not self.backend_url.startswith(('redis://', 'rediss://')):
+            raise ValueError(f"AsyncDataXTaskScheduler需要Redis结果后端: {self.backend_url}")
+
+        self.backend = CeleryExecutionBackend()
+        self._executor = ThreadPoolExecutor(max_workers=submit_workers, thread_name_prefix='datax-submit')
+        self._redis = None
+        self._pubsub = None
+        self._listener = None
+        self._waiters = {}
+
+    async def __aenter__(self) -> 'AsyncDataXTaskScheduler':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def _client(self):
+        """
+        获取异步Redis客户端，首次调用时创建
+
+        Returns:
+            redis.asyncio.Redis实例
+        """
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.backend_url)
+        return self._redis
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """
+        在线程池中执行同步调用
+
+        Args:
+            func: 同步函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            同步函数的返回值
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def submit(self, job_config_path: Optional[str] = None, jvm_params: Optional[str] = None,
+                     job_params: Optional[str] = None, queue: str = 'celery',
+                     job_timeout: Optional[float] = None, stall_timeout: Optional[float] = None,
+                     incremental: Optional[Dict[str, Any]] = None,
+                     priority: Union[str, int, None] = None,
+                     tenant: Optional[str] = None,
+                     template: Optional[str] = None,
+                     template_params: Optional[Dict[str, Any]] = None,
+                     job_config: Optional[Dict[str, Any]] = None,
+                     quarantine: bool = False) -> str:
+        """
+        提交DataX作业执行任务，参数与DataXTaskScheduler.schedule_job_execution相同（不含validate）
+
+        Args:
+            job_config_path: DataX作业配置文件路径（可选）
+            jvm_params: JVM参数（可选）
+            job_params: 作业参数（可选）
+            queue: 任务队列名称，默认为'celery'
+            job_timeout: 作业最长运行时间（秒），为None时使用JOB_TIMEOUT，为0时不限制
+            stall_timeout: 停滞判定时间（秒），为None时使用JOB_STALL_TIMEOUT，为0时不检测
+            incremental: 增量配置（可选），见WatermarkStore.open_window
+            priority: 优先级（可选），'critical'、'high'、'normal'、'low'或0-9的数值
+            tenant: 作业所属租户（可选）
+            template: 作业模板ID（可选）
+            template_params: 模板参数（可选）
+            job_config: 内联作业配置（可选）
+            quarantine: 是否隔离脏数据（可选）
+
+        Returns:
+            任务ID
+        """
+        check_job_source(job_config_path, template, job_config)
+        if incremental:
+            check_watermark_key(job_config_path, incremental)
+        start = time.perf_counter()
+        task_id = await self._run_blocking(
+            self.backend.submit, job_config_path, jvm_params, job_params, queue,
+            job_timeout, stall_timeout, incremental, priority, tenant,
+            template, template_params, job_config, quarantine)
+        metrics.SUBMIT_SECONDS.labels(mode='async').observe(time.perf_counter() - start)
+        metrics.SUBMITTED_JOBS_TOTAL.labels(queue=queue, mode='async').inc()
+        logger.debug("已提交作业执行任务: %s, 任务ID: %s", job_config_path or template or 'inline', task_id)
+        return task_id
+
+    async def submit_validation(self, job_config_path: str, queue: str = 'celery') -> str:
+        """
+        提交DataX作业配置验证任务
+
+        Args:
+            job_config_path: DataX作业配置文件路径
+            queue: 任务队列名称，默认为'celery'
+
+        Returns:
+            任务ID
+        """
+        task = await self._run_blocking(validate_datax_job.apply_async, args=[job_config_path], queue=queue)
+        logger.debug("已提交作业验证任务: %s, 任务ID: %s", job_config_path, task.id)
+        return task.id
+
+    @staticmethod
+    def _decode_task_meta(value) -> Dict[str, Any]:
+        """
+        解析结果后端中存储的任务元数据
+
+        Args:
+            value: 结果后端中的原始值，任务尚无状态时为None
+
+        Returns:
+            包含state和info的状态信息
+        """
+        if value is None:
+            return {'state': states.PENDING, 'info': None}
+        meta = app.backend.decode_result(value)
+        return {'state': meta['status'], 'info': meta['result']}
+
+    async def get_status(self, task_id: str) -> Dict[str, Any]:
+        """
+        获取任务状态
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            包含state和info的状态信息
+        """
+        value = await self._client().get(app.backend.get_key_for_task(task_id))
+        return self._decode_task_meta(value)
+
+    async def get_statuses(self, task_ids: List[str], chunk_size: int = 1000) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取任务状态
+
+        Args:
+            task_ids: 任务ID列表
+            chunk_size: 每次MGET的键数量
+
+        Returns:
+            任务ID到状态信息的映射
+        """
+        statuses = {}
+        for start in range(0, len(task_ids), chunk_size):
+            chunk = task_ids[start:start + chunk_size]
+            values = await self._client().mget([app.backend.get_key_for_task(task_id) for task_id in chunk])
+            for task_id, value in zip(chunk, values):
+                statuses[task_id] = self._decode_task_meta(value)
+        return statuses
+
+    async def wait(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        等待任务结束
+
+        Args:
+            task_id: 任务ID
+            timeout: 最长等待时间（秒），超时抛出asyncio.TimeoutError
+
+        Returns:
+            任务结束时的状态信息
+        """
+        channel = app.backend.get_key_for_task(task_id)
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(channel, [])
+        waiters.append(future)
+        try:
+            if len(waiters) == 1:
+                await self._subscribe(channel)
+
+            # 订阅之后再读取当前状态，避免遗漏订阅前已经结束的任务
+            status = await self.get_status(task_id)
+            if status['state'] in states.READY_STATES:
+                return status
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters.remove(future)
+            if not waiters:
+                del self._waiters[channel]
+                await self._pubsub.unsubscribe(channel)
+
+    async def wait_any(self, task_ids: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        等待任意一个任务结束
+
+        Args:
+            task_ids: 任务ID列表
+            timeout: 最长等待时间（秒），超时抛出asyncio.TimeoutError
+
+        Returns:
+            已结束任务的ID到状态信息的映射（至少包含一个任务）
+        """
+        waits = {asyncio.ensure_future(self.wait(task_id)): task_id for task_id in task_ids}
+        try:
+            done, _ = await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                raise asyncio.TimeoutError()
+            return {waits[future]: future.result() for future in done}
+        finally:
+            for future in waits:
+                future.cancel()
+
+    async def wait_all(self, task_ids: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        等待全部任务结束
+
+        Args:
+            task_ids: 任务ID列表
+            timeout: 最长等待时间（秒），超时抛出asyncio.TimeoutError
+
+        Returns:
+            全部任务的ID到状态信息的映射
+        """
+        results = await asyncio.wait_for(
+            asyncio.gather(*(self.wait(task_id) for task_id in task_ids)), timeout)
+        return dict(zip(task_ids, results))
+
+    async def cancel(self, task_id: str) -> CancelResult:
+        """
+        取消任务执行，与DataXTaskScheduler.cancel_task一样由运行作业的worker终止整个DataX进程组
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            CancelResult，包含cancelled（是否已发出取消）和reaped（被终止的DataX相关进程数），
+            作为条件判断时取cancelled，与原先返回布尔值时的写法兼容
+        """
+        logger.info("取消任务执行，任务ID: %s", task_id)
+        result = await self._run_blocking(self.backend.cancel, task_id)
+        logger.info("已取消任务，任务ID: %s, 终止进程数: %s", task_id, result['reaped'])
+        return result
+
+    async def _subscribe(self, channel: bytes) -> None:
+        """
+        订阅任务结果频道，并在首次订阅后启动共享的消息监听协程
+
+        Args:
+            channel: 任务结果在结果后端中的键（即发布频道）
+        """
+        if self._pubsub is None:
+            self._pubsub = self._client().pubsub()
+        await self._pubsub.subscribe(channel)
+        if self._listener is None:
+            self._listener = asyncio.ensure_future(self._listen())
+
+    async def _listen(self) -> None:
+        """
+        读取Pub/Sub消息并唤醒对应任务的等待者
+        """
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("读取任务结果通知时发生异常: %s", e)
+                await asyncio.sleep(1)
+                continue
+
+            if message is None or message['type'] != 'message':
+                continue
+            status = self._decode_task_meta(message['data'])
+            if status['state'] not in states.READY_STATES:
+                continue
+            for future in self._waiters.get(message['channel'], []):
+                if not future.done():
+                    future.set_result(status)
+
+    async def close(self) -> None:
+        """
+        关闭Redis连接和线程池
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+批量提交作业的性能对比脚本
+
+比较逐个调用schedule_job_execution与调用schedule_jobs_bulk提交同样数量作业的耗时。
+默认使用config.py中配置的broker和结果后端，也可以通过--broker和--backend指定，
+例如使用 --broker memory:// --backend cache+memory:// 在本地对比客户端开销。
+注意：脚本只提交任务，如果有worker在监听目标队列，这些作业会被真正执行。
+"""
+
+import argparse
+import os
+import time
+
+from celery_app import app
+from tasks_scheduler import DataXTaskScheduler
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+DATAX_JOB_PATH = os.path.join(PROJECT_ROOT, 'datax', 'job', 'job.json')
+
+
+def benchmark_loop(scheduler: DataXTaskScheduler, job_config_path: str, count: int, queue: str) -> float:
+    """
+    逐个提交作业
+
+    Args:
+        scheduler: 任务调度器
+        job_config_path: DataX作业配置文件路径
+        count: 提交的作业数
+        queue: 任务队列名称
+
+    Returns:
+        耗时（秒）
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        scheduler.schedule_job_execution(job_config_path, queue=queue)
+    return time.perf_counter() - start
+
+
+def benchmark_bulk(scheduler: DataXTaskScheduler, job_config_path: str, count: int, queue: str) -> float:
+    """
+    批量提交作业
+
+    Args:
+        scheduler: 任务调度器
+        job_config_path: DataX作业配置文件路径
+        count: 提交的作业数
+        queue: 任务队列名称
+
+    Returns:
+        耗时（秒）
+    """
+    job_specs = [{'job_config_path': job_config_path} for _ in range(count)]
+    start = time.perf_counter()
+    scheduler.schedule_jobs_bulk(job_specs, queue=queue)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='对比逐个提交和批量提交DataX作业的耗时')
+    parser.add_argument('--count', type=int, default=1000, help='每种方式提交的作业数')
+    parser.add_argument('--job', default=DATAX_JOB_PATH, help='DataX作业配置文件路径')
+    parser.add_argument('--queue', default='benchmark', help='任务队列名称（建议使用无worker监听的队列）')
+    parser.add_argument('--broker', default=None, help='覆盖config.py中的broker地址')
+    parser.add_argument('--backend', default=None, help='覆盖config.py中的结果后端地址')
+    args = parser.parse_args()
+
+    if args.broker:
+        app.conf.broker_url = args.broker
+    if args.backend:
+        app.conf.result_backend = args.backend
+
+    scheduler = DataXTaskScheduler()
+
+    loop_seconds = benchmark_loop(scheduler, args.job, args.count, args.queue)
+    bulk_seconds = benchmark_bulk(scheduler, args.job, args.count, args.queue)
+
+    print("=" * 50)
+    print(f"作业数: {args.count}")
+    print(f"逐个提交: {loop_seconds:.3f}s ({args.count / loop_seconds:.0f} 个/秒)")
+    print(f"批量提交: {bulk_seconds:.3f}s ({args.count / bulk_seconds:.0f} 个/秒)")
+    print(f"加速比: {loop_seconds / bulk_seconds:.2f}x")
+    print("=" * 50)
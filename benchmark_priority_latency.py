@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+回填负载下高优先级作业排队延迟的测试脚本
+
+先以low优先级、backfill租户一次性提交大量回填作业占满集群，再按固定间隔提交少量
+high优先级、sla租户的作业，统计两类作业从提交到开始执行的排队等待时间（p50/p95/p99）。
+--mode fifo时两类作业使用相同的优先级且不区分租户，作为对照。
+
+需要Redis broker和至少一个监听--queue的worker，例如：
+    celery -A celery_app worker --loglevel=info -Q benchmark --concurrency=4
+结束时撤销尚未执行的回填作业。两种模式之间应等待worker上正在运行的作业结束。
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from celery_app import app
+from queue_metrics import summarize_waits
+from tasks_scheduler import DataXTaskScheduler
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+DATAX_JOB_PATH = os.path.join(PROJECT_ROOT, 'datax', 'job', 'job.json')
+
+
+def submit_backfill(scheduler: DataXTaskScheduler, job_config_path: str, count: int,
+                    queue: str, mode: str) -> list:
+    """
+    一次性提交回填作业
+
+    Args:
+        scheduler: 任务调度器
+        job_config_path: DataX作业配置文件路径
+        count: 回填作业数
+        queue: 任务队列名称
+        mode: 'priority'或'fifo'
+
+    Returns:
+        任务ID列表
+    """
+    spec = {'job_config_path': job_config_path, 'priority': 'low'}
+    if mode == 'priority':
+        spec['tenant'] = 'backfill'
+    return scheduler.schedule_jobs_bulk([dict(spec) for _ in range(count)], queue=queue)
+
+
+async def submit_sla(scheduler: DataXTaskScheduler, job_config_path: str, count: int,
+                     interval: float, queue: str, mode: str) -> list:
+    """
+    按固定间隔提交高优先级作业
+
+    Args:
+        scheduler: 任务调度器
+        job_config_path: DataX作业配置文件路径
+        count: 高优先级作业数
+        interval: 提交间隔（秒）
+        queue: 任务队列名称
+        mode: 'priority'时使用high优先级和sla租户，'fifo'时与回填作业相同
+
+    Returns:
+        任务ID列表
+    """
+    options = {'priority': 'high', 'tenant': 'sla'} if mode == 'priority' else {'priority': 'low'}
+    task_ids = []
+    for _ in range(count):
+        task_ids.append(scheduler.schedule_job_execution(job_config_path, queue=queue, **options))
+        await asyncio.sleep(interval)
+    return task_ids
+
+
+def collect_waits(statuses: dict) -> list:
+    """
+    从任务结果中取出排队等待时间
+
+    Args:
+        statuses: 任务ID到状态信息的映射
+
+    Returns:
+        排队等待时间列表（秒）
+    """
+    return [status['info']['queue_wait_seconds'] for status in statuses.values()
+            if isinstance(status['info'], dict) and 'queue_wait_seconds' in status['info']]
+
+
+def print_summary(label: str, waits: list) -> None:
+    """
+    打印排队等待时间统计
+
+    Args:
+        label: 作业类别
+        waits: 排队等待时间列表（秒）
+    """
+    stats = summarize_waits(waits)
+    print(f"{label}: 作业数 {stats['count']}, 平均 {stats['avg']:.2f}s, p50 {stats['p50']:.2f}s, "
+          f"p95 {stats['p95']:.2f}s, p99 {stats['p99']:.2f}s, 最大 {stats['max']:.2f}s")
+
+
+async def main(args) -> None:
+    """
+    提交回填作业和高优先级作业，等待高优先级作业结束后打印排队等待时间统计
+
+    Args:
+        args: 命令行参数
+    """
+    scheduler = DataXTaskScheduler()
+
+    start = time.perf_counter()
+    backfill_ids = submit_backfill(scheduler, args.job, args.backfill, args.queue, args.mode)
+    print(f"已提交回填作业 {len(backfill_ids)} 个，耗时 {time.perf_counter() - start:.2f}s")
+
+    sla_ids = await submit_sla(scheduler, args.job, args.sla, args.interval, args.queue, args.mode)
+    sla_statuses = await scheduler.wait_all(sla_ids, timeout=args.timeout)
+
+    # 回填作业只统计已经结束的部分，其余撤销
+    backfill_statuses = scheduler.get_task_statuses(backfill_ids)
+    finished = {task_id: status for task_id, status in backfill_statuses.items()
+                if isinstance(status['info'], dict) and 'queue_wait_seconds' in status['info']}
+    unfinished = [task_id for task_id in backfill_ids if task_id not in finished]
+    if unfinished:
+        app.control.revoke(unfinished)
+
+    print("=" * 70)
+    print(f"模式: {args.mode}, 回填作业: {args.backfill}, 高优先级作业: {args.sla}, 提交间隔: {args.interval}s")
+    print_summary("高优先级作业排队等待", collect_waits(sla_statuses))
+    print_summary("回填作业排队等待（已执行部分）", collect_waits(finished))
+    print(f"已撤销未执行的回填作业: {len(unfinished)}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='测试回填负载下高优先级作业的排队延迟')
+    parser.add_argument('--mode', choices=['priority', 'fifo'], default='priority',
+                        help='priority: 高优先级作业使用high优先级和独立租户；fifo: 与回填作业相同（对照）')
+    parser.add_argument('--backfill', type=int, default=500, help='回填作业数')
+    parser.add_argument('--sla', type=int, default=50, help='高优先级作业数')
+    parser.add_argument('--interval', type=float, default=2.0, help='高优先级作业的提交间隔（秒）')
+    parser.add_argument('--job', default=DATAX_JOB_PATH, help='DataX作业配置文件路径')
+    parser.add_argument('--queue', default='benchmark', help='任务队列名称')
+    parser.add_argument('--timeout', type=float, default=3600, help='等待高优先级作业结束的最长时间（秒）')
+    parser.add_argument('--broker', default=None, help='覆盖config.py中的broker地址')
+    parser.add_argument('--backend', default=None, help='覆盖config.py中的结果后端地址')
+    args = parser.parse_args()
+
+    if args.broker:
+        app.conf.broker_url = args.broker
+    if args.backend:
+        app.conf.result_backend = args.backend
+
+    asyncio.run(main(args))
@@ -1,90 +1,480 @@
 from celery import Celery
+import threading
+from celery.signals import (task_prerun, task_postrun, task_revoked, worker_init, worker_ready,
+                            worker_shutdown, worker_process_init, worker_process_shutdown)
+from celery.worker.control import control_command
 from datax_executor import DataXExecutor
-import logging
+from job_sharding import merge_shard_results
 import os
-from config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND, LOG_LEVEL, LOG_DIR
+import time
+from typing import List, Optional, Tuple
+from config import (CELERY_BROKER_URL, CELERY_RESULT_BACKEND, RESULT_EXPIRES,
+                    ADMISSION_CONTROL_ENABLED, ADMISSION_RETRY_DELAY,
+                    ENDPOINT_LIMIT_ENABLED, ENDPOINT_RETRY_DELAY, JOB_TIMEOUT,
+                    JOB_STALL_TIMEOUT, INCREMENTAL_RETRY_DELAY, PRIORITY_LEVELS,
+                    FAIR_SHARE_ENABLED, FAIR_SHARE_RETRY_DELAY, JOB_MAX_RETRIES)
+from admission_control import AdmissionController
+from endpoint_limiter import EndpointLimiter, extract_endpoints
+from redis_utils import RedisLease
+from process_registry import kill_registered_job, kill_orphaned_jobs
+from incremental_sync import WatermarkStore, references_watermark, build_watermark_params, check_watermark_key
+from fair_share import TenantFairShare, default_priority, priority_name
+from queue_metrics import record_queue_wait
+from job_templates import JobTemplateStore, check_job_source
+from failure_classifier import classify_exception, is_retryable, retry_delay
+import metrics
+from logging_utils import setup_logging, bind_log_context, clear_log_context, stop_logging
 
-def setup_logging():
+# 设置日志
+logger = setup_logging(__name__)
+
+# 创建Celery应用实例
+app = Celery('datax_celery')
+app.conf.broker_url = CELERY_BROKER_URL
+app.conf.result_backend = CELERY_RESULT_BACKEND
+# 结果只包含摘要和输出末尾，完整输出在作业日志存储中，结果到期后自动删除
+app.conf.result_expires = RESULT_EXPIRES
+# 任务开始执行时记录STARTED状态，PENDING只表示仍在排队（或结果已过期），DAG恢复时据此区分
+app.conf.task_track_started = True
+# Redis broker按优先级把每个队列拆分为多个列表，worker先取高优先级（数值小）的消息
+app.conf.broker_transport_options = {
+    'priority_steps': sorted(set(PRIORITY_LEVELS.values())),
+    'queue_order_strategy': 'priority'
+}
+app.conf.task_default_priority = default_priority()
+# DataX作业运行时间长，每个worker进程只预取一条消息，避免低优先级消息在worker本地排队
+app.conf.worker_prefetch_multiplier = 1
+
+# 创建全局DataX执行器实例
+datax_executor = DataXExecutor()
+
+# 创建主机资源准入控制器和数据库并发限制器
+admission_controller = AdmissionController() if ADMISSION_CONTROL_ENABLED else None
+endpoint_limiter = EndpointLimiter() if ENDPOINT_LIMIT_ENABLED else None
+# 租户公平共享控制器
+fair_share = TenantFairShare() if FAIR_SHARE_ENABLED else None
+
+# 增量作业的高水位存储
+watermark_store = WatermarkStore()
+
+# 作业配置模板库
+job_templates = JobTemplateStore()
+
+
+def acquire_job_resources(task, job_config_path: str, jvm_params: str = None,
+                          tenant: str = None, job_config: dict = None) -> List[RedisLease]:
     """
-    设置日志配置
+    在启动DataX之前为作业申请资源，任一资源不足时把任务交还broker稍后重试
+    
+    依次申请租户的运行名额（按租户权重公平共享集群）、本主机的内存/channel预算
+    （按JVM堆内存和channel数量）和作业读写的各个数据库的并发名额。延迟重试的任务不占用worker进程。
+    
+    Args:
+        task: 当前Celery任务
+        job_config_path: DataX作业配置文件路径
+        jvm_params: JVM参数（可选）
+        tenant: 作业所属租户（可选）
+        job_config: 已解析的作业配置（可选），为None时读取job_config_path
+        
+    Returns:
+        已获得的资源租约列表，Redis不可用时跳过对应的控制
     """
-    # 确保日志目录存在
-    os.makedirs(LOG_DIR, exist_ok=True)
+    if task.request.called_directly or (
+            fair_share is None and admission_controller is None and endpoint_limiter is None):
+        return []
     
-    # 获取当前模块的logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(LOG_LEVEL)
+    leases = []
+    if fair_share is not None:
+        try:
+            lease, running, share = fair_share.try_acquire(task.request.id, tenant)
+        except Exception as e:
+            logger.warning("申请租户运行名额时发生异常，跳过公平共享: %s", e)
+        else:
+            if lease is None:
+                logger.info("租户 %s 运行中的作业数 %s 已达份额 %s，%s秒后重新调度作业: %s",
+                            tenant, running, share, FAIR_SHARE_RETRY_DELAY, job_config_path)
+                metrics.TASK_RETRIES_TOTAL.labels(reason='fair_share').inc()
+                raise task.retry(countdown=FAIR_SHARE_RETRY_DELAY, max_retries=None)
+            leases.append(lease)
     
-    # 清除现有的处理器
-    logger.handlers.clear()
+    if job_config is None:
+        try:
+            job_config = datax_executor.load_job_config(job_config_path)
+        except Exception:
+            job_config = None
     
-    # 创建文件处理器
-    file_handler = logging.FileHandler(
-        os.path.join(LOG_DIR, 'celery_app.log'), 
-        encoding='utf-8'
-    )
-    file_handler.setLevel(LOG_LEVEL)
+    if admission_controller is not None:
+        try:
+            lease = admission_controller.try_admit(task.request.id, jvm_params, job_config)
+        except Exception as e:
+            # 准入控制不可用时放行作业，不影响作业执行
+            logger.warning("申请主机资源时发生异常，跳过准入控制: %s", e)
+        else:
+            if lease is None:
+                release_job_resources(leases)
+                logger.info("主机资源不足，%s秒后重新调度作业: %s", ADMISSION_RETRY_DELAY, job_config_path)
+                metrics.TASK_RETRIES_TOTAL.labels(reason='admission').inc()
+                raise task.retry(countdown=ADMISSION_RETRY_DELAY, max_retries=None)
+            leases.append(lease)
     
-    # 创建控制台处理器
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(LOG_LEVEL)
+    endpoints = extract_endpoints(job_config) if job_config else []
+    if endpoint_limiter is not None and endpoints:
+        try:
+            lease = endpoint_limiter.try_acquire(task.request.id, endpoints)
+        except Exception as e:
+            logger.warning("申请数据库并发名额时发生异常，跳过并发限制: %s", e)
+        else:
+            if lease is None:
+                release_job_resources(leases)
+                logger.info("数据库并发已满 %s，%s秒后重新调度作业: %s", endpoints, ENDPOINT_RETRY_DELAY, job_config_path)
+                metrics.TASK_RETRIES_TOTAL.labels(reason='endpoint').inc()
+                raise task.retry(countdown=ENDPOINT_RETRY_DELAY, max_retries=None)
+            leases.append(lease)
+    
+    return leases
+
+
+def open_incremental_window(task, job_config_path: str, incremental: dict,
+                            leases: List[RedisLease], job_config: dict = None) -> dict:
+    """
+    获取增量作业的运行锁并计算本次的同步区间
     
-    # 创建格式化器
-    formatter = logging.Formatter(
-        '%(asctime)s %(levelname)s %(name)s %(message)s'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+    同一增量作业正在运行时，释放已获得的资源并把任务交还broker稍后重试。
     
-    # 添加处理器到记录器
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    Args:
+        task: 当前Celery任务
+        job_config_path: DataX作业配置文件路径
+        incremental: 增量配置，见WatermarkStore.open_window
+        leases: 已获得的资源租约列表，运行锁的租约追加到其中
+        job_config: 已解析的作业配置（可选），为None时读取job_config_path
+        
+    Returns:
+        包含key、type、from、to的同步区间
+        
+    Raises:
+        ValueError: 作业配置的reader没有引用${hwm_from}，或增量配置无效
+    """
+    name = WatermarkStore.watermark_name(job_config_path, incremental)
+    try:
+        # 没有引用高水位参数的作业每次都会全量同步，直接拒绝
+        if job_config is None:
+            job_config = datax_executor.load_job_config(job_config_path)
+        if not references_watermark(job_config):
+            raise ValueError(f"增量作业的reader的where或querySql必须引用${{hwm_from}}: {job_config_path}")
+        lock = watermark_store.try_lock(name, task.request.id)
+        if lock is not None:
+            leases.append(lock)
+            return watermark_store.open_window(name, incremental)
+    except Exception:
+        release_job_resources(leases)
+        raise
     
-    return logger
+    release_job_resources(leases)
+    logger.info("增量作业 %s 正在运行，%s秒后重新调度: %s", name, INCREMENTAL_RETRY_DELAY, job_config_path)
+    metrics.TASK_RETRIES_TOTAL.labels(reason='incremental_lock').inc()
+    raise task.retry(countdown=INCREMENTAL_RETRY_DELAY, max_retries=None)
 
-# 设置日志
-logger = setup_logging()
 
-# 创建Celery应用实例
-app = Celery('datax_celery')
-app.conf.broker_url = CELERY_BROKER_URL
-app.conf.result_backend = CELERY_RESULT_BACKEND
+def record_job_queue_wait(task, submitted_at: float = None):
+    """
+    记录作业从提交到开始执行的排队等待时间，按队列和优先级分别统计
+    
+    Args:
+        task: 当前Celery任务
+        submitted_at: 提交时间戳，为None时不记录
+        
+    Returns:
+        排队等待时间（秒），未记录时返回None
+    """
+    if submitted_at is None or task.request.called_directly:
+        return None
+    wait_seconds = round(max(0.0, time.time() - submitted_at), 3)
+    delivery_info = task.request.delivery_info or {}
+    queue = delivery_info.get('routing_key') or 'celery'
+    priority = priority_name(delivery_info.get('priority'))
+    metrics.QUEUE_WAIT_SECONDS.labels(queue=queue, priority=priority).observe(wait_seconds)
+    try:
+        record_queue_wait(queue, priority, wait_seconds)
+    except Exception as e:
+        logger.warning("记录排队等待时间时发生异常: %s", e)
+    return wait_seconds
 
-# 创建全局DataX执行器实例
-datax_executor = DataXExecutor()
+
+def resolve_job_source(job_config_path: str = None, template: str = None,
+                       template_params: dict = None, job_config: dict = None) -> Tuple[str, Optional[dict]]:
+    """
+    确定作业配置的来源，模板在worker上按缓存的解析结果渲染
+    
+    Args:
+        job_config_path: DataX作业配置文件路径（可选）
+        template: 作业模板ID（可选）
+        template_params: 模板参数（可选）
+        job_config: 内联作业配置（可选）
+        
+    Returns:
+        (作业名称, 作业配置)：配置文件为(路径, None)，模板为(模板ID, 渲染结果)，内联配置为('inline', 配置)
+        
+    Raises:
+        ValueError: 没有指定或同时指定了多个来源
+    """
+    check_job_source(job_config_path, template, job_config)
+    if template is not None:
+        return template, job_templates.render(template, template_params)
+    if job_config is not None:
+        return 'inline', job_config
+    return job_config_path, None
 
 
-@app.task(bind=True)
-def execute_datax_job(self, job_config_path: str, jvm_params: str = None, 
-                     job_params: str = None) -> dict:
+def retry_failed_job(task, failure_class: str, failure_retries: int, exc: Optional[Exception] = None) -> None:
+    """
+    按失败分类决定是否重试作业：瞬时性故障按指数退避加随机抖动交还broker重试，
+    确定性故障或重试次数用尽时直接返回，由调用方报告失败
+
+    task.request.retries还包括资源不足、增量锁被占用时交还broker的次数，失败重试的次数
+    单独通过任务的failure_retries参数传递，重试上限和等待时间只按失败重试的次数计算。
+
+    Args:
+        task: 当前Celery任务
+        failure_class: 失败分类
+        failure_retries: 作业此前因失败重试的次数
+        exc: 导致失败的异常（可选）
+
+    Raises:
+        celery.exceptions.Retry: 作业将被重试
+    """
+    if task.request.called_directly or not is_retryable(failure_class):
+        return
+    if failure_retries >= JOB_MAX_RETRIES:
+        logger.error("作业已重试%s次仍然失败，失败分类: %s", failure_retries, failure_class)
+        return
+    countdown = retry_delay(failure_retries)
+    logger.warning("作业失败，失败分类: %s，%.1f秒后第%s次重试",
+                   failure_class, countdown, failure_retries + 1)
+    metrics.TASK_RETRIES_TOTAL.labels(reason=failure_class).inc()
+    raise task.retry(kwargs={**(task.request.kwargs or {}), 'failure_retries': failure_retries + 1},
+                     exc=exc, countdown=countdown, max_retries=None)
+
+
+def release_job_resources(leases: List[RedisLease]) -> None:
+    """
+    释放作业占用的资源
+    
+    Args:
+        leases: 资源租约列表
+    """
+    for lease in leases:
+        try:
+            lease.release()
+        except Exception as e:
+            # 释放失败时租约会在到期后自动失效
+            logger.warning("释放作业资源时发生异常: %s", e)
+
+
+@task_revoked.connect
+def on_task_revoked(request=None, terminated=False, **kwargs):
+    """
+    任务被终止时终止其DataX进程组并释放其占用的资源
+    
+    worker子进程被终止后任务内的finally不一定能执行，DataX在独立的进程组中运行也不会随之退出，
+    这里在worker主进程中按任务ID处理。
+    """
+    if request is None:
+        return
+    if fair_share is not None and not terminated:
+        # 排队中被撤销的任务不会再执行，删除其排队记录
+        try:
+            fair_share.forget_queued(request.id, (request.kwargs or {}).get('tenant'))
+        except Exception as e:
+            logger.warning("删除已撤销任务的排队记录时发生异常: %s", e)
+    if not terminated:
+        return
+    # 终止进程组需要等待宽限期，放到后台线程中，避免阻塞worker主进程的事件循环
+    threading.Thread(target=kill_registered_job, args=(request.id,), daemon=True).start()
+    for limiter in (fair_share, admission_controller, endpoint_limiter):
+        if limiter is None:
+            continue
+        try:
+            limiter.release(request.id)
+        except Exception as e:
+            logger.warning("释放已终止任务的资源时发生异常: %s", e)
+
+
+@control_command(args=[('task_id', str)], signature='<task_id>')
+def kill_datax_job(state, task_id):
+    """
+    worker远程控制命令：终止本机上运行指定任务的DataX进程组
+    
+    Returns:
+        包含被终止进程数的回复，本机没有该任务时reaped为0
+    """
+    # 只在此处发送SIGTERM，宽限期和SIGKILL在后台线程中进行，避免阻塞worker主进程的事件循环
+    reaped = kill_registered_job(task_id, wait=False)
+    if reaped:
+        logger.info("已终止任务的DataX进程组，任务ID: %s, 进程数: %s", task_id, reaped)
+    return {'ok': 'reaped', 'reaped': reaped}
+
+
+@task_prerun.connect
+def on_task_prerun(task_id=None, task=None, **kwargs):
+    """
+    任务开始执行时为之后的日志设置关联字段task_id
+    """
+    bind_log_context(task_id=task_id)
+
+
+@task_postrun.connect
+def on_task_postrun(**kwargs):
+    """
+    任务执行结束后清除日志关联字段
+    """
+    clear_log_context()
+
+
+@worker_init.connect
+def on_worker_init(**kwargs):
+    """
+    worker主进程启动时清除上次运行的多进程指标文件，并启动监控指标HTTP服务（METRICS_PORT为None时不启动）
+    """
+    metrics.clear_multiprocess_dir()
+    metrics.start_metrics_server()
+
+
+@worker_process_init.connect
+def on_worker_process_init(**kwargs):
+    """
+    worker子进程启动时启动预热DataX引擎（ENGINE_POOL_SIZE为0时不做任何事）
+    """
+    datax_executor.warm_up()
+
+
+@worker_process_shutdown.connect
+def on_worker_process_shutdown(**kwargs):
+    """
+    worker子进程退出前终止其启动的全部DataX进程组
+    """
+    reaped = datax_executor.terminate_all()
+    if reaped:
+        logger.info("worker子进程退出，已终止DataX进程数: %s", reaped)
+    metrics.mark_process_dead(os.getpid())
+    # prefork子进程退出时不执行atexit，在这里写完队列中剩余的日志
+    stop_logging()
+
+
+@worker_ready.connect
+@worker_shutdown.connect
+def on_worker_start_or_shutdown(**kwargs):
+    """
+    worker启动和退出时终止执行进程已经不存在的DataX进程组
+    
+    worker子进程被强制终止（如SIGKILL）时来不及清理，这些DataX进程组由worker主进程回收。
+    """
+    for job_id, reaped in kill_orphaned_jobs().items():
+        logger.warning("已终止遗留的DataX进程组，任务ID: %s, 进程数: %s", job_id, reaped)
+
+
+# 资源不足、增量锁被占用时交还broker的次数不设上限（retry的max_retries=None表示使用任务的设置），
+# 因失败重试的次数由retry_failed_job按failure_retries限制
+@app.task(bind=True, max_retries=None)
+def execute_datax_job(self, job_config_path: str = None, jvm_params: str = None, 
+                     job_params: str = None, job_timeout: float = None,
+                     stall_timeout: float = None, incremental: dict = None,
+                     tenant: str = None, submitted_at: float = None,
+                     template: str = None, template_params: dict = None,
+                     job_config: dict = None, quarantine: bool = False,
+                     failure_retries: int = 0) -> dict:
     """
     Celery任务：执行DataX作业
     
+    作业配置可以来自配置文件（job_config_path）、模板（template和template_params）
+    或内联配置（job_config），三者只能指定一个。后两种不需要在共享存储中生成配置文件。
+    
+    作业失败（包括DataX以非零退出码结束）时按失败分类决定是否重试：连接失败、锁等待超时等
+    瞬时性故障按指数退避加随机抖动重试，最多JOB_MAX_RETRIES次；配置错误、脏数据超限等直接报告失败。
+    
     Args:
         job_config_path: DataX作业配置文件路径
         jvm_params: JVM参数（可选）
         job_params: 作业参数（可选）
+        job_timeout: 作业最长运行时间（秒），为None时使用JOB_TIMEOUT，为0时不限制
+        stall_timeout: 停滞判定时间（秒），为None时使用JOB_STALL_TIMEOUT，为0时不检测
+        incremental: 增量配置（可选），指定时只同步上次成功运行之后的数据，
+                     同步区间通过${hwm_from}和${hwm_to}注入作业配置，作业成功后推进高水位
+        tenant: 作业所属租户（可选），集群繁忙时按租户权重公平分配运行名额
+        submitted_at: 提交时间戳（可选），由执行后端填写，用于统计排队等待时间
+        template: 作业模板ID（可选），模板位于JOB_TEMPLATE_DIR
+        template_params: 模板参数（可选）
+        job_config: 内联作业配置（可选）
+        quarantine: 是否隔离脏数据（可选），隔离模式下脏数据写入隔离文件，不再因超过errorLimit使整个作业失败
+        failure_retries: 此前因失败重试的次数，由重试时自动传入，提交时不需要指定
         
     Returns:
-        执行结果字典
+        执行结果字典，失败的作业包含failure_class，因失败重试的次数在retries中
     """
-    logger.info(f"开始执行DataX作业: {job_config_path}")
+    job_name, job_config = resolve_job_source(job_config_path, template, template_params, job_config)
+    bind_log_context(job=job_name)
+    logger.info("开始执行DataX作业: %s", job_name)
+    
+    def report_progress(progress: dict) -> None:
+        # 以PROGRESS状态发布作业进度，便于区分停滞和缓慢的作业
+        progress['job_config_path'] = job_name
+        self.update_state(state='PROGRESS', meta=progress)
+    
+    if incremental:
+        check_watermark_key(job_config_path, incremental)
+    
+    leases = acquire_job_resources(self, job_name, jvm_params, tenant, job_config)
+    
+    window = None
+    if incremental:
+        window = open_incremental_window(self, job_name, incremental, leases, job_config)
+        job_params = build_watermark_params(window, job_params)
+        logger.info("增量同步区间: %s (%s, %s]", window['key'], window['from'], window['to'])
+    
+    queue_wait = record_job_queue_wait(self, submitted_at)
+    in_flight = metrics.JOBS_IN_FLIGHT.labels(queue=(self.request.delivery_info or {}).get('routing_key') or 'celery')
+    in_flight.inc()
     
     try:
         # 执行DataX作业
         result = datax_executor.execute_job(
             job_config_path=job_config_path,
+            job_config=job_config,
             jvm_params=jvm_params,
-            job_params=job_params
+            job_params=job_params,
+            job_id=self.request.id,
+            progress_callback=None if self.request.called_directly else report_progress,
+            timeout=JOB_TIMEOUT if job_timeout is None else job_timeout,
+            stall_timeout=JOB_STALL_TIMEOUT if stall_timeout is None else stall_timeout,
+            quarantine=quarantine
         )
         
-        logger.info(f"DataX作业执行完成: {job_config_path}")
-        return result
+        if window is not None:
+            # 只有作业成功才推进高水位，失败的区间由下一次运行重新覆盖
+            window['advanced'] = result['success'] and watermark_store.advance(window, self.request.id)
+            if result['success'] and not window['advanced']:
+                logger.warning("高水位在运行期间被修改，未推进: %s", window['key'])
+            result['watermark'] = window
+        
+        if queue_wait is not None:
+            result['queue_wait_seconds'] = queue_wait
+        result['retries'] = failure_retries
         
     except Exception as e:
-        logger.error(f"执行DataX作业时发生异常: {str(e)}")
-        # 重新抛出异常以便Celery可以处理重试等机制
-        raise self.retry(exc=e, countdown=60, max_retries=3)
+        failure_class = classify_exception(e)
+        logger.error("执行DataX作业时发生异常，失败分类: %s: %s", failure_class, e)
+        metrics.JOB_FAILURES_TOTAL.labels(failure_class=failure_class).inc()
+        retry_failed_job(self, failure_class, failure_retries, e)
+        raise
+    finally:
+        in_flight.dec()
+        release_job_resources(leases)
+    
+    # 在释放资源之后再决定是否重试，等待重试期间不占用准入预算和数据库名额
+    if not result['success']:
+        retry_failed_job(self, result['failure_class'], failure_retries)
+    
+    logger.info("DataX作业执行完成: %s", job_name)
+    return result
 
 
 @app.task(bind=True)
@@ -98,16 +488,41 @@ def validate_datax_job(self, job_config_path: str) -> bool:
     Returns:
         配置文件是否有效
     """
-    logger.info(f"开始验证DataX作业配置: {job_config_path}")
+    logger.info("开始验证DataX作业配置: %s", job_config_path)
     
     try:
         # 验证DataX作业配置
         is_valid = datax_executor.validate_job_config(job_config_path)
+        metrics.VALIDATIONS_TOTAL.labels(result='valid' if is_valid else 'invalid').inc()
         
-        logger.info(f"DataX作业配置验证完成: {job_config_path}, 结果: {is_valid}")
+        logger.info("DataX作业配置验证完成: %s, 结果: %s", job_config_path, is_valid)
         return is_valid
         
     except Exception as e:
-        logger.error(f"验证DataX作业配置时发生异常: {str(e)}")
+        logger.error("验证DataX作业配置时发生异常: %s", e)
         # 重新抛出异常
-        raise self.retry(exc=e, countdown=60, max_retries=3)
\ No newline at end of file
+        raise self.retry(exc=e, countdown=60, max_retries=3)
+
+
+@app.task(bind=True)
+def merge_datax_shard_results(self, shard_results: list) -> dict:
+    """
+    Celery任务：合并分片作业各子任务的执行结果（作为chord回调执行）
+    
+    Args:
+        shard_results: 各分片execute_datax_job任务的结果列表
+        
+    Returns:
+        合并后的执行结果字典
+    """
+    logger.info("开始合并分片作业结果，分片数: %s", len(shard_results))
+    
+    result = merge_shard_results(shard_results)
+    
+    if result['success']:
+        logger.info("分片作业全部执行成功，总记录数: %s", result['summary']['total_records'])
+    else:
+        logger.error("分片作业存在失败的分片: %s", result['failed_shards'])
+    if result['summary_missing_shards']:
+        logger.warning("以下分片没有统计信息，汇总中未包含: %s", result['summary_missing_shards'])
+    return result
\ No newline at end of file
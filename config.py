@@ -1,16 +1,198 @@
 import os
+import tempfile
 
 # DataX相关配置
 DATAX_HOME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datax')
 DATAX_PY_PATH = os.path.join(DATAX_HOME, 'bin', 'datax.py')
 
+# DataX启动方式：'java'时直接启动DataX引擎的JVM，'wrapper'时通过datax.py启动
+# 直接启动时找不到java或DataX的lib目录会自动改用datax.py
+DATAX_LAUNCH_MODE = 'java'
+# java可执行文件路径，为None时使用JAVA_HOME下的java，未设置JAVA_HOME时从PATH中查找
+JAVA_BIN = None
+# 与datax.py一致的默认JVM参数，作业的jvm_params追加在其后（后出现的-Xmx等参数生效）
+DATAX_DEFAULT_JVM = f"-Xms1g -Xmx1g -XX:+HeapDumpOnOutOfMemoryError -XX:HeapDumpPath={DATAX_HOME}/log"
+# DataX日志级别
+DATAX_LOG_LEVEL = 'info'
+
+# 作业配置模板目录，模板文件名（不含.json）即模板ID，需要部署到所有worker
+JOB_TEMPLATE_DIR = os.path.join(DATAX_HOME, 'job', 'templates')
+# 内联作业配置冷启动时写入的临时文件目录，优先使用内存文件系统，作业结束后删除
+INLINE_JOB_DIR = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'datax-jobs')
+
 # Celery配置
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
 
+# 异步调度器中执行消息发布等同步调用的线程数
+ASYNC_SUBMIT_WORKERS = 8
+
+# 非Redis结果后端时，异步等待任务结果的轮询间隔（秒）
+RESULT_POLL_INTERVAL = 1
+
 # 日志配置
 LOG_LEVEL = 'INFO'
 LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+# 各模块日志文件的滚动大小和备份数量，LOG_MAX_BYTES为0时不滚动
+LOG_MAX_BYTES = 100 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# fork出的子进程（如prefork模式的worker子进程）是否写入独立的<模块名>.<pid>.log
+LOG_PER_PROCESS = True
+# 是否以JSON格式输出日志（每行一个对象，包含task_id、job等关联字段）
+LOG_JSON = False
+
+# DataX作业输出配置
+# 每个作业的完整输出写入独立的滚动日志文件，结果中只保留末尾若干行
+JOB_LOG_DIR = os.path.join(LOG_DIR, 'jobs')
+JOB_LOG_MAX_BYTES = 50 * 1024 * 1024
+JOB_LOG_BACKUP_COUNT = 3
+OUTPUT_TAIL_LINES = 50
+
+# 作业日志存储配置：作业结束后完整输出压缩保存，文件名为内容摘要，结果中只记录摘要（log_key）
+# 存储目录可以是共享目录，调度端据此读取其他worker上作业的完整输出；为None时不保存
+LOG_STORE_DIR = os.path.join(LOG_DIR, 'store')
+# 压缩格式，'zstd'（需要安装zstandard，未安装时改用gzip）或'gzip'
+LOG_STORE_COMPRESSION = 'zstd'
+# 保存成功后是否保留JOB_LOG_DIR中的作业日志文件
+LOG_STORE_KEEP_LOCAL = False
+
+# 脏数据隔离配置：隔离模式下作业的脏数据写入隔离文件，不再因超过errorLimit导致整个作业失败
+# 隔离文件目录，每个作业一个<任务ID>.jsonl，生成重放作业时需要从调度端读取，多台worker时应为共享目录
+QUARANTINE_DIR = os.path.join(LOG_DIR, 'quarantine')
+# 单个作业最多隔离的脏数据条数，超过后作业仍按errorLimit失败
+QUARANTINE_MAX_RECORDS = 100000
+# 重放作业的where条件中每个IN列表包含的主键数
+QUARANTINE_REPLAY_BATCH_SIZE = 1000
+
+# 任务结果在结果后端中的保留时间（秒），到期后自动删除
+RESULT_EXPIRES = 24 * 3600
+
+# 监控指标配置（需要安装prometheus_client，未安装时不记录），默认不启用
+METRICS_ENABLED = False
+# worker主进程上输出指标的HTTP端口，为None时不启动；prefork模式需要设置PROMETHEUS_MULTIPROC_DIR环境变量
+METRICS_PORT = 9808
+# 指标HTTP服务的监听地址，默认只监听本机，需要由其他主机上的Prometheus抓取时改为'0.0.0.0'或内网地址
+METRICS_ADDR = '127.0.0.1'
+
+# 本地执行后端配置（LocalExecutionBackend，不依赖broker）
+# 最大并行作业数，为None时按CPU核数和物理内存 / LOCAL_JOB_MEMORY_BYTES 计算
+LOCAL_MAX_PARALLEL = None
+# 等待执行的最大作业数，超过后提交会阻塞
+LOCAL_MAX_PENDING = 100
+# 单个作业的最长运行时间（秒），为None时不限制
+LOCAL_JOB_TIMEOUT = None
+# 单个DataX作业预计占用的内存（DataX默认堆大小1g，加上JVM自身开销）
+LOCAL_JOB_MEMORY_BYTES = 1536 * 1024 * 1024
+
+# worker准入控制配置：按JVM堆内存和channel数量在每台主机上做资源预算
+# 默认不启用；启用后每个作业在启动前访问Redis申请预算，运行期间后台线程续期租约
+ADMISSION_CONTROL_ENABLED = False
+# 主机内存预算，为None时取物理内存 * ADMISSION_MEMORY_FRACTION
+ADMISSION_MEMORY_BYTES = None
+ADMISSION_MEMORY_FRACTION = 0.8
+# 主机channel预算，为None时取CPU核数 * ADMISSION_CHANNELS_PER_CPU
+ADMISSION_CHANNEL_BUDGET = None
+ADMISSION_CHANNELS_PER_CPU = 4
+# 每个JVM在堆之外的额外内存开销（元空间、线程栈、直接内存等）
+ADMISSION_JVM_OVERHEAD_BYTES = 512 * 1024 * 1024
+# 资源租约时长（秒），作业运行期间自动续期，worker崩溃后租约到期自动释放
+ADMISSION_LEASE_SECONDS = 120
+# 预算不足时作业交还broker后重新尝试的间隔（秒）
+ADMISSION_RETRY_DELAY = 30
+# 未指定-Xmx时DataX默认的最大堆内存
+DATAX_DEFAULT_HEAP = 1024 * 1024 * 1024
+
+# 数据库并发限制配置：按jdbcUrl中的数据库地址限制同时读写的作业数
+# 默认不启用；启用后每个作业在启动前访问Redis申请名额，运行期间后台线程续期租约
+ENDPOINT_LIMIT_ENABLED = False
+# 未单独配置的数据库地址允许的并发作业数
+DEFAULT_ENDPOINT_CONCURRENCY = 10
+# 按"主机:端口"或"主机"单独配置并发作业数，例如 {'10.0.0.12:3306': 4, 'mysql-primary': 2}
+ENDPOINT_CONCURRENCY_LIMITS = {}
+# 名额租约时长（秒），作业运行期间自动续期
+ENDPOINT_LEASE_SECONDS = 120
+# 名额已满时作业交还broker后重新尝试的间隔（秒）
+ENDPOINT_RETRY_DELAY = 30
+
+# 作业配置缓存的最大条目数（按文件路径和修改时间缓存已解析的配置及验证结论）
+JOB_CONFIG_CACHE_SIZE = 1024
+
+# 作业进度上报的最小间隔（秒），DataX默认每10秒打印一次进度
+PROGRESS_UPDATE_INTERVAL = 10
+
+# 作业超时配置
+# 单个作业的最长运行时间（秒），为None或0时不限制
+JOB_TIMEOUT = None
+# 作业读写记录数持续多久没有变化视为停滞（秒），为None或0时不检测（默认）
+# 执行耗时较长的preSql、writer批量提交等阶段没有记录数变化，启用时应大于这些阶段的最长耗时
+JOB_STALL_TIMEOUT = None
+# 超时检查间隔（秒），没有输出时也按此间隔检查
+WATCHDOG_CHECK_INTERVAL = 1
+# 终止作业时先发送SIGTERM，等待该时间（秒）后仍未退出的进程发送SIGKILL
+PROCESS_KILL_GRACE_SECONDS = 10
+
+# 失败重试配置：按DataX输出把失败作业分类（见failure_classifier.py），只自动重试瞬时性故障
+# 自动重试的失败分类：连接失败、锁等待超时、进程被外部信号终止、停滞、worker中的其他异常
+RETRYABLE_FAILURE_CLASSES = ('connection', 'lock_wait', 'killed', 'stalled', 'error')
+# 单个作业的最大重试次数
+JOB_MAX_RETRIES = 3
+# 第n次重试（从0开始计）前等待min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** n)的一半到全部之间的随机时间（秒）
+RETRY_BACKOFF_BASE = 30
+RETRY_BACKOFF_MAX = 600
+# 视为瞬时性故障的DataX进程退出码：被SIGKILL、SIGTERM终止（如OOM killer、主机重启）
+TRANSIENT_EXIT_CODES = (-9, -15, 137, 143)
+
+# 本机运行中DataX进程的登记目录，每个作业一个pid文件，供worker主进程按任务ID终止作业
+RUN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run')
+# 取消任务时等待各worker回复终止结果的时间（秒），worker发送SIGTERM后立即回复，不等待宽限期
+CANCEL_REPLY_TIMEOUT = 2
+
+# 预热DataX引擎池配置（仅POSIX系统）
+# 每个worker进程预先启动的DataX引擎数，为0时不启用，每个引擎空闲时也占用一个JVM的内存
+ENGINE_POOL_SIZE = 0
+# 预热引擎的作业配置命名管道目录
+ENGINE_POOL_DIR = os.path.join(RUN_DIR, 'engines')
+# 空闲引擎的最长保留时间（秒），超过后由后台线程回收重建，为None时不回收
+ENGINE_POOL_MAX_IDLE_SECONDS = 1800
+# 向预热引擎交付作业配置时等待其打开命名管道的最长时间（秒），超时后改为冷启动
+ENGINE_HANDOFF_TIMEOUT = 30
+
+# 增量同步配置
+# 增量作业运行锁的租约时长（秒），同一增量作业同时只允许一次运行
+INCREMENTAL_LOCK_SECONDS = 120
+# 同一增量作业正在运行时，新任务重新调度的间隔（秒）
+INCREMENTAL_RETRY_DELAY = 60
+
+# DAG执行配置
+# DAG中同时运行的最大节点数
+DAG_MAX_PARALLEL = 16
+# DAG运行状态文件目录，重新运行同一DAG时从失败处继续
+DAG_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dag_state')
+
+# 优先级配置
+# 作业优先级级别，Redis broker中数值越小优先级越高（0-9）
+PRIORITY_LEVELS = {'critical': 0, 'high': 3, 'normal': 6, 'low': 9}
+# 未指定优先级的任务使用的级别
+DEFAULT_PRIORITY = 'normal'
+
+# 租户公平共享配置：集群繁忙时按权重分配各租户可同时运行的作业数
+# 默认不启用（优先级不受影响）；启用后超出份额的作业会交还broker稍后重试
+FAIR_SHARE_ENABLED = False
+# 集群可同时运行的作业总数（各worker并发数之和），按租户权重划分
+FAIR_SHARE_TOTAL_SLOTS = 32
+# 按租户配置权重，例如 {'finance': 3, 'backfill': 1}，未配置的租户使用DEFAULT_TENANT_WEIGHT
+TENANT_WEIGHTS = {}
+DEFAULT_TENANT_WEIGHT = 1
+# 未指定租户的作业归属的租户
+DEFAULT_TENANT = 'default'
+# 运行名额租约时长（秒），作业运行期间自动续期
+FAIR_SHARE_LEASE_SECONDS = 120
+# 租户超出份额时作业交还broker后重新尝试的间隔（秒）
+FAIR_SHARE_RETRY_DELAY = 10
+# 排队记录的最长保留时间（秒），被丢弃的消息留下的记录到期后清理
+FAIR_SHARE_QUEUED_TTL = 24 * 3600
+# 每个队列和优先级保留的排队等待时间样本数
+QUEUE_WAIT_SAMPLES = 1000
 
 # 确保日志目录存在
 os.makedirs(LOG_DIR, exist_ok=True)
\ No newline at end of file
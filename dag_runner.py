@@ -0,0 +1,378 @@
+import asyncio
+import functools
+import heapq
+import json
+import os
+import time
+from typing import Optional, List, Dict, Any
+from celery import states
+from config import DAG_MAX_PARALLEL, DAG_STATE_DIR, RESULT_EXPIRES
+from tasks_scheduler import DataXTaskScheduler
+from logging_utils import setup_logging
+
+# 设置日志
+logger = setup_logging(__name__)
+
+# 节点状态
+NODE_PENDING = 'PENDING'
+NODE_RUNNING = 'RUNNING'
+NODE_SUCCESS = 'SUCCESS'
+NODE_FAILED = 'FAILED'
+NODE_SKIPPED = 'SKIPPED'
+
+# 节点定义中传给schedule_job_execution的字段
+SUBMIT_OPTIONS = ('jvm_params', 'job_params', 'queue', 'job_timeout', 'stall_timeout', 'incremental',
+                  'priority', 'tenant', 'template', 'template_params', 'job_config', 'quarantine')
+
+
+class DataXDagRunner:
+    """
+    按依赖关系执行一组DataX作业
+
+    所有依赖已成功的节点立即提交，同时运行的节点数不超过max_parallel；
+    就绪节点按关键路径长度（该节点到DAG终点的最长权重和）从大到小提交，
+    使最长的依赖链尽早开始。节点失败时，其全部下游节点标记为SKIPPED，
+    与失败节点无关的分支继续执行。
+
+    每个节点的状态写入状态文件，重新运行同一DAG时已成功的节点不再执行，
+    从失败处继续；上次中断时仍在运行的节点会重新关联到原任务。
+    """
+
+    def __init__(self, nodes: Dict[str, Dict[str, Any]], scheduler: Optional[DataXTaskScheduler] = None,
+                 max_parallel: int = DAG_MAX_PARALLEL, state_file: Optional[str] = None,
+                 fail_fast: bool = False):
+        """
+        初始化DAG执行器
+
+        Args:
+            nodes: 节点名称到节点定义的映射。节点定义包含job_config_path（或template、template_params，
+                   或job_config），以及可选的depends_on（上游节点名称列表）、weight（预计耗时，
+                   用于计算关键路径，默认1）和jvm_params、job_params、queue、job_timeout、
+                   stall_timeout、incremental、priority、tenant、quarantine
+            scheduler: 任务调度器（可选，默认新建）
+            max_parallel: 同时运行的最大节点数
+            state_file: 状态文件路径（可选），为None时不持久化
+            fail_fast: 任一节点失败后是否停止提交新节点，未执行的节点标记为SKIPPED
+
+        Raises:
+            ValueError: 节点定义无效、依赖了不存在的节点或存在循环依赖
+        """
+        self.nodes = nodes
+        self.scheduler = scheduler or DataXTaskScheduler()
+        self.max_parallel = max_parallel
+        self.state_file = state_file
+        self.fail_fast = fail_fast
+
+        self.downstream = {name: [] for name in nodes}
+        for name, node in nodes.items():
+            if sum(bool(node.get(key)) for key in ('job_config_path', 'template', 'job_config')) != 1:
+                raise ValueError(f"DAG节点必须且只能指定job_config_path、template和job_config之一: {name}")
+            for upstream in node.get('depends_on', []):
+                if upstream not in nodes:
+                    raise ValueError(f"DAG节点 {name} 依赖了不存在的节点: {upstream}")
+                self.downstream[upstream].append(name)
+
+        self.order = self._topological_order()
+        self.priority = self._critical_path_priority()
+
+    @classmethod
+    def from_file(cls, dag_file: str, **kwargs) -> 'DataXDagRunner':
+        """
+        从JSON文件加载DAG
+
+        文件格式为{"nodes": {"节点名称": {"job_config_path": "...", "depends_on": [...]}}}，
+        未指定state_file时状态保存在DAG_STATE_DIR下与DAG文件同名的文件中。
+
+        Args:
+            dag_file: DAG定义文件路径
+            **kwargs: 传给构造函数的其他参数
+
+        Returns:
+            DAG执行器
+        """
+        with open(dag_file, 'r', encoding='utf-8') as f:
+            definition = json.load(f)
+        if 'state_file' not in kwargs:
+            dag_name = os.path.splitext(os.path.basename(dag_file))[0]
+            kwargs['state_file'] = os.path.join(DAG_STATE_DIR, f"{dag_name}.state.json")
+        return cls(definition['nodes'], **kwargs)
+
+    def _topological_order(self) -> List[str]:
+        """
+        计算节点的拓扑顺序
+
+        Returns:
+            上游节点在前的节点名称列表
+
+        Raises:
+            ValueError: 存在循环依赖
+        """
+        indegree = {name: len(node.get('depends_on', [])) for name, node in self.nodes.items()}
+        queue = [name for name, degree in indegree.items() if degree == 0]
+        order = []
+        while queue:
+            name = queue.pop()
+            order.append(name)
+            for child in self.downstream[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+        if len(order) != len(self.nodes):
+            cycle = sorted(name for name, degree in indegree.items() if degree > 0)
+            raise ValueError(f"DAG中存在循环依赖，涉及节点: {cycle}")
+        return order
+
+    def _critical_path_priority(self) -> Dict[str, float]:
+        """
+        计算每个节点的关键路径长度
+
+        Returns:
+            节点名称到该节点（含）到DAG终点的最长权重和的映射
+        """
+        priority = {}
+        for name in reversed(self.order):
+            longest = max((priority[child] for child in self.downstream[name]), default=0)
+            priority[name] = self.nodes[name].get('weight', 1) + longest
+        return priority
+
+    def _job_source(self, name: str) -> str:
+        """
+        节点作业配置的标识，配置文件为其路径，模板和内联配置为其JSON序列化结果
+
+        Args:
+            name: 节点名称
+
+        Returns:
+            作业配置标识
+        """
+        node = self.nodes[name]
+        if node.get('job_config_path'):
+            return node['job_config_path']
+        source = {key: node[key] for key in ('template', 'template_params', 'job_config') if node.get(key)}
+        return json.dumps(source, ensure_ascii=False, sort_keys=True)
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        """
+        读取上次运行的节点状态
+
+        Returns:
+            节点名称到状态的映射，作业配置已变化的节点不沿用上次的状态
+        """
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f).get('nodes', {})
+        return {
+            name: node_state for name, node_state in saved.items()
+            if name in self.nodes
+            and node_state.get('job_source', node_state.get('job_config_path')) == self._job_source(name)
+        }
+
+    def _save_state(self, state: Dict[str, Dict[str, Any]]) -> None:
+        """
+        保存节点状态，先写临时文件再改名，中断时不会留下写了一半的文件
+
+        Args:
+            state: 节点名称到状态的映射
+        """
+        if not self.state_file:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+        temp_file = f"{self.state_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'nodes': state}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.state_file)
+
+    def _set_state(self, state: Dict[str, Dict[str, Any]], name: str, node_state: str,
+                   **fields) -> None:
+        state[name] = {
+            'state': node_state,
+            'job_source': self._job_source(name),
+            'task_id': fields.get('task_id', state.get(name, {}).get('task_id')),
+            'error': fields.get('error'),
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def _skip_downstream(self, state: Dict[str, Dict[str, Any]], name: str) -> None:
+        """
+        把失败节点的全部下游节点标记为SKIPPED
+
+        Args:
+            state: 节点状态
+            name: 失败的节点名称
+        """
+        stack = list(self.downstream[name])
+        while stack:
+            child = stack.pop()
+            if state[child]['state'] != NODE_PENDING:
+                continue
+            self._set_state(state, child, NODE_SKIPPED, error=f"上游节点失败: {name}")
+            logger.warning("DAG节点 %s 因上游节点 %s 失败被跳过", child, name)
+            stack.extend(self.downstream[child])
+
+    @staticmethod
+    def _node_error(status: Dict[str, Any]) -> Optional[str]:
+        """
+        根据任务结束时的状态判断节点是否成功
+
+        Args:
+            status: 包含state和info的任务状态
+
+        Returns:
+            失败原因，节点成功时返回None
+        """
+        info = status['info']
+        if status['state'] != states.SUCCESS:
+            return f"{status['state']}: {info}"
+        if not isinstance(info, dict) or not info.get('success'):
+            outcome = info.get('outcome', NODE_FAILED) if isinstance(info, dict) else NODE_FAILED
+            return f"DataX作业未成功: {outcome}"
+        return None
+
+    async def _submit(self, name: str) -> str:
+        """
+        提交节点对应的DataX作业
+
+        Args:
+            name: 节点名称
+
+        Returns:
+            任务ID
+        """
+        node = self.nodes[name]
+        options = {key: node[key] for key in SUBMIT_OPTIONS if key in node}
+        # 消息发布是同步调用，放到线程池中执行，避免阻塞等待中的其他节点
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.scheduler.schedule_job_execution, node.get('job_config_path'), **options))
+
+    @staticmethod
+    def _task_lost(node_state: Dict[str, Any], task_state: str) -> bool:
+        """
+        上次运行的任务是否确定不会再执行
+
+        Args:
+            node_state: 节点的状态记录，updated_at为提交任务的时间
+            task_state: 任务在结果后端中的状态
+
+        Returns:
+            任务已被撤销，或仍为PENDING且提交时间早于结果保留时间时返回True
+        """
+        if task_state == states.REVOKED:
+            return True
+        if task_state != states.PENDING:
+            return False
+        try:
+            submitted_at = time.mktime(time.strptime(node_state['updated_at'], '%Y-%m-%d %H:%M:%S'))
+        except (KeyError, TypeError, ValueError):
+            return False
+        return time.time() - submitted_at > RESULT_EXPIRES
+
+    def _restore(self, state: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """
+        恢复上次运行的状态：已成功的节点保留，其余节点重置为PENDING
+
+        上次中断时仍在运行的节点重新关联到原任务并等待其结束，仍在排队（PENDING）的任务也不撤销，
+        避免撤销与worker取走消息同时发生导致作业执行两次。只有确定不会再执行的任务重新提交：
+        已被撤销（REVOKED），或提交时间早于结果保留时间（RESULT_EXPIRES）仍为PENDING（结果已过期，无法等待）。
+
+        Args:
+            state: 上次运行的节点状态，原地修改
+
+        Returns:
+            重新关联的任务ID到节点名称的映射
+        """
+        previous = {name: node_state['task_id'] for name, node_state in state.items()
+                    if node_state['state'] == NODE_RUNNING and node_state.get('task_id')}
+        statuses = self.scheduler.get_task_statuses(list(previous.values())) if previous else {}
+
+        running = {}
+        for name in self.nodes:
+            node_state = state.get(name, {}).get('state')
+            if node_state == NODE_SUCCESS:
+                continue
+            task_id = previous.get(name)
+            if task_id is not None and not self._task_lost(state[name], statuses[task_id]['state']):
+                running[task_id] = name
+                logger.info("DAG节点 %s 重新关联到上次运行的任务: %s", name, task_id)
+                continue
+            if task_id is not None:
+                logger.warning("DAG节点 %s 上次运行的任务已丢失，重新提交: %s, 状态: %s",
+                               name, task_id, statuses[task_id]['state'])
+            self._set_state(state, name, NODE_PENDING, task_id=None)
+        return running
+
+    async def run_async(self) -> Dict[str, Dict[str, Any]]:
+        """
+        执行DAG直到所有节点结束
+
+        Returns:
+            节点名称到最终状态的映射，状态包含state、task_id、error等字段
+        """
+        state = self._load_state()
+        running = self._restore(state)
+
+        # 尚未成功的上游节点数，为0的PENDING节点即可提交
+        waiting = {
+            name: sum(1 for upstream in self.nodes[name].get('depends_on', [])
+                      if state[upstream]['state'] != NODE_SUCCESS)
+            for name in self.nodes
+        }
+        ready = [(-self.priority[name], name) for name in self.nodes
+                 if state[name]['state'] == NODE_PENDING and waiting[name] == 0]
+        heapq.heapify(ready)
+        self._save_state(state)
+        failed = False
+
+        logger.info("开始执行DAG，节点数: %s, 已完成: %s",
+                    len(self.nodes), sum(1 for s in state.values() if s['state'] == NODE_SUCCESS))
+
+        while ready or running:
+            while ready and len(running) < self.max_parallel and not (self.fail_fast and failed):
+                _, name = heapq.heappop(ready)
+                task_id = await self._submit(name)
+                running[task_id] = name
+                self._set_state(state, name, NODE_RUNNING, task_id=task_id)
+                logger.info("已提交DAG节点 %s，任务ID: %s", name, task_id)
+            self._save_state(state)
+
+            if not running:
+                break
+
+            done = await self.scheduler.wait_any(list(running))
+            for task_id, status in done.items():
+                name = running.pop(task_id)
+                error = self._node_error(status)
+                if error is None:
+                    self._set_state(state, name, NODE_SUCCESS, task_id=task_id)
+                    logger.info("DAG节点 %s 执行成功", name)
+                    for child in self.downstream[name]:
+                        waiting[child] -= 1
+                        if waiting[child] == 0 and state[child]['state'] == NODE_PENDING:
+                            heapq.heappush(ready, (-self.priority[child], child))
+                else:
+                    failed = True
+                    self._set_state(state, name, NODE_FAILED, task_id=task_id, error=error)
+                    logger.error("DAG节点 %s 执行失败: %s", name, error)
+                    self._skip_downstream(state, name)
+            self._save_state(state)
+
+        # fail_fast时未提交的节点
+        for name in self.nodes:
+            if state[name]['state'] == NODE_PENDING:
+                self._set_state(state, name, NODE_SKIPPED, error="DAG已因节点失败停止")
+        self._save_state(state)
+
+        counts = {}
+        for node_state in state.values():
+            counts[node_state['state']] = counts.get(node_state['state'], 0) + 1
+        logger.info("DAG执行结束: %s", counts)
+        return state
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        在新的事件循环中执行DAG，用于同步代码
+
+        Returns:
+            节点名称到最终状态的映射
+        """
+        return asyncio.run(self.run_async())
@@ -1,69 +1,136 @@
 import subprocess
 import json
 import os
+import shlex
+import shutil
+import tempfile
+import time
+import queue
+import threading
 import logging
-from typing import Dict, Any, Optional
-from config import DATAX_PY_PATH, LOG_LEVEL, LOG_DIR
+import logging.handlers
+import uuid
+from collections import deque
+from typing import Dict, Any, Optional, Iterator, Tuple, Callable, List
+from config import (DATAX_HOME, DATAX_PY_PATH, DATAX_LAUNCH_MODE, JAVA_BIN, DATAX_DEFAULT_JVM,
+                    DATAX_LOG_LEVEL, JOB_LOG_DIR,
+                    JOB_LOG_MAX_BYTES, JOB_LOG_BACKUP_COUNT, OUTPUT_TAIL_LINES,
+                    PROGRESS_UPDATE_INTERVAL, JOB_CONFIG_CACHE_SIZE, JOB_TIMEOUT,
+                    JOB_STALL_TIMEOUT, WATCHDOG_CHECK_INTERVAL, ENGINE_POOL_SIZE,
+                    ENGINE_POOL_DIR, ENGINE_POOL_MAX_IDLE_SECONDS, ENGINE_HANDOFF_TIMEOUT,
+                    INLINE_JOB_DIR, LOG_STORE_DIR, LOG_STORE_KEEP_LOCAL, QUARANTINE_DIR)
+from datax_output_parser import DataXOutputParser
+from failure_classifier import (FailureClassifier, classify_exception, FAILURE_TIMEOUT,
+                                FAILURE_STALLED, FAILURE_CANCELLED)
+from job_config_cache import JobConfigCache
+from job_validator import DataXJobValidator
+from log_store import JobLogStore
+from quarantine import QuarantineWriter, enable_quarantine
+import metrics
+from process_registry import (register_process, unregister_process, get_process,
+                              kill_process_group)
+from engine_pool import WarmEnginePool, render_job_params
+from logging_utils import setup_logging
 
-def setup_logging():
-    """
-    设置日志配置
-    """
-    # 确保日志目录存在
-    os.makedirs(LOG_DIR, exist_ok=True)
-    
-    # 获取当前模块的logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(LOG_LEVEL)
-    
-    # 清除现有的处理器
-    logger.handlers.clear()
-    
-    # 创建文件处理器
-    file_handler = logging.FileHandler(
-        os.path.join(LOG_DIR, 'datax_executor.log'), 
-        encoding='utf-8'
-    )
-    file_handler.setLevel(LOG_LEVEL)
-    
-    # 创建控制台处理器
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(LOG_LEVEL)
-    
-    # 创建格式化器
-    formatter = logging.Formatter(
-        '%(asctime)s %(levelname)s %(name)s %(message)s'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # 添加处理器到记录器
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+# 作业执行结果的outcome取值
+OUTCOME_SUCCESS = 'SUCCESS'
+OUTCOME_FAILED = 'FAILED'
+OUTCOME_TIMEOUT = 'TIMEOUT'
+OUTCOME_STALLED = 'STALLED'
+OUTCOME_CANCELLED = 'CANCELLED'
+# 被执行器或外部终止的作业按outcome分类，其余失败作业按输出和退出码分类
+OUTCOME_FAILURE_CLASSES = {
+    OUTCOME_TIMEOUT: FAILURE_TIMEOUT,
+    OUTCOME_STALLED: FAILURE_STALLED,
+    OUTCOME_CANCELLED: FAILURE_CANCELLED
+}
+
+# 作业的启动方式：新建DataX进程，或使用预热引擎
+LAUNCH_COLD = 'cold'
+LAUNCH_WARM = 'warm'
+# DataX引擎的主类
+DATAX_ENGINE_CLASS = 'com.alibaba.datax.core.Engine'
+
+# DataX开始执行作业时输出的日志中包含该字样，此前的时间计为启动时间
+JOB_CONTAINER_MARKER = 'JobContainer'
 
 # 设置日志
-logger = setup_logging()
+logger = setup_logging(__name__)
 
 class DataXExecutor:
     """
     DataX执行器类，用于封装DataX工具的调用和执行
     """
 
-    def __init__(self):
+    def __init__(self, engine_pool_size: int = ENGINE_POOL_SIZE):
         """
         初始化DataX执行器
+        
+        Args:
+            engine_pool_size: 预热的DataX引擎数，为0或平台不支持命名管道时不使用引擎池
         """
         if not os.path.exists(DATAX_PY_PATH):
             raise FileNotFoundError(f"DataX执行脚本不存在: {DATAX_PY_PATH}")
         
         self.datax_py_path = DATAX_PY_PATH
+        self.config_cache = JobConfigCache(JOB_CONFIG_CACHE_SIZE)
+        self.validator = DataXJobValidator()
+        # 正在运行的DataX子进程，键为作业标识
+        self._processes = {}
+        self._processes_lock = threading.Lock()
+        # 直接启动JVM的命令模板，首次构建命令时生成，为False表示只能使用datax.py
+        self._java_launch = None
+        # 作业结束后保存完整输出的压缩存储
+        self.log_store = JobLogStore() if LOG_STORE_DIR else None
+        
+        self.engine_pool = None
+        if engine_pool_size and WarmEnginePool.supported():
+            self.engine_pool = WarmEnginePool(
+                lambda job_path, jvm_params: self._spawn(self.build_command(job_path, jvm_params)),
+                engine_pool_size, ENGINE_POOL_DIR, ENGINE_POOL_MAX_IDLE_SECONDS
+            )
 
-    def execute_job(self, job_config_path: str, jvm_params: Optional[str] = None, 
-                   job_params: Optional[str] = None) -> Dict[str, Any]:
+    def _java_launch_template(self) -> Optional[Dict[str, List[str]]]:
         """
-        执行DataX作业
+        获取直接启动DataX引擎的命令模板，首次调用时按DATAX_HOME构建并缓存
+        
+        Returns:
+            包含jvm（java及默认JVM参数）和properties（系统属性及classpath）的字典，
+            未启用直接启动或找不到java、DataX的lib目录时返回None
+        """
+        if self._java_launch is None:
+            self._java_launch = False
+            if DATAX_LAUNCH_MODE == 'java':
+                java = JAVA_BIN
+                if java is None and os.environ.get('JAVA_HOME'):
+                    java = os.path.join(os.environ['JAVA_HOME'], 'bin', 'java')
+                java = shutil.which(java or 'java')
+                lib_dir = os.path.join(DATAX_HOME, 'lib')
+                if java is None or not os.path.isdir(lib_dir):
+                    logger.warning("未找到java或DataX的lib目录%s，改为通过datax.py启动DataX", lib_dir)
+                else:
+                    # 与datax.py生成的命令一致
+                    self._java_launch = {
+                        'jvm': [java, '-server'] + shlex.split(DATAX_DEFAULT_JVM),
+                        'properties': [
+                            f"-Dloglevel={DATAX_LOG_LEVEL}",
+                            '-Dfile.encoding=UTF-8',
+                            '-Dlogback.statusListenerClass=ch.qos.logback.core.status.NopStatusListener',
+                            '-Djava.security.egd=file:///dev/urandom',
+                            f"-Ddatax.home={DATAX_HOME}",
+                            f"-Dlogback.configurationFile={os.path.join(DATAX_HOME, 'conf', 'logback.xml')}",
+                            '-classpath', os.path.join(lib_dir, '*') + os.pathsep + '.'
+                        ]
+                    }
+        return self._java_launch or None
+
+    def build_command(self, job_config_path: str, jvm_params: Optional[str] = None,
+                      job_params: Optional[str] = None) -> List[str]:
+        """
+        构建启动DataX的命令
+        
+        默认直接启动DataX引擎的JVM，省去datax.py解释器的启动和一层进程；
+        无法直接启动时使用datax.py。
         
         Args:
             job_config_path: DataX作业配置文件路径
@@ -71,12 +138,22 @@ class DataXExecutor:
             job_params: 作业参数（可选）
             
         Returns:
-            执行结果字典，包含状态码、输出等信息
+            命令参数列表
         """
-        if not os.path.exists(job_config_path):
-            raise FileNotFoundError(f"作业配置文件不存在: {job_config_path}")
-
-        # 构建命令
+        launch = self._java_launch_template()
+        if launch is not None:
+            job_path = os.path.abspath(job_config_path)
+            cmd = list(launch['jvm'])
+            if jvm_params:
+                cmd.extend(shlex.split(jvm_params))
+            cmd.extend(launch['properties'])
+            # datax.py以作业路径的末尾20个字符命名DataX自身的日志文件
+            cmd.append(f"-Dlog.file.name={job_path[-20:].replace('/', '_').replace('.', '_')}")
+            if job_params:
+                cmd.extend(shlex.split(job_params))
+            cmd.extend([DATAX_ENGINE_CLASS, '-mode', 'standalone', '-jobid', '-1', '-job', job_path])
+            return cmd
+        
         cmd = ['python', self.datax_py_path]
         
         # 添加JVM参数
@@ -89,67 +166,546 @@ class DataXExecutor:
             
         # 添加作业配置文件路径
         cmd.append(job_config_path)
+        return cmd
+
+    def _spawn(self, cmd: List[str]) -> subprocess.Popen:
+        """
+        在独立的进程组中启动DataX，终止时可以连同JVM一起结束
         
-        logger.info(f"执行DataX作业: {' '.join(cmd)}")
+        Args:
+            cmd: 命令参数列表
+            
+        Returns:
+            DataX子进程
+        """
+        if os.name == 'nt':
+            group_kwargs = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group_kwargs = {'start_new_session': True}
+        return subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding='utf-8',
+            errors='replace',
+            **group_kwargs
+        )
+
+    def warm_up(self) -> None:
+        """
+        启动预热引擎，在worker子进程启动时调用，未启用引擎池时不做任何事
+        """
+        if self.engine_pool is None:
+            return
+        try:
+            self.engine_pool.warm_up(self.engine_pool.jvm_params)
+        except Exception as e:
+            logger.warning("启动预热DataX引擎失败: %s", e)
+
+    def _launch_warm(self, job_config_path: Optional[str], content: Optional[str],
+                     jvm_params: Optional[str], job_params: Optional[str]) -> Optional[subprocess.Popen]:
+        """
+        把作业交给预热引擎执行
         
+        Args:
+            job_config_path: DataX作业配置文件路径，content不为None时忽略
+            content: 内联作业配置的JSON文本（可选）
+            jvm_params: JVM参数
+            job_params: 作业参数
+            
+        Returns:
+            已开始执行作业的DataX进程，没有可用的引擎或作业参数无法在启动后传入时返回None
+        """
+        if self.engine_pool is None:
+            return None
+        if content is None:
+            with open(job_config_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        content = render_job_params(content, job_params)
+        if content is None:
+            return None
         try:
-            # 执行命令
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
+            engine = self.engine_pool.take(jvm_params)
+        except Exception as e:
+            logger.warning("获取预热DataX引擎失败，改为冷启动: %s", e)
+            return None
+        if engine is None:
+            return None
+        if not engine.handoff(content, ENGINE_HANDOFF_TIMEOUT):
+            logger.warning("预热DataX引擎未能接收作业配置，改为冷启动: %s", engine.engine_id)
+            self.engine_pool.discard(engine)
+            return None
+        return engine.process
+
+    def _write_inline_config(self, job_id: str, content: str) -> str:
+        """
+        把内联作业配置写入INLINE_JOB_DIR（优先使用内存文件系统）下的临时文件
+        
+        Args:
+            job_id: 作业标识，用作文件名前缀
+            content: 作业配置的JSON文本
+            
+        Returns:
+            临时文件路径，作业结束后由调用方删除
+        """
+        os.makedirs(INLINE_JOB_DIR, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=f"{job_id}-", suffix='.json', dir=INLINE_JOB_DIR)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def execute_job(self, job_config_path: Optional[str] = None, jvm_params: Optional[str] = None, 
+                   job_params: Optional[str] = None, job_id: Optional[str] = None,
+                   stream_output: bool = True,
+                   progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   progress_interval: float = PROGRESS_UPDATE_INTERVAL,
+                   timeout: Optional[float] = JOB_TIMEOUT,
+                   stall_timeout: Optional[float] = JOB_STALL_TIMEOUT,
+                   job_config: Optional[Dict[str, Any]] = None,
+                   quarantine: bool = False) -> Dict[str, Any]:
+        """
+        执行DataX作业
+        
+        子进程的stdout/stderr按行流式读取，完整输出写入作业专属的滚动日志文件，
+        内存中只保留最后OUTPUT_TAIL_LINES行。读取过程中同时解析进度行和结束汇总块。
+        
+        DataX在独立的进程组中运行，运行超时或读写记录数长时间没有变化时，
+        终止整个进程组（datax.py及其启动的JVM），结果中的outcome分别为TIMEOUT和STALLED。
+        
+        启用引擎池时，JVM参数与预热引擎相同的作业交给预热引擎执行，省去JVM启动时间；
+        结果中的startup_seconds和transfer_seconds分别为作业开始执行前后的耗时。
+        
+        也可以通过job_config直接传入作业配置：预热引擎通过命名管道接收配置，
+        冷启动时写入INLINE_JOB_DIR下的临时文件，作业结束后删除。
+        
+        作业失败时按输出中的错误信息和退出码判定失败分类（failure_class），
+        调用方据此决定是否重试，判定依据的输出行记录在failure_detail中。
+        
+        隔离模式（quarantine=True）下放宽作业的errorLimit，脏数据写入QUARANTINE_DIR/<作业标识>.jsonl，
+        结果中的quarantined_records和quarantine_file为隔离的条数和文件路径，见quarantine.py。
+        
+        Args:
+            job_config_path: DataX作业配置文件路径，指定job_config时可以省略
+            jvm_params: JVM参数（可选）
+            job_params: 作业参数（可选）
+            job_id: 作业标识，用于命名作业日志文件（可选，默认按配置文件名、时间和随机后缀生成）
+            stream_output: 是否只在结果中返回输出末尾部分，为False时返回完整输出
+            progress_callback: 进度回调（可选），参数为解析出的进度信息字典
+            progress_interval: 两次进度回调之间的最小间隔（秒）
+            timeout: 作业最长运行时间（秒），超时后终止DataX进程，为None或0时不限制
+            stall_timeout: 读写记录数持续多久没有变化视为停滞（秒），停滞后终止DataX进程，
+                           为None或0时不检测
+            job_config: 已解析的作业配置（可选），指定时不读取job_config_path
+            quarantine: 是否隔离脏数据，而不是在脏数据超过errorLimit时使整个作业失败
+            
+        Returns:
+            执行结果字典，包含状态码、输出、outcome、failure_class等信息
+        """
+        if job_config is not None:
+            job_name = 'inline'
+        elif job_config_path is None or not os.path.exists(job_config_path):
+            raise FileNotFoundError(f"作业配置文件不存在: {job_config_path}")
+        else:
+            job_name = os.path.splitext(os.path.basename(job_config_path))[0]
+        if quarantine:
+            # 隔离模式需要修改作业配置，配置文件中的作业也改为以内联配置交给DataX
+            job_config = enable_quarantine(job_config if job_config is not None
+                                           else self.load_job_config(job_config_path))
+        content = None if job_config is None else json.dumps(job_config, ensure_ascii=False)
+
+        if job_id is None:
+            job_id = f"{job_name}-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        log_file = os.path.join(JOB_LOG_DIR, f"{job_id}.log")
+        inline_file = None
+        job_log = None
+        
+        try:
+            # 在启动DataX之前打开作业日志，打开失败时不会留下未被登记和等待的进程
+            job_log = self._open_job_log(log_file)
+            start_time = time.monotonic()
+            process = self._launch_warm(job_config_path, content, jvm_params, job_params)
+            if process is not None:
+                launch_mode = LAUNCH_WARM
+                logger.info("使用预热DataX引擎执行作业: %s", job_config_path or job_id)
+            else:
+                launch_mode = LAUNCH_COLD
+                if content is not None:
+                    inline_file = self._write_inline_config(job_id, content)
+                cmd = self.build_command(inline_file or job_config_path, jvm_params, job_params)
+                logger.info("执行DataX作业: %s", ' '.join(cmd))
+                start_time = time.monotonic()
+                process = self._spawn(cmd)
+            metrics.SPAWN_SECONDS.labels(launch_mode=launch_mode).observe(time.monotonic() - start_time)
+            job = {'process': process, 'outcome': None}
+            with self._processes_lock:
+                self._processes[job_id] = job
+            # 登记进程组，worker主进程可以据此按任务ID终止作业
+            try:
+                register_process(job_id, process.pid)
+                registered = True
+            except OSError as e:
+                logger.warning("登记DataX进程组失败: %s", e)
+                registered = False
             
-            stdout, stderr = process.communicate()
+            # 流式模式下只保留末尾若干行，否则保留完整输出
+            tail_size = OUTPUT_TAIL_LINES if stream_output else None
+            outputs = {
+                'stdout': deque(maxlen=tail_size),
+                'stderr': deque(maxlen=tail_size)
+            }
+            line_count = 0
+            output_parser = DataXOutputParser()
+            failure_classifier = FailureClassifier()
+            quarantine_writer = QuarantineWriter(os.path.join(QUARANTINE_DIR, f"{job_id}.jsonl")) if quarantine else None
+            startup_seconds = None
+            last_report_time = None
+            # 最近一次读写记录数发生变化的时间，作业启动阶段从启动时间开始计算
+            last_counters = None
+            last_advance_time = start_time
+            output_complete = False
+            
+            try:
+                for stream_name, line in self._iter_output(process, WATCHDOG_CHECK_INTERVAL):
+                    now = time.monotonic()
+                    if line is not None:
+                        job_log.emit(logging.makeLogRecord({'msg': line.rstrip('\n')}))
+                        outputs[stream_name].append(line)
+                        line_count += 1
+                        failure_classifier.feed(line)
+                        if quarantine_writer is not None and stream_name == 'stdout':
+                            quarantine_writer.feed(line)
+                        if startup_seconds is None and JOB_CONTAINER_MARKER in line:
+                            startup_seconds = round(now - start_time, 3)
+                        progress = output_parser.feed(line) if stream_name == 'stdout' else None
+                        if progress is not None:
+                            # DataX卡住时仍会按固定间隔打印进度行，只有记录数变化才算有进展
+                            counters = (progress['records'], progress['error_records'])
+                            if counters != last_counters:
+                                last_counters = counters
+                                last_advance_time = now
+                            # 按时间间隔节流，避免频繁写入结果后端
+                            if progress_callback is not None and (
+                                    last_report_time is None or now - last_report_time >= progress_interval):
+                                last_report_time = now
+                                progress['elapsed_seconds'] = round(now - start_time, 3)
+                                self._report_progress(progress_callback, progress)
+                    
+                    if job['outcome'] is None:
+                        if timeout and now - start_time > timeout:
+                            logger.error("DataX作业运行超过%s秒，终止进程组: %s", timeout, job_id)
+                            self._kill_job(job, OUTCOME_TIMEOUT)
+                        elif stall_timeout and now - last_advance_time > stall_timeout:
+                            logger.error("DataX作业%s秒内读写记录数没有变化，终止进程组: %s", stall_timeout, job_id)
+                            self._kill_job(job, OUTCOME_STALLED)
+                output_complete = True
+            finally:
+                if not output_complete and process.poll() is None:
+                    # 处理输出时发生异常，先终止并等待进程组再注销登记，避免DataX脱离管理继续运行
+                    logger.error("处理DataX作业输出时发生异常，终止进程组: %s", job_id)
+                    kill_process_group(process.pid, reap=process.poll)
+                    process.wait()
+                job_log.close()
+                if quarantine_writer is not None:
+                    quarantine_writer.close()
+                with self._processes_lock:
+                    self._processes.pop(job_id, None)
+                if registered:
+                    # 登记被其他进程注销说明作业是通过kill_registered_job从外部终止的
+                    if get_process(job_id) is None and job['outcome'] is None:
+                        job['outcome'] = OUTCOME_CANCELLED
+                    unregister_process(job_id)
+            
+            process.wait()
+            log_key, log_file = self._archive_job_log(log_file)
+            stdout = ''.join(outputs['stdout'])
+            stderr = ''.join(outputs['stderr'])
+            outcome = job['outcome'] or (OUTCOME_SUCCESS if process.returncode == 0 else OUTCOME_FAILED)
+            elapsed_seconds = round(time.monotonic() - start_time, 3)
+            if outcome == OUTCOME_SUCCESS:
+                failure_class = None
+            else:
+                failure_class = OUTCOME_FAILURE_CLASSES.get(outcome) or failure_classifier.classify(process.returncode)
             
             result = {
                 'return_code': process.returncode,
                 'stdout': stdout,
                 'stderr': stderr,
-                'success': process.returncode == 0
+                'success': outcome == OUTCOME_SUCCESS,
+                'outcome': outcome,
+                'failure_class': failure_class,
+                'failure_detail': failure_class and failure_classifier.detail(failure_class),
+                'timed_out': outcome in (OUTCOME_TIMEOUT, OUTCOME_STALLED),
+                'elapsed_seconds': elapsed_seconds,
+                'launch_mode': launch_mode,
+                'startup_seconds': startup_seconds,
+                'transfer_seconds': None if startup_seconds is None else round(elapsed_seconds - startup_seconds, 3),
+                'log_file': log_file,
+                'log_key': log_key,
+                'output_lines': line_count,
+                'output_truncated': line_count > len(outputs['stdout']) + len(outputs['stderr']),
+                'summary': output_parser.summary(),
+                'quarantined_records': quarantine_writer.count if quarantine_writer is not None else None,
+                'quarantine_file': quarantine_writer.path if quarantine_writer is not None and quarantine_writer.count else None
             }
             
-            if process.returncode == 0:
+            metrics.observe_job_result(result)
+            if outcome == OUTCOME_SUCCESS and result['quarantined_records']:
+                logger.warning("DataX作业执行成功，隔离脏数据%s条: %s", result['quarantined_records'], result['quarantine_file'])
+            elif outcome == OUTCOME_SUCCESS:
                 logger.info("DataX作业执行成功")
+            elif outcome == OUTCOME_FAILED:
+                logger.error("DataX作业执行失败，失败分类: %s: %s", failure_class, stderr)
             else:
-                logger.error(f"DataX作业执行失败: {stderr}")
+                logger.error("DataX作业已被终止: %s, outcome: %s", job_id, outcome)
                 
             return result
             
         except Exception as e:
-            logger.error(f"执行DataX作业时发生异常: {str(e)}")
-            return {
+            logger.error("执行DataX作业时发生异常: %s", e)
+            result = {
                 'return_code': -1,
                 'stdout': '',
                 'stderr': str(e),
-                'success': False
+                'success': False,
+                'outcome': OUTCOME_FAILED,
+                'failure_class': classify_exception(e),
+                'failure_detail': str(e),
+                'timed_out': False,
+                'elapsed_seconds': 0,
+                'launch_mode': LAUNCH_COLD,
+                'startup_seconds': None,
+                'transfer_seconds': None,
+                'log_file': None,
+                'log_key': None,
+                'output_lines': 0,
+                'output_truncated': False,
+                'summary': DataXOutputParser().summary(),
+                'quarantined_records': None,
+                'quarantine_file': None
             }
+            metrics.observe_job_result(result)
+            return result
+        finally:
+            if job_log is not None:
+                # 启动DataX失败时作业日志尚未关闭
+                job_log.close()
+            if inline_file is not None:
+                try:
+                    os.remove(inline_file)
+                except OSError:
+                    pass
+
+    def _kill_job(self, job: Dict[str, Any], outcome: str) -> int:
+        """
+        记录终止原因并终止作业的整个进程组
+        
+        Args:
+            job: 作业登记信息，包含process和outcome
+            outcome: 终止原因，写入执行结果的outcome
+            
+        Returns:
+            被终止的进程数，进程已退出或已被终止时返回0
+        """
+        process = job['process']
+        with self._processes_lock:
+            if job['outcome'] is not None or process.poll() is not None:
+                return 0
+            job['outcome'] = outcome
+        # 以独立进程组启动的子进程，进程组ID即其进程ID
+        return kill_process_group(process.pid, reap=process.poll)
+
+    def terminate_job(self, job_id: str) -> int:
+        """
+        终止正在运行的DataX作业，连同其启动的JVM一起结束
+        
+        Args:
+            job_id: 作业标识
+            
+        Returns:
+            被终止的进程数，未找到正在运行的作业时返回0
+        """
+        with self._processes_lock:
+            job = self._processes.get(job_id)
+        if job is None:
+            return 0
+        logger.info("终止DataX作业进程: %s", job_id)
+        return self._kill_job(job, OUTCOME_CANCELLED)
+
+    def terminate_all(self) -> int:
+        """
+        终止本执行器启动的全部DataX作业和预热引擎，用于worker进程退出前的清理
+        
+        Returns:
+            被终止的作业进程数（不含空闲的预热引擎）
+        """
+        with self._processes_lock:
+            job_ids = list(self._processes)
+        reaped = sum(self.terminate_job(job_id) for job_id in job_ids)
+        if self.engine_pool is not None:
+            self.engine_pool.shutdown()
+        return reaped
+
+    def _report_progress(self, progress_callback: Callable[[Dict[str, Any]], None],
+                         progress: Dict[str, Any]) -> None:
+        """
+        调用进度回调，回调异常不影响作业执行
+        
+        Args:
+            progress_callback: 进度回调
+            progress: 进度信息字典
+        """
+        try:
+            progress_callback(progress)
+        except Exception as e:
+            logger.warning("上报DataX作业进度时发生异常: %s", e)
+
+    def _open_job_log(self, log_file: str) -> logging.Handler:
+        """
+        打开作业专属的滚动日志文件
+        
+        Args:
+            log_file: 日志文件路径
+            
+        Returns:
+            按大小滚动的文件处理器，逐行原样写入DataX输出
+        """
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=JOB_LOG_MAX_BYTES,
+            backupCount=JOB_LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        return handler
+
+    def _archive_job_log(self, log_file: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        把作业日志文件（包括滚动产生的备份）压缩保存到作业日志存储
+        
+        Args:
+            log_file: 日志文件路径
+            
+        Returns:
+            (日志摘要, 本地日志文件路径)：未启用存储或保存失败时摘要为None；
+            保存成功且不保留本地文件时删除本地文件，路径为None
+        """
+        if self.log_store is None:
+            return None, log_file
+        # RotatingFileHandler的备份编号越大越早
+        paths = [f"{log_file}.{index}" for index in range(JOB_LOG_BACKUP_COUNT, 0, -1)
+                 if os.path.exists(f"{log_file}.{index}")]
+        paths.append(log_file)
+        try:
+            log_key = self.log_store.put(paths)
+        except Exception as e:
+            logger.warning("保存作业日志失败，保留本地日志文件%s: %s", log_file, e)
+            return None, log_file
+        if LOG_STORE_KEEP_LOCAL:
+            return log_key, log_file
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return log_key, None
+
+    def _iter_output(self, process: subprocess.Popen,
+                     idle_interval: Optional[float] = None) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+        """
+        逐行读取子进程的stdout和stderr
+        
+        两个管道各由一个后台线程读取，避免任一管道写满导致子进程阻塞。
+        
+        Args:
+            process: DataX子进程
+            idle_interval: 没有输出时产出空项的间隔（秒），便于调用方定期检查超时（可选）
+            
+        Yields:
+            (流名称, 行内容)，流名称为'stdout'或'stderr'；等待超过idle_interval时产出(None, None)
+        """
+        lines = queue.Queue()
+        
+        def pump(stream, stream_name):
+            try:
+                for line in iter(stream.readline, ''):
+                    lines.put((stream_name, line))
+            finally:
+                stream.close()
+                lines.put((stream_name, None))
+        
+        readers = [
+            threading.Thread(target=pump, args=(process.stdout, 'stdout'), daemon=True),
+            threading.Thread(target=pump, args=(process.stderr, 'stderr'), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+        
+        remaining = len(readers)
+        while remaining:
+            try:
+                stream_name, line = lines.get(timeout=idle_interval)
+            except queue.Empty:
+                yield None, None
+                continue
+            if line is None:
+                remaining -= 1
+                continue
+            yield stream_name, line
+
+    def load_job_config(self, job_config_path: str) -> Dict[str, Any]:
+        """
+        读取并解析DataX作业配置文件，结果按文件路径和修改时间缓存
+        
+        返回的字典为缓存共享对象，调用方需要修改时请先深拷贝。
+        
+        Args:
+            job_config_path: DataX作业配置文件路径
+            
+        Returns:
+            已解析的作业配置
+        """
+        return self.config_cache.load(job_config_path)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        获取作业配置缓存的统计信息
+        
+        Returns:
+            包含条目数、命中数、未命中数和淘汰数的字典
+        """
+        return self.config_cache.stats()
 
     def validate_job_config(self, job_config_path: str) -> bool:
         """
         验证DataX作业配置文件是否有效
         
+        同一版本的配置文件只解析和验证一次，之后的验证只需一次stat()调用。
+        
         Args:
             job_config_path: DataX作业配置文件路径
             
         Returns:
             配置文件是否有效
         """
+        errors = self.get_validation_errors(job_config_path)
+        for error in errors:
+            logger.error(error)
+        return not errors
+
+    def get_validation_errors(self, job_config_path: str) -> List[str]:
+        """
+        获取DataX作业配置文件的全部校验错误
+        
+        检查插件是否已安装、各插件的必填连接参数、reader/writer列数是否一致以及速度限制设置。
+        
+        Args:
+            job_config_path: DataX作业配置文件路径
+            
+        Returns:
+            错误信息列表，配置有效时为空列表
+        """
         try:
-            with open(job_config_path, 'r', encoding='utf-8') as f:
-                job_config = json.load(f)
-                
-            # 检查必要的字段
-            if 'job' not in job_config:
-                logger.error("作业配置缺少'job'字段")
-                return False
-                
-            if 'content' not in job_config['job']:
-                logger.error("作业配置缺少'job.content'字段")
-                return False
-                
-            return True
+            return self.config_cache.verdict(job_config_path, 'schema', self.validator.validate)
         except Exception as e:
-            logger.error(f"验证作业配置文件时发生异常: {str(e)}")
-            return False
\ No newline at end of file
+            return [f"验证作业配置文件时发生异常: {str(e)}"]
\ No newline at end of file
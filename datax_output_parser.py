@@ -0,0 +1,152 @@
+"""
+DataX输出解析工具，从DataX打印的日志行中提取结构化信息
+"""
+
+import re
+from typing import Dict, Any, Optional
+
+# DataX打印速度时使用的容量单位
+SIZE_UNITS = {
+    'B': 1,
+    'KB': 1024,
+    'MB': 1024 ** 2,
+    'GB': 1024 ** 3,
+    'TB': 1024 ** 4
+}
+
+# 周期性进度行，例如：
+# Total 100000 records, 2600000 bytes | Speed 253.91KB/s, 10000 records/s |
+# Error 0 records, 0 bytes | All Task WaitWriterTime 0.012s | ... | Percentage 100.00%
+PROGRESS_PATTERN = re.compile(
+    r'Total (?P<records>\d+) records, (?P<bytes>\d+) bytes \| '
+    r'Speed (?P<speed>[\d.]+)(?P<speed_unit>[KMGT]?B)/s, (?P<record_speed>\d+) records/s \| '
+    r'Error (?P<error_records>\d+) records, (?P<error_bytes>\d+) bytes'
+    r'(?:.*?Percentage (?P<percentage>[\d.]+)%)?'
+)
+
+
+def parse_size(value: str, unit: str) -> int:
+    """
+    将DataX输出的容量换算为字节数
+
+    Args:
+        value: 数值部分，例如"253.91"
+        unit: 单位部分，例如"KB"
+
+    Returns:
+        字节数
+    """
+    return int(float(value) * SIZE_UNITS[unit])
+
+
+def parse_progress_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    解析DataX周期性打印的进度行
+
+    Args:
+        line: DataX输出的一行
+
+    Returns:
+        进度信息字典，不是进度行时返回None
+    """
+    # 先做廉价的子串判断，绝大多数日志行不需要进入正则匹配
+    if 'Total ' not in line or ' records/s' not in line:
+        return None
+
+    match = PROGRESS_PATTERN.search(line)
+    if not match:
+        return None
+
+    percentage = match.group('percentage')
+    return {
+        'records': int(match.group('records')),
+        'bytes': int(match.group('bytes')),
+        'bytes_per_second': parse_size(match.group('speed'), match.group('speed_unit')),
+        'records_per_second': int(match.group('record_speed')),
+        'error_records': int(match.group('error_records')),
+        'error_bytes': int(match.group('error_bytes')),
+        'percentage': float(percentage) if percentage is not None else None
+    }
+
+
+# 作业结束时打印的汇总块，每行形如"任务总计耗时                    :                 10s"
+SUMMARY_PATTERN = re.compile(
+    r'^\s*(?P<label>任务启动时刻|任务结束时刻|任务总计耗时|任务平均流量|记录写入速度|读出记录总数|读写失败总数)'
+    r'\s*:\s*(?P<value>.+?)\s*$'
+)
+SPEED_PATTERN = re.compile(r'(?P<value>[\d.]+)(?P<unit>[KMGT]?B)/s')
+INTEGER_PATTERN = re.compile(r'\d+')
+
+
+class DataXOutputParser:
+    """
+    DataX输出的单遍解析器，逐行喂入输出，同时跟踪进度行和结束汇总块
+    """
+
+    # 汇总块标签到结果字段及取值函数的映射
+    SUMMARY_FIELDS = {
+        '任务启动时刻': ('start_time', str),
+        '任务结束时刻': ('end_time', str),
+        '任务总计耗时': ('elapsed_seconds', lambda value: int(INTEGER_PATTERN.search(value).group())),
+        '任务平均流量': ('avg_bytes_per_second',
+                   lambda value: parse_size(*SPEED_PATTERN.search(value).group('value', 'unit'))),
+        '记录写入速度': ('records_per_second', lambda value: int(INTEGER_PATTERN.search(value).group())),
+        '读出记录总数': ('total_records', int),
+        '读写失败总数': ('total_failures', int)
+    }
+
+    def __init__(self):
+        """
+        初始化解析器
+        """
+        self.last_progress = None
+        self._summary = {}
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        解析一行DataX输出
+
+        Args:
+            line: DataX输出的一行
+
+        Returns:
+            该行是进度行时返回进度信息字典，否则返回None
+        """
+        progress = parse_progress_line(line)
+        if progress is not None:
+            self.last_progress = progress
+            return progress
+
+        # 汇总块的标签均以这几个汉字开头，先用首字符过滤
+        stripped = line.lstrip()
+        if not stripped or stripped[0] not in '任记读':
+            return None
+
+        match = SUMMARY_PATTERN.match(stripped)
+        if match:
+            field, convert = self.SUMMARY_FIELDS[match.group('label')]
+            try:
+                self._summary[field] = convert(match.group('value'))
+            except (ValueError, AttributeError, KeyError):
+                pass
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        获取作业汇总信息
+
+        Returns:
+            汇总信息字典，DataX未打印的字段值为None
+        """
+        summary = {field: self._summary.get(field) for field, _ in self.SUMMARY_FIELDS.values()}
+
+        # 汇总块不包含总字节数，取最后一次进度行中的值
+        summary['total_bytes'] = self.last_progress['bytes'] if self.last_progress else None
+
+        total_records = summary['total_records']
+        total_failures = summary['total_failures']
+        if total_records is not None and total_failures is not None:
+            summary['error_rate'] = total_failures / total_records if total_records else 0.0
+        else:
+            summary['error_rate'] = None
+        return summary
@@ -0,0 +1,211 @@
+"""
+按数据源/目标数据库限制并发DataX作业数的分布式信号量
+
+大量作业同时读写同一个数据库时，锁竞争和IO争用会使总吞吐量下降。这里从作业配置的
+jdbcUrl中提取数据库地址，在Redis中为每个地址维护一个带租约的信号量，作业在启动DataX
+之前必须同时获得其读写的全部地址的名额。
+"""
+
+import re
+import time
+from typing import Dict, Any, List, Optional
+from config import (ENDPOINT_CONCURRENCY_LIMITS, DEFAULT_ENDPOINT_CONCURRENCY,
+                    ENDPOINT_LEASE_SECONDS)
+from redis_utils import get_redis_client, RedisLease
+
+# jdbc:mysql://host:3306/db、jdbc:sqlserver://host:1433;DatabaseName=db 等
+URL_AUTHORITY_PATTERN = re.compile(r'^jdbc:[\w:]+?://([^/;?]+)', re.IGNORECASE)
+# jdbc:oracle:thin:@host:1521:sid、jdbc:oracle:thin:@//host:1521/service
+ORACLE_PATTERN = re.compile(r'^jdbc:oracle:\w+:@(?://)?([^/:]+(?::\d+)?)', re.IGNORECASE)
+
+# 原子地为全部地址申请名额：清理过期租约后任一地址名额已满则全部不申请
+ACQUIRE_SCRIPT = """
+local now = ARGV[1]
+local expires = ARGV[2]
+local ttl = tonumber(ARGV[3])
+local job_id = ARGV[4]
+local count = #KEYS - 1
+for i = 1, count do
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now)
+    if not redis.call('ZSCORE', KEYS[i], job_id) and redis.call('ZCARD', KEYS[i]) >= tonumber(ARGV[4 + i]) then
+        return 0
+    end
+end
+local endpoints = {}
+for i = 1, count do
+    redis.call('ZADD', KEYS[i], expires, job_id)
+    redis.call('EXPIRE', KEYS[i], ttl)
+    endpoints[i] = KEYS[i]
+end
+redis.call('SET', KEYS[count + 1], table.concat(endpoints, '\\n'), 'EX', ttl)
+return 1
+"""
+
+# 续期作业持有的全部名额
+RENEW_SCRIPT = """
+local endpoints = redis.call('GET', KEYS[1])
+if not endpoints then
+    return 0
+end
+for key in string.gmatch(endpoints, '[^\\n]+') do
+    redis.call('ZADD', key, 'XX', ARGV[2], ARGV[1])
+    redis.call('EXPIRE', key, ARGV[3])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# 释放作业持有的全部名额
+RELEASE_SCRIPT = """
+local endpoints = redis.call('GET', KEYS[1])
+if not endpoints then
+    return 0
+end
+for key in string.gmatch(endpoints, '[^\\n]+') do
+    redis.call('ZREM', key, ARGV[1])
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+
+def parse_jdbc_endpoint(jdbc_url: str) -> Optional[str]:
+    """
+    从jdbcUrl中提取数据库地址
+
+    Args:
+        jdbc_url: JDBC连接串
+
+    Returns:
+        小写的"主机:端口"（未写端口时只有主机），无法识别时返回None
+    """
+    jdbc_url = jdbc_url.strip()
+    match = ORACLE_PATTERN.match(jdbc_url) or URL_AUTHORITY_PATTERN.match(jdbc_url)
+    if not match:
+        return None
+    # 去掉可能存在的用户信息
+    return match.group(1).rsplit('@', 1)[-1].lower()
+
+
+def extract_endpoints(job_config: Dict[str, Any]) -> List[str]:
+    """
+    提取作业中全部reader/writer连接的数据库地址
+
+    Args:
+        job_config: 已解析的DataX作业配置
+
+    Returns:
+        去重并排序后的数据库地址列表
+    """
+    endpoints = set()
+    for content in job_config.get('job', {}).get('content', []):
+        for role in ('reader', 'writer'):
+            parameter = content.get(role, {}).get('parameter', {})
+            for connection in parameter.get('connection', []):
+                if not isinstance(connection, dict):
+                    continue
+                urls = connection.get('jdbcUrl', [])
+                if isinstance(urls, str):
+                    urls = [urls]
+                # reader可以配置多个备选地址，实际只会连接其中一个，按第一个计算
+                for url in urls[:1]:
+                    endpoint = parse_jdbc_endpoint(url) if isinstance(url, str) else None
+                    if endpoint:
+                        endpoints.add(endpoint)
+    return sorted(endpoints)
+
+
+def get_endpoint_limit(endpoint: str) -> int:
+    """
+    获取数据库地址的并发作业上限
+
+    Args:
+        endpoint: "主机:端口"形式的数据库地址
+
+    Returns:
+        并发作业上限，依次按"主机:端口"、"主机"查找配置，都未配置时使用默认值
+    """
+    if endpoint in ENDPOINT_CONCURRENCY_LIMITS:
+        return ENDPOINT_CONCURRENCY_LIMITS[endpoint]
+    host = endpoint.rsplit(':', 1)[0]
+    return ENDPOINT_CONCURRENCY_LIMITS.get(host, DEFAULT_ENDPOINT_CONCURRENCY)
+
+
+class EndpointLimiter:
+    """
+    基于Redis有序集合的数据库地址信号量，成员为作业标识，分值为租约到期时间
+    """
+
+    def __init__(self):
+        """
+        初始化信号量
+        """
+        self._client = get_redis_client()
+        self._acquire = self._client.register_script(ACQUIRE_SCRIPT)
+        self._renew = self._client.register_script(RENEW_SCRIPT)
+        self._release = self._client.register_script(RELEASE_SCRIPT)
+
+    @staticmethod
+    def _endpoint_key(endpoint: str) -> str:
+        return f"datax:endpoint:{endpoint}"
+
+    @staticmethod
+    def _holder_key(job_id: str) -> str:
+        return f"datax:endpoint-holder:{job_id}"
+
+    def try_acquire(self, job_id: str, endpoints: List[str]) -> Optional[RedisLease]:
+        """
+        尝试为作业获取全部数据库地址的名额
+
+        Args:
+            job_id: 作业标识
+            endpoints: 数据库地址列表
+
+        Returns:
+            获取成功时返回租约，任一地址名额已满时返回None
+        """
+        now = time.time()
+        keys = [self._endpoint_key(endpoint) for endpoint in endpoints] + [self._holder_key(job_id)]
+        limits = [get_endpoint_limit(endpoint) for endpoint in endpoints]
+        acquired = self._acquire(
+            keys=keys,
+            args=[now, now + ENDPOINT_LEASE_SECONDS, ENDPOINT_LEASE_SECONDS, job_id] + limits
+        )
+        if not acquired:
+            return None
+        return RedisLease(job_id, self.renew, self.release, ENDPOINT_LEASE_SECONDS / 3)
+
+    def renew(self, job_id: str) -> None:
+        """
+        续期作业持有的全部名额
+
+        Args:
+            job_id: 作业标识
+        """
+        self._renew(keys=[self._holder_key(job_id)],
+                    args=[job_id, time.time() + ENDPOINT_LEASE_SECONDS, ENDPOINT_LEASE_SECONDS])
+
+    def release(self, job_id: str) -> None:
+        """
+        释放作业持有的全部名额，可在任意进程中按作业标识调用
+
+        Args:
+            job_id: 作业标识
+        """
+        self._release(keys=[self._holder_key(job_id)], args=[job_id])
+
+    def usage(self, endpoint: str) -> Dict[str, int]:
+        """
+        获取数据库地址当前的名额占用情况
+
+        Args:
+            endpoint: 数据库地址
+
+        Returns:
+            包含运行中作业数和上限的字典
+        """
+        key = self._endpoint_key(endpoint)
+        return {
+            'running': self._client.zcount(key, time.time(), '+inf'),
+            'limit': get_endpoint_limit(endpoint)
+        }
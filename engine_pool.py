@@ -0,0 +1,354 @@
+"""
+预热的DataX引擎进程池
+
+每启动一个DataX作业都要新建JVM并加载框架类，小作业的启动时间往往超过数据传输时间。
+引擎池预先启动若干DataX进程，作业配置文件路径指向各自的命名管道：进程完成JVM启动后
+阻塞在读取管道上，作业到来时把作业配置写入管道即可开始执行，省去JVM启动的等待。
+DataX引擎执行完一个作业后即退出，因此每个预热进程只执行一个作业，取走后由后台线程补充新的进程；
+空闲超过max_idle_seconds的进程也由后台线程回收重建，避免长期占用内存，取用引擎时不等待进程退出。
+
+命名管道只在POSIX系统上可用，其他平台上引擎池不启用。
+"""
+
+import errno
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from process_registry import register_process, unregister_process, kill_process_group
+from logging_utils import setup_logging
+
+# DataX作业配置中的变量引用，与DataX的StrUtil.replaceVariable一致：$name或${name}
+VARIABLE_PATTERN = re.compile(r'(\$)\{?(\w+)\}?')
+
+logger = setup_logging(__name__)
+
+
+def render_job_params(content: str, job_params: Optional[str]) -> Optional[str]:
+    """
+    在交给预热引擎之前替换作业配置中的变量
+
+    预热引擎在作业参数确定之前就已启动，无法再通过-p传入系统属性，
+    这里按DataX的规则把-Dname=value替换到配置中的$name和${name}。
+
+    Args:
+        content: 作业配置文件内容
+        job_params: 作业参数（可选）
+
+    Returns:
+        替换后的作业配置，作业参数中含有-Dname=value以外的内容时返回None（只能冷启动）
+    """
+    if not job_params:
+        return content
+    values = {}
+    for token in shlex.split(job_params):
+        if not token.startswith('-D') or '=' not in token:
+            return None
+        name, value = token[2:].split('=', 1)
+        values[name] = value
+
+    def replace(match):
+        value = values.get(match.group(2))
+        # 与DataX一致，未定义或为空白的变量保持原样
+        return value if value and value.strip() else match.group(0)
+
+    return VARIABLE_PATTERN.sub(replace, content)
+
+
+class WarmEngine:
+    """
+    一个已启动、正在等待作业配置的DataX进程
+    """
+
+    def __init__(self, engine_id: str, fifo_path: str, jvm_params: Optional[str],
+                 process: subprocess.Popen):
+        """
+        初始化预热引擎
+
+        Args:
+            engine_id: 引擎标识，空闲期间以此登记进程组
+            fifo_path: 作业配置命名管道的路径
+            jvm_params: 启动时使用的JVM参数
+            process: DataX进程
+        """
+        self.engine_id = engine_id
+        self.fifo_path = fifo_path
+        self.jvm_params = jvm_params
+        self.process = process
+        self.started_at = time.monotonic()
+
+    def handoff(self, content: str, timeout: float) -> bool:
+        """
+        把作业配置写入命名管道，引擎读取后开始执行作业
+
+        Args:
+            content: 作业配置内容
+            timeout: 等待引擎打开管道的最长时间（秒）
+
+        Returns:
+            是否已交付，引擎已退出或超时未打开管道时返回False
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                # 非阻塞打开，引擎尚未打开管道读取时返回ENXIO，不会无限期阻塞
+                fd = os.open(self.fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+                break
+            except OSError as e:
+                if e.errno != errno.ENXIO:
+                    raise
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        os.set_blocking(fd, True)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+        except BrokenPipeError:
+            return False
+        finally:
+            self.discard_fifo()
+        return True
+
+    def discard_fifo(self) -> None:
+        """
+        删除命名管道，已打开管道的进程不受影响
+        """
+        try:
+            os.remove(self.fifo_path)
+        except FileNotFoundError:
+            pass
+
+    def kill(self) -> None:
+        """
+        终止引擎进程组并删除命名管道
+        """
+        unregister_process(self.engine_id)
+        if self.process.poll() is None:
+            kill_process_group(self.process.pid, grace_seconds=1, reap=self.process.poll)
+        self.process.wait()
+        self.discard_fifo()
+
+
+class WarmEnginePool:
+    """
+    worker进程内的预热DataX引擎池
+
+    空闲引擎按启动时的JVM参数分组，作业只取用JVM参数相同的引擎，没有时冷启动，不影响其他分组的引擎。
+    回收和补充引擎都在后台维护线程中进行：取走引擎后补充一个按最近一次作业的JVM参数启动的引擎
+    （引擎总数不超过size），其他JVM参数的引擎空闲超过max_idle_seconds后回收，腾出的名额按新参数补充。
+
+    引擎池属于创建它的进程，prefork模式下在worker子进程中调用warm_up后才会启动引擎和维护线程，
+    fork继承来的引擎由父进程负责，子进程中不会使用。
+    """
+
+    def __init__(self, spawn: Callable[[str, Optional[str]], subprocess.Popen], size: int,
+                 fifo_dir: str, max_idle_seconds: Optional[float] = None):
+        """
+        初始化引擎池
+
+        Args:
+            spawn: 启动DataX进程的函数，参数为作业配置路径和JVM参数
+            size: 预热的引擎数
+            fifo_dir: 命名管道所在目录
+            max_idle_seconds: 空闲引擎的最长保留时间（秒），为None或0时不回收
+        """
+        self.spawn = spawn
+        self.size = size
+        self.fifo_dir = fifo_dir
+        self.max_idle_seconds = max_idle_seconds
+        # 补充引擎时使用的JVM参数（最近一次作业的JVM参数）
+        self.jvm_params = None
+        self._engines: Dict[Optional[str], List[WarmEngine]] = {}
+        self._sequence = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        # 同一时刻只有一个线程回收和补充引擎
+        self._replenish_lock = threading.Lock()
+        # 已取出但交付失败、等待维护线程终止的引擎
+        self._discarded: List[WarmEngine] = []
+        self._wakeup = threading.Event()
+        self._maintainer: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @staticmethod
+    def supported() -> bool:
+        """
+        当前平台是否支持引擎池
+
+        Returns:
+            支持命名管道时返回True
+        """
+        return hasattr(os, 'mkfifo')
+
+    def _check_owner(self) -> None:
+        if self._pid != os.getpid():
+            # fork之后的子进程不能等待父进程启动的引擎，丢弃继承来的记录，维护线程也不会随fork复制
+            self._engines = {}
+            self._discarded = []
+            self._maintainer = None
+            self._pid = os.getpid()
+
+    def _start_engine(self, jvm_params: Optional[str]) -> WarmEngine:
+        """
+        启动一个预热引擎
+
+        Args:
+            jvm_params: JVM参数
+
+        Returns:
+            预热引擎
+        """
+        os.makedirs(self.fifo_dir, exist_ok=True)
+        self._sequence += 1
+        engine_id = f"engine-{os.getpid()}-{self._sequence}"
+        fifo_path = os.path.join(self.fifo_dir, f"{engine_id}.json")
+        os.mkfifo(fifo_path, 0o600)
+        try:
+            process = self.spawn(fifo_path, jvm_params)
+        except Exception:
+            os.remove(fifo_path)
+            raise
+        engine = WarmEngine(engine_id, fifo_path, jvm_params, process)
+        try:
+            # 空闲引擎也登记进程组，worker子进程异常退出后由worker主进程回收
+            register_process(engine_id, process.pid)
+        except OSError:
+            pass
+        return engine
+
+    def _ensure_maintainer(self) -> None:
+        """
+        启动后台维护线程（调用方持有锁）
+        """
+        if self._stopped or (self._maintainer is not None and self._maintainer.is_alive()):
+            return
+        self._maintainer = threading.Thread(target=self._maintain, name='engine-pool-maintainer', daemon=True)
+        self._maintainer.start()
+
+    def _maintain(self) -> None:
+        """
+        后台维护线程：被唤醒或每隔max_idle_seconds回收失效的引擎并补足引擎数
+        """
+        while not self._stopped:
+            self._wakeup.wait(self.max_idle_seconds or None)
+            self._wakeup.clear()
+            if self._stopped:
+                break
+            try:
+                self._replenish()
+            except Exception as e:
+                logger.warning("补充预热DataX引擎失败: %s", e)
+
+    def _replenish(self) -> None:
+        """
+        回收已退出、空闲过久或交付失败的引擎，并按self.jvm_params补足引擎数
+        """
+        with self._replenish_lock:
+            with self._lock:
+                self._check_owner()
+                now = time.monotonic()
+                expired, self._discarded = self._discarded, []
+                for jvm_params, engines in list(self._engines.items()):
+                    alive = []
+                    for engine in engines:
+                        if (engine.process.poll() is not None
+                                or (self.max_idle_seconds and now - engine.started_at > self.max_idle_seconds)):
+                            expired.append(engine)
+                        else:
+                            alive.append(engine)
+                    if alive:
+                        self._engines[jvm_params] = alive
+                    else:
+                        del self._engines[jvm_params]
+                jvm_params = self.jvm_params
+                missing = self.size - sum(len(engines) for engines in self._engines.values())
+            for engine in expired:
+                engine.kill()
+            # 启动进程不持有锁，补充期间取用引擎不必等待
+            for _ in range(max(0, missing)):
+                engine = self._start_engine(jvm_params)
+                with self._lock:
+                    self._engines.setdefault(jvm_params, []).append(engine)
+
+    def warm_up(self, jvm_params: Optional[str] = None) -> None:
+        """
+        启动预热引擎和后台维护线程，在worker子进程启动时调用
+
+        Args:
+            jvm_params: 预热使用的JVM参数
+        """
+        with self._lock:
+            self._check_owner()
+            self._stopped = False
+            self.jvm_params = jvm_params
+        self._replenish()
+        with self._lock:
+            self._ensure_maintainer()
+
+    def take(self, jvm_params: Optional[str]) -> Optional[WarmEngine]:
+        """
+        取出一个使用相同JVM参数启动的预热引擎，由后台线程补充新的引擎
+
+        Args:
+            jvm_params: 作业的JVM参数
+
+        Returns:
+            预热引擎，没有可用的引擎时返回None（作业冷启动，不回收其他JVM参数的引擎）
+        """
+        engine = None
+        with self._lock:
+            self._check_owner()
+            engines = self._engines.get(jvm_params, [])
+            for candidate in engines:
+                # 已退出的引擎留给维护线程回收
+                if candidate.process.poll() is None:
+                    engine = candidate
+                    break
+            if engine is not None:
+                engines.remove(engine)
+                if not engines:
+                    del self._engines[jvm_params]
+                unregister_process(engine.engine_id)
+            self.jvm_params = jvm_params
+            self._ensure_maintainer()
+        self._wakeup.set()
+        return engine
+
+    def discard(self, engine: WarmEngine) -> None:
+        """
+        交由维护线程终止已取出但未能使用的引擎
+
+        Args:
+            engine: 预热引擎
+        """
+        with self._lock:
+            self._check_owner()
+            self._discarded.append(engine)
+            self._ensure_maintainer()
+        self._wakeup.set()
+
+    def shutdown(self) -> int:
+        """
+        停止维护线程并终止全部空闲引擎
+
+        Returns:
+            被终止的引擎数
+        """
+        with self._lock:
+            self._check_owner()
+            self._stopped = True
+            maintainer, self._maintainer = self._maintainer, None
+        self._wakeup.set()
+        if maintainer is not None:
+            maintainer.join()
+        with self._lock:
+            engines = [engine for group in self._engines.values() for engine in group]
+            self._engines = {}
+            discarded, self._discarded = self._discarded, []
+        for engine in engines + discarded:
+            engine.kill()
+        return len(engines)
@@ -96,6 +96,24 @@ def example_custom_queue():
     print(f"已提交到高优先级队列的任务ID: {task_id}")
 
 
+def example_cancel_task():
+    """取消任务示例"""
+    print("\n=== 取消任务示例 ===")
+    
+    # 创建任务调度器实例
+    scheduler = DataXTaskScheduler()
+    
+    task_id = scheduler.schedule_job_execution(job_config_path=DATAX_JOB_PATH)
+    print(f"已提交作业执行任务，任务ID: {task_id}")
+    
+    # cancel_task返回CancelResult，作为条件判断时取cancelled，reaped为被终止的DataX进程数
+    result = scheduler.cancel_task(task_id)
+    if result:
+        print(f"已取消任务，终止的DataX进程数: {result['reaped']}")
+    else:
+        print("取消任务失败")
+
+
 def example_mysql_job_usage():
     """MySQL作业示例"""
     print("\n=== MySQL作业使用示例 ===")
@@ -142,6 +160,7 @@ if __name__ == "__main__":
     example_basic_usage()
     example_job_validation()
     example_custom_queue()
+    example_cancel_task()
     example_mysql_job_usage()  # 添加这一行来调用新的示例函数
     
     print("\n" + "=" * 50)
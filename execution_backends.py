@@ -0,0 +1,617 @@
+"""
+DataX作业执行后端
+
+DataXTaskScheduler通过执行后端提交、查询和取消作业：
+- CeleryExecutionBackend：通过Celery broker把作业分发到worker集群执行
+- LocalExecutionBackend：在本机线程池中直接调用DataXExecutor执行，不依赖broker和结果后端
+"""
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, List, Dict, Any, Tuple, Union
+from celery import states
+from config import (LOCAL_MAX_PARALLEL, LOCAL_MAX_PENDING, LOCAL_JOB_TIMEOUT,
+                    LOCAL_JOB_MEMORY_BYTES, RESULT_POLL_INTERVAL, JOB_STALL_TIMEOUT,
+                    CANCEL_REPLY_TIMEOUT)
+from fair_share import resolve_priority
+from job_templates import JobTemplateStore
+from logging_utils import log_context
+
+
+class CancelResult(dict):
+    """
+    取消任务的结果，包含cancelled（是否已发出取消）和reaped（被终止的DataX相关进程数）
+
+    作为条件判断时取cancelled的值，与cancel_task原先返回布尔值时的写法兼容：
+    if scheduler.cancel_task(task_id): ...
+    """
+
+    def __init__(self, cancelled: bool, reaped: int):
+        """
+        初始化取消结果
+
+        Args:
+            cancelled: 是否已发出取消
+            reaped: 被终止的DataX相关进程数
+        """
+        super().__init__(cancelled=cancelled, reaped=reaped)
+
+    def __bool__(self) -> bool:
+        return bool(self['cancelled'])
+
+
+class ExecutionBackend:
+    """
+    执行后端接口
+    """
+
+    def submit(self, job_config_path: Optional[str], jvm_params: Optional[str] = None,
+               job_params: Optional[str] = None, queue: str = 'celery',
+               job_timeout: Optional[float] = None, stall_timeout: Optional[float] = None,
+               incremental: Optional[Dict[str, Any]] = None,
+               priority: Union[str, int, None] = None, tenant: Optional[str] = None,
+               template: Optional[str] = None, template_params: Optional[Dict[str, Any]] = None,
+               job_config: Optional[Dict[str, Any]] = None,
+               quarantine: bool = False) -> str:
+        """
+        提交DataX作业
+
+        Args:
+            job_config_path: DataX作业配置文件路径
+            jvm_params: JVM参数（可选）
+            job_params: 作业参数（可选）
+            queue: 任务队列名称
+            job_timeout: 作业最长运行时间（秒），为None时使用执行端的默认值，为0时不限制
+            stall_timeout: 停滞判定时间（秒），为None时使用执行端的默认值，为0时不检测
+            incremental: 增量配置（可选），见WatermarkStore.open_window
+            priority: 优先级（可选），PRIORITY_LEVELS中的级别名称或0-9的数值，数值越小越优先
+            tenant: 作业所属租户（可选），集群繁忙时按租户权重公平分配运行名额
+            template: 作业模板ID（可选），与template_params一起代替job_config_path
+            template_params: 模板参数（可选）
+            job_config: 内联作业配置（可选），代替job_config_path
+            quarantine: 是否隔离脏数据（可选），见quarantine.py
+
+        Returns:
+            任务ID
+        """
+        raise NotImplementedError
+
+    def submit_many(self, job_specs: List[Dict[str, Any]], queue: str = 'celery',
+                    chunk_size: int = 500) -> List[str]:
+        """
+        批量提交DataX作业
+
+        Args:
+            job_specs: 作业描述列表，每项为包含job_config_path（或template、template_params，
+                       或job_config）以及可选的jvm_params、job_params、queue、job_timeout、
+                       stall_timeout、incremental、priority、tenant、quarantine的字典
+            queue: 作业描述中未指定queue时使用的任务队列名称
+            chunk_size: 分块大小
+
+        Returns:
+            与job_specs顺序一致的任务ID列表
+        """
+        return [
+            self.submit(spec.get('job_config_path'), spec.get('jvm_params'),
+                        spec.get('job_params'), spec.get('queue', queue),
+                        spec.get('job_timeout'), spec.get('stall_timeout'),
+                        spec.get('incremental'), spec.get('priority'), spec.get('tenant'),
+                        spec.get('template'), spec.get('template_params'), spec.get('job_config'),
+                        spec.get('quarantine', False))
+            for spec in job_specs
+        ]
+
+    def get_result(self, task_id: str):
+        """
+        获取任务结果对象
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            具有state、result、info、ready()、successful()、failed()、get()的结果对象
+        """
+        raise NotImplementedError
+
+    def get_statuses(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取任务状态
+
+        Args:
+            task_ids: 任务ID列表
+
+        Returns:
+            任务ID到状态信息的映射，状态信息包含state和info
+        """
+        statuses = {}
+        for task_id in task_ids:
+            result = self.get_result(task_id)
+            statuses[task_id] = {'state': result.state, 'info': result.info}
+        return statuses
+
+    async def wait_for(self, task_ids: List[str], count: int) -> Dict[str, Dict[str, Any]]:
+        """
+        异步等待至少count个任务结束
+
+        Args:
+            task_ids: 任务ID列表
+            count: 需要等待结束的任务数
+
+        Returns:
+            已结束任务的ID到状态信息的映射
+        """
+        while True:
+            statuses = await asyncio.get_running_loop().run_in_executor(None, self.get_statuses, task_ids)
+            done = {task_id: status for task_id, status in statuses.items()
+                    if status['state'] in states.READY_STATES}
+            if len(done) >= count:
+                return done
+            await asyncio.sleep(RESULT_POLL_INTERVAL)
+
+    def cancel(self, task_id: str) -> CancelResult:
+        """
+        取消任务执行，正在运行的作业连同DataX进程树一起终止
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            CancelResult，包含cancelled（是否已发出取消）和reaped（被终止的DataX相关进程数），
+            作为条件判断时取cancelled
+        """
+        raise NotImplementedError
+
+
+class CeleryExecutionBackend(ExecutionBackend):
+    """
+    基于Celery的执行后端，作业通过broker分发到worker执行
+    """
+
+    def __init__(self):
+        """
+        初始化Celery执行后端
+        """
+        from celery_app import app, execute_datax_job, fair_share
+        self.app = app
+        self.task = execute_datax_job
+        self.fair_share = fair_share
+
+    def submit(self, job_config_path: Optional[str], jvm_params: Optional[str] = None,
+               job_params: Optional[str] = None, queue: str = 'celery',
+               job_timeout: Optional[float] = None, stall_timeout: Optional[float] = None,
+               incremental: Optional[Dict[str, Any]] = None,
+               priority: Union[str, int, None] = None, tenant: Optional[str] = None,
+               template: Optional[str] = None, template_params: Optional[Dict[str, Any]] = None,
+               job_config: Optional[Dict[str, Any]] = None,
+               quarantine: bool = False) -> str:
+        priority = resolve_priority(priority)
+        task_id = str(uuid.uuid4())
+        self.record_queued([(task_id, tenant)])
+        task = self.task.apply_async(
+            args=[job_config_path],
+            kwargs={
+                'jvm_params': jvm_params,
+                'job_params': job_params,
+                'job_timeout': job_timeout,
+                'stall_timeout': stall_timeout,
+                'incremental': incremental,
+                'tenant': tenant,
+                'submitted_at': time.time(),
+                'template': template,
+                'template_params': template_params,
+                'job_config': job_config,
+                'quarantine': quarantine
+            },
+            queue=queue,
+            priority=priority,
+            task_id=task_id
+        )
+        return task.id
+
+    def submit_many(self, job_specs: List[Dict[str, Any]], queue: str = 'celery',
+                    chunk_size: int = 500) -> List[str]:
+        # 每个分块只从连接池获取一次生产者，复用同一个broker连接发布全部消息
+        task_ids = []
+        for start in range(0, len(job_specs), chunk_size):
+            chunk = job_specs[start:start + chunk_size]
+            priorities = [resolve_priority(spec.get('priority')) for spec in chunk]
+            chunk_ids = [str(uuid.uuid4()) for _ in chunk]
+            self.record_queued([(task_id, spec.get('tenant')) for task_id, spec in zip(chunk_ids, chunk)])
+            with self.app.producer_or_acquire() as producer:
+                for task_id, spec, priority in zip(chunk_ids, chunk, priorities):
+                    task = self.task.apply_async(
+                        args=[spec.get('job_config_path')],
+                        kwargs={
+                            'jvm_params': spec.get('jvm_params'),
+                            'job_params': spec.get('job_params'),
+                            'job_timeout': spec.get('job_timeout'),
+                            'stall_timeout': spec.get('stall_timeout'),
+                            'incremental': spec.get('incremental'),
+                            'tenant': spec.get('tenant'),
+                            'submitted_at': time.time(),
+                            'template': spec.get('template'),
+                            'template_params': spec.get('template_params'),
+                            'job_config': spec.get('job_config'),
+                            'quarantine': spec.get('quarantine', False)
+                        },
+                        queue=spec.get('queue', queue),
+                        priority=priority,
+                        task_id=task_id,
+                        producer=producer
+                    )
+                    task_ids.append(task.id)
+        return task_ids
+
+    def record_queued(self, jobs: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        在发布消息之前登记排队中的作业，供worker按租户公平分配运行名额
+
+        Args:
+            jobs: (任务ID, 租户)列表
+        """
+        if self.fair_share is None:
+            return
+        try:
+            self.fair_share.record_queued(jobs)
+        except Exception:
+            # 排队记录只影响公平共享的判断，登记失败不影响提交作业
+            pass
+
+    def get_result(self, task_id: str):
+        return self.task.AsyncResult(task_id)
+
+    def get_statuses(self, task_ids: List[str], chunk_size: int = 1000) -> Dict[str, Dict[str, Any]]:
+        # 键值型结果后端（如Redis）按分块使用MGET一次取回多个任务的状态
+        backend = self.app.backend
+        statuses = {}
+        try:
+            for start in range(0, len(task_ids), chunk_size):
+                chunk = task_ids[start:start + chunk_size]
+                keys = [backend.get_key_for_task(task_id) for task_id in chunk]
+                values = backend.mget(keys)
+                # Redis返回与键顺序一致的列表，缓存类后端返回键到值的字典
+                if isinstance(values, dict):
+                    values = [values.get(key) for key in keys]
+                for task_id, value in zip(chunk, values):
+                    statuses[task_id] = self.decode_task_meta(value)
+        except (AttributeError, NotImplementedError):
+            # 结果后端不支持批量读取
+            return super().get_statuses(task_ids)
+        return statuses
+
+    def decode_task_meta(self, value) -> Dict[str, Any]:
+        """
+        解析结果后端中存储的任务元数据
+
+        Args:
+            value: 结果后端中的原始值，任务尚无状态时为None
+
+        Returns:
+            包含state和info的状态信息
+        """
+        if value is None:
+            return {'state': states.PENDING, 'info': None}
+        meta = self.app.backend.decode_result(value)
+        return {'state': meta['status'], 'info': meta['result']}
+
+    async def wait_for(self, task_ids: List[str], count: int) -> Dict[str, Dict[str, Any]]:
+        # Redis结果后端在写入任务状态时会向同名频道发布消息，订阅这些频道等待通知而不是轮询
+        backend_url = self.app.conf.result_backend
+        if not backend_url.startswith(('redis://', 'rediss://')):
+            return await super().wait_for(task_ids, count)
+
+        import redis.asyncio as aioredis
+
+        backend = self.app.backend
+        channels = {backend.get_key_for_task(task_id): task_id for task_id in task_ids}
+        client = aioredis.from_url(backend_url)
+        pubsub = client.pubsub()
+        done = {}
+        try:
+            # 先订阅再读取当前状态，避免遗漏订阅前已经结束的任务
+            channel_list = list(channels)
+            for start in range(0, len(channel_list), 1000):
+                await pubsub.subscribe(*channel_list[start:start + 1000])
+            for start in range(0, len(channel_list), 1000):
+                chunk = channel_list[start:start + 1000]
+                for channel, value in zip(chunk, await client.mget(chunk)):
+                    status = self.decode_task_meta(value)
+                    if status['state'] in states.READY_STATES:
+                        done[channels[channel]] = status
+
+            while len(done) < count:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                if message is None or message['type'] != 'message':
+                    continue
+                status = self.decode_task_meta(message['data'])
+                if status['state'] in states.READY_STATES:
+                    done[channels[message['channel']]] = status
+            return done
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+    def cancel(self, task_id: str) -> CancelResult:
+        # 先由运行该作业的worker终止DataX进程组并回复终止的进程数，
+        # 再撤销任务，阻止排队中或重新调度中的任务继续执行。
+        # worker发送SIGTERM后立即回复，CANCEL_REPLY_TIMEOUT内未回复的worker（包括离线的）不计入
+        replies = self.app.control.broadcast(
+            'kill_datax_job',
+            arguments={'task_id': task_id},
+            reply=True,
+            timeout=CANCEL_REPLY_TIMEOUT
+        ) or []
+        reaped = sum(reply.get('reaped', 0) for worker_reply in replies
+                     for reply in worker_reply.values())
+        self.task.control.revoke(task_id, terminate=True)
+        return CancelResult(True, reaped)
+
+
+def default_max_parallel(job_memory_bytes: int = LOCAL_JOB_MEMORY_BYTES) -> int:
+    """
+    根据本机CPU核数和物理内存计算默认的最大并行作业数
+
+    Args:
+        job_memory_bytes: 单个DataX作业预计占用的内存（字节）
+
+    Returns:
+        最大并行作业数，至少为1
+    """
+    cpu_count = os.cpu_count() or 1
+    try:
+        memory_bytes = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        # Windows等不支持sysconf的平台只按CPU核数计算
+        return cpu_count
+    return max(1, min(cpu_count, memory_bytes // job_memory_bytes))
+
+
+class LocalTaskResult:
+    """
+    本地执行后端的任务结果，接口与Celery的AsyncResult保持一致
+    """
+
+    def __init__(self, task_id: str, future: Optional[Future], started: bool):
+        """
+        初始化任务结果
+
+        Args:
+            task_id: 任务ID
+            future: 任务对应的Future，任务不存在时为None
+            started: 任务是否已开始执行
+        """
+        self.id = task_id
+        self._future = future
+        self._started = started
+
+    @property
+    def state(self) -> str:
+        future = self._future
+        if future is None:
+            return states.PENDING
+        if future.cancelled():
+            return states.REVOKED
+        if not future.done():
+            return states.STARTED if self._started else states.PENDING
+        return states.FAILURE if future.exception() is not None else states.SUCCESS
+
+    @property
+    def result(self):
+        future = self._future
+        if future is None or not future.done() or future.cancelled():
+            return None
+        exception = future.exception()
+        return exception if exception is not None else future.result()
+
+    @property
+    def info(self):
+        return self.result
+
+    def ready(self) -> bool:
+        return self.state in states.READY_STATES
+
+    def successful(self) -> bool:
+        return self.state == states.SUCCESS
+
+    def failed(self) -> bool:
+        return self.state == states.FAILURE
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        等待并返回任务结果
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            DataXExecutor.execute_job的返回值
+        """
+        if self._future is None:
+            raise KeyError(f"任务不存在: {self.id}")
+        return self._future.result(timeout)
+
+
+class LocalExecutionBackend(ExecutionBackend):
+    """
+    本地执行后端，在当前进程的线程池中调用DataXExecutor
+
+    每个线程只负责等待一个DataX子进程，真正的数据同步在子进程中进行。
+    已提交但未执行完的作业数超过max_parallel + max_pending时，submit会阻塞等待（背压）。
+    """
+
+    def __init__(self, max_parallel: Optional[int] = LOCAL_MAX_PARALLEL,
+                 max_pending: int = LOCAL_MAX_PENDING,
+                 job_timeout: Optional[float] = LOCAL_JOB_TIMEOUT,
+                 executor=None):
+        """
+        初始化本地执行后端
+
+        Args:
+            max_parallel: 最大并行作业数，为None时根据CPU核数和物理内存计算
+            max_pending: 等待执行的最大作业数
+            job_timeout: 单个作业的最长运行时间（秒），为None时不限制
+            executor: DataXExecutor实例（可选，默认新建）
+        """
+        if executor is None:
+            from datax_executor import DataXExecutor
+            executor = DataXExecutor()
+        self.executor = executor
+        self.templates = JobTemplateStore()
+        self.max_parallel = max_parallel or default_max_parallel()
+        self.job_timeout = job_timeout
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix='datax-local')
+        self._slots = threading.BoundedSemaphore(self.max_parallel + max_pending)
+        self._futures = {}
+        self._started = set()
+        self._lock = threading.Lock()
+
+    def submit(self, job_config_path: Optional[str], jvm_params: Optional[str] = None,
+               job_params: Optional[str] = None, queue: str = 'celery',
+               job_timeout: Optional[float] = None, stall_timeout: Optional[float] = None,
+               incremental: Optional[Dict[str, Any]] = None,
+               priority: Union[str, int, None] = None, tenant: Optional[str] = None,
+               template: Optional[str] = None, template_params: Optional[Dict[str, Any]] = None,
+               job_config: Optional[Dict[str, Any]] = None,
+               quarantine: bool = False,
+               block: bool = True, timeout: Optional[float] = None) -> str:
+        """
+        提交DataX作业到本地线程池
+
+        Args:
+            job_config_path: DataX作业配置文件路径
+            jvm_params: JVM参数（可选）
+            job_params: 作业参数（可选）
+            queue: 任务队列名称（本地执行时忽略）
+            job_timeout: 作业最长运行时间（秒），为None时使用构造时的job_timeout，为0时不限制
+            stall_timeout: 停滞判定时间（秒），为None时使用JOB_STALL_TIMEOUT，为0时不检测
+            incremental: 增量配置，本地执行后端不支持，必须为None
+            priority: 优先级（本地执行时忽略）
+            tenant: 作业所属租户（本地执行时忽略）
+            template: 作业模板ID（可选），提交时在本机渲染
+            template_params: 模板参数（可选）
+            job_config: 内联作业配置（可选）
+            quarantine: 是否隔离脏数据（可选）
+            block: 队列已满时是否阻塞等待
+            timeout: 阻塞等待的最长时间（秒）
+
+        Returns:
+            任务ID
+
+        Raises:
+            ValueError: 指定了增量配置
+            RuntimeError: 队列已满且不阻塞或等待超时
+        """
+        if incremental:
+            raise ValueError("增量同步的高水位保存在Redis中，只支持CeleryExecutionBackend")
+        if template is not None:
+            job_config = self.templates.render(template, template_params)
+        if not self._slots.acquire(blocking=block, timeout=timeout if block else None):
+            raise RuntimeError("本地执行队列已满")
+
+        task_id = str(uuid.uuid4())
+        try:
+            future = self._pool.submit(self._run, task_id, job_config_path, jvm_params, job_params,
+                                       self.job_timeout if job_timeout is None else job_timeout,
+                                       JOB_STALL_TIMEOUT if stall_timeout is None else stall_timeout,
+                                       job_config, quarantine)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._futures[task_id] = future
+        future.add_done_callback(lambda _: self._slots.release())
+        return task_id
+
+    def _run(self, task_id: str, job_config_path: Optional[str], jvm_params: Optional[str],
+             job_params: Optional[str], job_timeout: Optional[float],
+             stall_timeout: Optional[float], job_config: Optional[Dict[str, Any]] = None,
+             quarantine: bool = False) -> Dict[str, Any]:
+        """
+        在线程池中执行DataX作业
+
+        Args:
+            task_id: 任务ID
+            job_config_path: DataX作业配置文件路径
+            jvm_params: JVM参数
+            job_params: 作业参数
+            job_timeout: 作业最长运行时间（秒）
+            stall_timeout: 停滞判定时间（秒）
+            job_config: 内联作业配置（可选）
+            quarantine: 是否隔离脏数据
+
+        Returns:
+            DataXExecutor.execute_job的返回值
+        """
+        with self._lock:
+            self._started.add(task_id)
+        with log_context(task_id=task_id, job=job_config_path or 'inline'):
+            return self.executor.execute_job(
+                job_config_path=job_config_path,
+                job_config=job_config,
+                jvm_params=jvm_params,
+                job_params=job_params,
+                job_id=task_id,
+                timeout=job_timeout,
+                stall_timeout=stall_timeout,
+                quarantine=quarantine
+            )
+
+    def get_result(self, task_id: str) -> LocalTaskResult:
+        with self._lock:
+            return LocalTaskResult(task_id, self._futures.get(task_id), task_id in self._started)
+
+    async def wait_for(self, task_ids: List[str], count: int) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            futures = {asyncio.wrap_future(self._futures[task_id]): task_id
+                       for task_id in set(task_ids) if task_id in self._futures}
+
+        pending = set(futures)
+        done = {}
+        while len(done) < count:
+            if not pending:
+                # 剩余的任务ID不存在，永远不会结束
+                await asyncio.Event().wait()
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in finished:
+                task_id = futures[future]
+                result = self.get_result(task_id)
+                done[task_id] = {'state': result.state, 'info': result.info}
+        return done
+
+    def cancel(self, task_id: str) -> CancelResult:
+        with self._lock:
+            future = self._futures.get(task_id)
+        if future is None:
+            return CancelResult(False, 0)
+        # 尚未开始的作业直接从队列中移除，正在运行的作业终止DataX进程组
+        if future.cancel():
+            return CancelResult(True, 0)
+        reaped = self.executor.terminate_job(task_id)
+        return CancelResult(reaped > 0, reaped)
+
+    def forget(self, task_id: str) -> None:
+        """
+        丢弃已结束任务的结果，释放内存
+
+        Args:
+            task_id: 任务ID
+        """
+        with self._lock:
+            future = self._futures.get(task_id)
+            if future is not None and future.done():
+                del self._futures[task_id]
+                self._started.discard(task_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        关闭线程池
+
+        Args:
+            wait: 是否等待正在执行的作业结束
+        """
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
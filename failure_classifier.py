@@ -0,0 +1,156 @@
+"""
+DataX作业失败分类，按作业输出和退出码区分瞬时性故障和确定性故障
+
+瞬时性故障（数据库连接失败、锁等待超时、进程被外部信号终止等）重试后可能成功，
+按指数退避加随机抖动重试；确定性故障（配置错误、脏数据超过限制等）重试也会以同样方式失败，
+直接报告失败。哪些分类自动重试由RETRYABLE_FAILURE_CLASSES配置。
+"""
+
+import random
+import re
+from typing import Dict, Optional
+from config import RETRYABLE_FAILURE_CLASSES, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, TRANSIENT_EXIT_CODES
+
+# 失败分类
+FAILURE_CONNECTION = 'connection'
+FAILURE_LOCK_WAIT = 'lock_wait'
+FAILURE_DIRTY_DATA = 'dirty_data'
+FAILURE_CONFIG = 'config'
+# 进程以TRANSIENT_EXIT_CODES中的退出码结束（被OOM killer、主机重启等外部信号终止）
+FAILURE_KILLED = 'killed'
+# 作业超时、停滞或被取消，由执行器按outcome判定
+FAILURE_TIMEOUT = 'timeout'
+FAILURE_STALLED = 'stalled'
+FAILURE_CANCELLED = 'cancelled'
+# worker中执行作业前后发生的异常（不是DataX本身的失败）
+FAILURE_ERROR = 'error'
+FAILURE_UNKNOWN = 'unknown'
+
+# 各分类在DataX输出中的特征，同一作业匹配多个分类时按此顺序取第一个：
+# 确定性故障优先，例如脏数据超限时输出中也可能包含个别记录的写入异常
+FAILURE_PATTERNS = (
+    (FAILURE_DIRTY_DATA, re.compile(
+        r'Framework-14|脏数据条数检查不通过|脏数据百分比检查不通过|传输脏数据超过用户预期')),
+    (FAILURE_CONFIG, re.compile(
+        r'Framework-(?:01|03|1[0-3])\b|Common-00\b|配置文件存在错误|缺失了必须填写的参数|参数值不合法'
+        r'|Access denied for user|password authentication failed|ORA-01017|SQLSyntaxErrorException'
+        r'|Unknown column|ORA-0094[12]', re.IGNORECASE)),
+    (FAILURE_LOCK_WAIT, re.compile(
+        r'Lock wait timeout exceeded|Deadlock found when trying to get lock|deadlock detected'
+        r'|could not obtain lock|ORA-000(?:54|60)', re.IGNORECASE)),
+    (FAILURE_CONNECTION, re.compile(
+        r'Connection refused|Connection reset|Communications link failure|Broken pipe|connect timed out'
+        r'|SocketTimeoutException|No route to host|Too many connections|Could not create connection'
+        r'|could not establish the connection|ORA-12(?:170|541)', re.IGNORECASE))
+)
+# 错误信息所在的行几乎都包含以下字样之一，其他行不进入正则匹配
+ERROR_LINE_MARKERS = ('Exception', 'ERROR', 'Error', 'Code:[', '脏数据', '失败')
+# 结果中保留的匹配行的最大长度
+DETAIL_MAX_LENGTH = 500
+
+
+class FailureClassifier:
+    """
+    DataX输出的单遍失败分类器，逐行喂入输出，记录每个分类第一次出现的行
+    """
+
+    def __init__(self):
+        """
+        初始化分类器
+        """
+        self.matches: Dict[str, str] = {}
+
+    def feed(self, line: str) -> None:
+        """
+        检查一行DataX输出
+
+        Args:
+            line: DataX输出的一行
+        """
+        if not any(marker in line for marker in ERROR_LINE_MARKERS):
+            return
+        for failure_class, pattern in FAILURE_PATTERNS:
+            if failure_class not in self.matches and pattern.search(line):
+                self.matches[failure_class] = line.strip()[:DETAIL_MAX_LENGTH]
+
+    def classify(self, return_code: Optional[int]) -> str:
+        """
+        判定失败作业的分类
+
+        Args:
+            return_code: DataX进程的退出码
+
+        Returns:
+            失败分类，输出中没有已知特征且退出码不属于TRANSIENT_EXIT_CODES时返回'unknown'
+        """
+        for failure_class, _ in FAILURE_PATTERNS:
+            if failure_class in self.matches:
+                return failure_class
+        if return_code in TRANSIENT_EXIT_CODES:
+            return FAILURE_KILLED
+        return FAILURE_UNKNOWN
+
+    def detail(self, failure_class: str) -> Optional[str]:
+        """
+        获取判定为该分类的输出行
+
+        Args:
+            failure_class: 失败分类
+
+        Returns:
+            第一次匹配该分类的行，不是按输出判定的分类时返回None
+        """
+        return self.matches.get(failure_class)
+
+
+def classify_exception(exc: BaseException) -> str:
+    """
+    判定执行作业时抛出的异常的分类
+
+    Args:
+        exc: 异常
+
+    Returns:
+        配置文件不存在、参数错误等返回'config'，连接或超时异常（包括redis等客户端库的同类异常）
+        返回'connection'，其他异常返回'error'
+    """
+    if isinstance(exc, (FileNotFoundError, PermissionError, ValueError, TypeError, KeyError)):
+        return FAILURE_CONFIG
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return FAILURE_CONNECTION
+    # 客户端库的连接异常通常不继承内置的ConnectionError，按类名判断
+    if any('Connection' in cls.__name__ or 'Timeout' in cls.__name__ for cls in type(exc).__mro__):
+        return FAILURE_CONNECTION
+    return FAILURE_ERROR
+
+
+def is_retryable(failure_class: Optional[str]) -> bool:
+    """
+    该分类的失败是否自动重试
+
+    Args:
+        failure_class: 失败分类
+
+    Returns:
+        属于RETRYABLE_FAILURE_CLASSES时返回True
+    """
+    return failure_class in RETRYABLE_FAILURE_CLASSES
+
+
+def retry_delay(retries: int, base: float = RETRY_BACKOFF_BASE, cap: float = RETRY_BACKOFF_MAX) -> float:
+    """
+    计算第retries + 1次重试前的等待时间
+
+    等待时间上限按重试次数指数增长（base * 2 ** retries，不超过cap），实际取上限的一半到全部之间的
+    随机值，避免同一数据库故障导致的大量失败作业在同一时刻重试。
+
+    Args:
+        retries: 已重试的次数
+        base: 第一次重试的等待时间上限（秒）
+        cap: 等待时间上限的最大值（秒）
+
+    Returns:
+        等待时间（秒）
+    """
+    ceiling = min(cap, base * 2 ** retries)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
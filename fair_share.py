@@ -0,0 +1,274 @@
+"""
+作业优先级与租户间的加权公平共享
+
+优先级由Redis broker实现：每个队列按优先级拆分为多个列表，worker总是先取高优先级的消息。
+公平共享在worker开始执行作业时检查：集群按租户权重划分可同时运行的作业数，
+某租户超出自己的份额、而其他租户仍有作业在排队且未用满份额时，该作业交还broker稍后重试，
+让出worker给其他租户；其他租户没有排队作业时，空闲的名额可以被借用。
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple, Union
+from config import (PRIORITY_LEVELS, DEFAULT_PRIORITY, FAIR_SHARE_TOTAL_SLOTS, TENANT_WEIGHTS,
+                    DEFAULT_TENANT_WEIGHT, DEFAULT_TENANT, FAIR_SHARE_LEASE_SECONDS,
+                    FAIR_SHARE_QUEUED_TTL)
+from redis_utils import get_redis_client, RedisLease
+
+RUNNING_KEY = 'datax:fairshare:running'
+TENANTS_KEY = 'datax:fairshare:tenants'
+QUEUED_KEY_PREFIX = 'datax:fairshare:queued:'
+
+# 统计各租户运行中和排队中的作业数，按权重计算份额后决定是否放行：
+# 未超出份额时放行；超出份额时，只有其他租户都没有"排队中且未用满份额"的作业才借用空闲名额
+ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local tenant = ARGV[2]
+local job_id = ARGV[3]
+local expires = ARGV[4]
+local total_slots = tonumber(ARGV[5])
+local default_weight = tonumber(ARGV[6])
+local queued_ttl = tonumber(ARGV[7])
+local prefix = ARGV[8]
+local weights = {}
+for i = 9, #ARGV, 2 do
+    weights[ARGV[i]] = tonumber(ARGV[i + 1])
+end
+local function weight(name)
+    return weights[name] or default_weight
+end
+
+local running = {}
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+    local owner, expiry = string.match(entries[i + 1], '^(.*)\\n(%d+)$')
+    if not owner or tonumber(expiry) <= now then
+        redis.call('HDEL', KEYS[1], entries[i])
+    elseif entries[i] ~= job_id then
+        running[owner] = (running[owner] or 0) + 1
+    end
+end
+
+local waiting = {}
+for _, name in ipairs(redis.call('SMEMBERS', KEYS[2])) do
+    local queued_key = prefix .. name
+    redis.call('ZREMRANGEBYSCORE', queued_key, '-inf', now - queued_ttl)
+    local count = redis.call('ZCARD', queued_key)
+    if redis.call('ZSCORE', queued_key, job_id) then
+        count = count - 1
+    end
+    if count > 0 then
+        waiting[name] = count
+    elseif not running[name] then
+        redis.call('SREM', KEYS[2], name)
+    end
+end
+
+local active_weight = weight(tenant)
+local active = {[tenant] = true}
+for name, _ in pairs(running) do
+    if not active[name] then
+        active[name] = true
+        active_weight = active_weight + weight(name)
+    end
+end
+for name, _ in pairs(waiting) do
+    if not active[name] then
+        active[name] = true
+        active_weight = active_weight + weight(name)
+    end
+end
+local function share(name)
+    return math.max(1, math.floor(total_slots * weight(name) / active_weight))
+end
+
+local own = running[tenant] or 0
+local admitted = own < share(tenant)
+if not admitted then
+    admitted = true
+    for name, _ in pairs(waiting) do
+        if name ~= tenant and (running[name] or 0) < share(name) then
+            admitted = false
+            break
+        end
+    end
+end
+if admitted then
+    redis.call('HSET', KEYS[1], job_id, tenant .. '\\n' .. expires)
+    redis.call('SADD', KEYS[2], tenant)
+    redis.call('ZREM', prefix .. tenant, job_id)
+end
+return {admitted and 1 or 0, own, share(tenant)}
+"""
+
+# 续期作业的运行名额
+RENEW_SCRIPT = """
+local entry = redis.call('HGET', KEYS[1], ARGV[1])
+if not entry then
+    return 0
+end
+local owner = string.match(entry, '^(.*)\\n%d+$')
+redis.call('HSET', KEYS[1], ARGV[1], owner .. '\\n' .. ARGV[2])
+return 1
+"""
+
+
+def resolve_priority(priority: Union[str, int, None]) -> Optional[int]:
+    """
+    把优先级级别名称转换为broker使用的优先级数值
+
+    Args:
+        priority: PRIORITY_LEVELS中的级别名称或0-9的数值，为None时返回None（使用默认优先级）
+
+    Returns:
+        优先级数值，数值越小优先级越高
+
+    Raises:
+        ValueError: 未知的级别名称或超出范围的数值
+    """
+    if priority is None:
+        return None
+    if isinstance(priority, str):
+        if priority not in PRIORITY_LEVELS:
+            raise ValueError(f"未知的优先级: {priority}，可选值: {', '.join(PRIORITY_LEVELS)}")
+        return PRIORITY_LEVELS[priority]
+    if not 0 <= priority <= 9:
+        raise ValueError(f"优先级必须在0-9之间: {priority}")
+    return priority
+
+
+def default_priority() -> int:
+    """
+    获取未指定优先级的任务使用的优先级数值
+
+    Returns:
+        DEFAULT_PRIORITY对应的优先级数值
+    """
+    return PRIORITY_LEVELS[DEFAULT_PRIORITY]
+
+
+def priority_name(priority: Optional[int]) -> str:
+    """
+    获取优先级数值对应的级别名称，用于统计和日志
+
+    Args:
+        priority: 优先级数值，为None时视为默认优先级
+
+    Returns:
+        级别名称，未定义名称的数值返回数值本身的字符串
+    """
+    if priority is None:
+        return DEFAULT_PRIORITY
+    for name, value in PRIORITY_LEVELS.items():
+        if value == priority:
+            return name
+    return str(priority)
+
+
+class TenantFairShare:
+    """
+    租户公平共享控制器，所有worker通过Redis共享各租户的运行和排队记录
+    """
+
+    def __init__(self, total_slots: int = FAIR_SHARE_TOTAL_SLOTS,
+                 weights: Optional[Dict[str, float]] = None):
+        """
+        初始化公平共享控制器
+
+        Args:
+            total_slots: 集群可同时运行的作业总数
+            weights: 租户权重（可选，默认为TENANT_WEIGHTS）
+        """
+        self.total_slots = total_slots
+        self.weights = TENANT_WEIGHTS if weights is None else weights
+
+        self._client = get_redis_client()
+        self._acquire = self._client.register_script(ACQUIRE_SCRIPT)
+        self._renew = self._client.register_script(RENEW_SCRIPT)
+
+    def record_queued(self, jobs: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        登记已提交、尚未开始执行的作业，作为各租户排队中的作业数
+
+        需要在消息发布之前登记，避免作业先被执行、登记后留下无法清理的排队记录。
+
+        Args:
+            jobs: (任务ID, 租户)列表，租户为None时归属DEFAULT_TENANT
+        """
+        now = time.time()
+        pipeline = self._client.pipeline(transaction=False)
+        for task_id, tenant in jobs:
+            key = QUEUED_KEY_PREFIX + (tenant or DEFAULT_TENANT)
+            pipeline.zadd(key, {task_id: now})
+            pipeline.expire(key, FAIR_SHARE_QUEUED_TTL)
+            pipeline.sadd(TENANTS_KEY, tenant or DEFAULT_TENANT)
+        pipeline.execute()
+
+    def forget_queued(self, task_id: str, tenant: Optional[str]) -> None:
+        """
+        删除被撤销的排队作业的登记
+
+        Args:
+            task_id: 任务ID
+            tenant: 租户
+        """
+        self._client.zrem(QUEUED_KEY_PREFIX + (tenant or DEFAULT_TENANT), task_id)
+
+    def try_acquire(self, job_id: str, tenant: Optional[str]) -> Tuple[Optional[RedisLease], int, int]:
+        """
+        尝试为作业申请租户的运行名额
+
+        Args:
+            job_id: 作业标识
+            tenant: 租户，为None时归属DEFAULT_TENANT
+
+        Returns:
+            (租约, 该租户运行中的作业数, 该租户当前的份额)，超出份额需要让出时租约为None
+        """
+        tenant = tenant or DEFAULT_TENANT
+        now = int(time.time())
+        args = [now, tenant, job_id, now + FAIR_SHARE_LEASE_SECONDS, self.total_slots,
+                DEFAULT_TENANT_WEIGHT, FAIR_SHARE_QUEUED_TTL, QUEUED_KEY_PREFIX]
+        for name, weight in self.weights.items():
+            args.extend([name, weight])
+        admitted, running, share = self._acquire(keys=[RUNNING_KEY, TENANTS_KEY], args=args)
+        if not admitted:
+            return None, running, share
+        lease = RedisLease(job_id, self.renew, self.release, FAIR_SHARE_LEASE_SECONDS / 3)
+        return lease, running, share
+
+    def renew(self, job_id: str) -> None:
+        """
+        续期作业的运行名额
+
+        Args:
+            job_id: 作业标识
+        """
+        self._renew(keys=[RUNNING_KEY], args=[job_id, int(time.time()) + FAIR_SHARE_LEASE_SECONDS])
+
+    def release(self, job_id: str) -> None:
+        """
+        释放作业的运行名额
+
+        Args:
+            job_id: 作业标识
+        """
+        self._client.hdel(RUNNING_KEY, job_id)
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """
+        查询各租户运行中和排队中的作业数
+
+        Returns:
+            租户到{'running': 运行数, 'queued': 排队数}的映射
+        """
+        now = time.time()
+        usage = {}
+        for owner_expiry in self._client.hvals(RUNNING_KEY):
+            owner, expiry = owner_expiry.decode().rsplit('\n', 1)
+            if int(expiry) > now:
+                usage.setdefault(owner, {'running': 0, 'queued': 0})['running'] += 1
+        for tenant in self._client.smembers(TENANTS_KEY):
+            tenant = tenant.decode()
+            queued = self._client.zcount(QUEUED_KEY_PREFIX + tenant, now - FAIR_SHARE_QUEUED_TTL, '+inf')
+            usage.setdefault(tenant, {'running': 0, 'queued': 0})['queued'] = queued
+        return usage
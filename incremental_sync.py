@@ -0,0 +1,271 @@
+"""
+增量同步的高水位管理
+
+每个增量作业在Redis中保存一个高水位（已同步到的最大id或更新时间）。每次运行同步
+(上次高水位, 本次上界]区间内的数据：两个边界通过DataX的-p参数以${hwm_from}和${hwm_to}
+注入reader的where或querySql，作业成功后才把高水位推进到本次上界，失败的区间由下一次运行
+重新覆盖。同一个增量作业同时只允许一次运行，避免重复同步同一区间。
+"""
+
+import os
+import shlex
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+from config import INCREMENTAL_LOCK_SECONDS
+from redis_utils import get_redis_client, RedisLease
+
+# 作业配置中引用的DataX参数名
+HWM_FROM_PARAM = 'hwm_from'
+HWM_TO_PARAM = 'hwm_to'
+
+WATERMARK_TYPES = ('int', 'datetime')
+DEFAULT_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+DEFAULT_INITIAL_VALUES = {
+    'int': '0',
+    'datetime': '1970-01-01 00:00:00'
+}
+
+# 高水位仍为本次运行的起点时才推进，避免覆盖手工重置或其他运行写入的值
+ADVANCE_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'value')
+if current and current ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'value', ARGV[2], 'type', ARGV[3], 'updated_at', ARGV[4], 'task_id', ARGV[5])
+return 1
+"""
+
+# 只续期/释放自己持有的运行锁
+RENEW_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def references_watermark(job_config: Dict[str, Any]) -> bool:
+    """
+    检查作业配置的reader是否引用了高水位参数
+
+    Args:
+        job_config: 已解析的DataX作业配置
+
+    Returns:
+        任一reader的where或querySql中包含${hwm_from}时返回True
+    """
+    placeholder = '${' + HWM_FROM_PARAM + '}'
+    for content in job_config.get('job', {}).get('content', []):
+        parameter = content.get('reader', {}).get('parameter', {})
+        if placeholder in str(parameter.get('where', '')):
+            return True
+        for connection in parameter.get('connection', []):
+            if isinstance(connection, dict) and placeholder in str(connection.get('querySql', '')):
+                return True
+    return False
+
+
+def check_watermark_key(job_config_path: Optional[str], spec: Dict[str, Any]) -> None:
+    """
+    检查增量配置能否确定高水位名称
+
+    高水位名称默认取作业配置文件名。模板和内联配置没有文件名，同一模板按不同参数渲染的作业
+    若共用模板ID作为高水位名称，会读取彼此的高水位而跳过数据，因此必须在incremental中指定key。
+
+    Args:
+        job_config_path: DataX作业配置文件路径，使用模板或内联配置时为None
+        spec: 增量配置
+
+    Raises:
+        ValueError: 使用模板或内联配置且未指定key
+    """
+    if job_config_path is None and not spec.get('key'):
+        raise ValueError("使用作业模板或内联作业配置的增量作业必须在incremental中指定key")
+
+
+def build_watermark_params(window: Dict[str, Any], job_params: Optional[str] = None) -> str:
+    """
+    生成注入高水位区间的DataX作业参数
+
+    Args:
+        window: open_window返回的同步区间
+        job_params: 调用方原有的作业参数（可选）
+
+    Returns:
+        追加了-Dhwm_from和-Dhwm_to的作业参数，含空格的值加引号
+    """
+    params = [
+        f"-D{HWM_FROM_PARAM}={shlex.quote(window['from'])}",
+        f"-D{HWM_TO_PARAM}={shlex.quote(window['to'])}"
+    ]
+    if job_params:
+        params.insert(0, job_params)
+    return ' '.join(params)
+
+
+def _parse_value(value: str, watermark_type: str, value_format: str):
+    if watermark_type == 'int':
+        return int(value)
+    return datetime.strptime(value, value_format)
+
+
+class WatermarkStore:
+    """
+    保存在Redis哈希datax:watermark:<名称>中的高水位，所有worker共享
+    """
+
+    def __init__(self):
+        """
+        初始化高水位存储
+        """
+        self._client = get_redis_client()
+        self._advance = self._client.register_script(ADVANCE_SCRIPT)
+        self._renew_lock = self._client.register_script(RENEW_LOCK_SCRIPT)
+        self._release_lock = self._client.register_script(RELEASE_LOCK_SCRIPT)
+
+    @staticmethod
+    def _watermark_key(name: str) -> str:
+        return f"datax:watermark:{name}"
+
+    @staticmethod
+    def _lock_key(name: str) -> str:
+        return f"datax:watermark-lock:{name}"
+
+    @staticmethod
+    def watermark_name(job_config_path: str, spec: Dict[str, Any]) -> str:
+        """
+        获取增量作业的高水位名称
+
+        Args:
+            job_config_path: DataX作业配置文件路径
+            spec: 增量配置
+
+        Returns:
+            spec中的key，未指定时为作业配置文件名（不含扩展名），模板和内联配置必须指定key（见check_watermark_key）
+        """
+        return spec.get('key') or os.path.splitext(os.path.basename(job_config_path))[0]
+
+    def get(self, name: str) -> Optional[Dict[str, str]]:
+        """
+        获取高水位
+
+        Args:
+            name: 高水位名称
+
+        Returns:
+            包含value、type、updated_at、task_id的字典，尚未运行过时返回None
+        """
+        data = self._client.hgetall(self._watermark_key(name))
+        if not data:
+            return None
+        return {key.decode(): value.decode() for key, value in data.items()}
+
+    def set(self, name: str, value: str, watermark_type: str = 'datetime') -> None:
+        """
+        手工设置高水位，用于首次初始化或重新同步某个区间
+
+        Args:
+            name: 高水位名称
+            value: 高水位值
+            watermark_type: 高水位类型，'int'或'datetime'
+        """
+        self._client.hset(self._watermark_key(name), mapping={
+            'value': str(value),
+            'type': watermark_type,
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'task_id': ''
+        })
+
+    def delete(self, name: str) -> None:
+        """
+        删除高水位，下一次运行从初始值开始全量同步
+
+        Args:
+            name: 高水位名称
+        """
+        self._client.delete(self._watermark_key(name))
+
+    def try_lock(self, name: str, job_id: str) -> Optional[RedisLease]:
+        """
+        获取增量作业的运行锁
+
+        Args:
+            name: 高水位名称
+            job_id: 作业标识
+
+        Returns:
+            获取成功时返回租约，同一增量作业正在运行时返回None
+        """
+        key = self._lock_key(name)
+        if not self._client.set(key, job_id, nx=True, ex=INCREMENTAL_LOCK_SECONDS):
+            return None
+        return RedisLease(
+            job_id,
+            lambda holder: self._renew_lock(keys=[key], args=[holder, INCREMENTAL_LOCK_SECONDS]),
+            lambda holder: self._release_lock(keys=[key], args=[holder]),
+            INCREMENTAL_LOCK_SECONDS / 3
+        )
+
+    def open_window(self, name: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        计算本次运行的同步区间
+
+        Args:
+            name: 高水位名称
+            spec: 增量配置，可包含以下键：
+                  type: 高水位类型，'int'或'datetime'（默认'datetime'）
+                  initial: 首次运行时的起点（默认0或1970-01-01 00:00:00）
+                  upper: 本次运行的上界，'int'类型必须指定（如调用方查询的MAX(id)）
+                  lag_seconds: 'datetime'类型未指定上界时，以当前时间减去该秒数为上界，
+                               为仍在提交中的事务留出余量（默认0）
+                  format: 'datetime'类型的格式（默认'%Y-%m-%d %H:%M:%S'）
+
+        Returns:
+            包含key、type、from、to的同步区间
+
+        Raises:
+            ValueError: 增量配置无效或上界小于当前高水位
+        """
+        watermark_type = spec.get('type', 'datetime')
+        if watermark_type not in WATERMARK_TYPES:
+            raise ValueError(f"不支持的高水位类型: {watermark_type}")
+        value_format = spec.get('format', DEFAULT_DATETIME_FORMAT)
+
+        current = self.get(name)
+        lower = current['value'] if current else str(spec.get('initial', DEFAULT_INITIAL_VALUES[watermark_type]))
+
+        upper = spec.get('upper')
+        if upper is None:
+            if watermark_type == 'int':
+                raise ValueError(f"int类型的增量作业必须指定上界upper: {name}")
+            upper = time.strftime(value_format, time.localtime(time.time() - spec.get('lag_seconds', 0)))
+        upper = str(upper)
+
+        if _parse_value(upper, watermark_type, value_format) < _parse_value(lower, watermark_type, value_format):
+            raise ValueError(f"增量作业的上界{upper}小于当前高水位{lower}: {name}")
+        return {'key': name, 'type': watermark_type, 'from': lower, 'to': upper}
+
+    def advance(self, window: Dict[str, Any], task_id: str) -> bool:
+        """
+        作业成功后把高水位推进到本次区间的上界
+
+        Args:
+            window: open_window返回的同步区间
+            task_id: 任务ID
+
+        Returns:
+            是否已推进，高水位在运行期间被手工修改时不推进
+        """
+        return bool(self._advance(
+            keys=[self._watermark_key(window['key'])],
+            args=[window['from'], window['to'], window['type'],
+                  time.strftime('%Y-%m-%d %H:%M:%S'), task_id]
+        ))
@@ -0,0 +1,123 @@
+"""
+DataX作业配置缓存，缓存已解析的作业配置及其验证结论
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable
+
+
+class JobConfigCache:
+    """
+    进程内的LRU作业配置缓存
+
+    以文件绝对路径为键，并用(mtime, size)判断文件是否被修改，
+    命中时只需一次stat()调用，不再重新读取和解析JSON。
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        初始化作业配置缓存
+
+        Args:
+            max_entries: 最大缓存条目数，超出时淘汰最久未使用的条目
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get_entry(self, job_config_path: str) -> Dict[str, Any]:
+        """
+        获取作业配置文件对应的缓存条目，文件变化或未缓存时重新加载
+
+        Args:
+            job_config_path: DataX作业配置文件路径
+
+        Returns:
+            缓存条目，包含config和verdicts
+        """
+        key = os.path.abspath(job_config_path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['signature'] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # 在锁外读取和解析文件，避免阻塞其他线程的缓存命中
+        with open(key, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        entry = {'signature': signature, 'config': config, 'verdicts': {}}
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def load(self, job_config_path: str) -> Dict[str, Any]:
+        """
+        获取已解析的作业配置
+
+        返回的字典为缓存共享对象，调用方不能修改，需要修改时请先深拷贝。
+
+        Args:
+            job_config_path: DataX作业配置文件路径
+
+        Returns:
+            已解析的作业配置
+        """
+        return self._get_entry(job_config_path)['config']
+
+    def verdict(self, job_config_path: str, name: str,
+                compute: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        获取作业配置的验证结论，同一版本的文件只计算一次
+
+        Args:
+            job_config_path: DataX作业配置文件路径
+            name: 结论名称，用于区分不同的验证逻辑
+            compute: 根据已解析的作业配置计算结论的函数
+
+        Returns:
+            验证结论
+        """
+        entry = self._get_entry(job_config_path)
+        verdicts = entry['verdicts']
+        if name not in verdicts:
+            verdicts[name] = compute(entry['config'])
+        return verdicts[name]
+
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            包含条目数、命中数、未命中数和淘汰数的字典
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,268 @@
+"""
+DataX作业分片工具，将一个作业按切分列的取值范围拆分为多个子作业，并合并子作业结果
+"""
+
+import copy
+import datetime
+from typing import Dict, Any, List, Optional, Union
+
+RangeValue = Union[int, float, datetime.date, datetime.datetime, str]
+
+
+def _normalize_value(value: RangeValue) -> Union[int, float, datetime.date, datetime.datetime]:
+    """
+    将边界值统一为数值或日期类型，字符串按ISO格式解析为日期时间
+
+    Args:
+        value: 边界值
+
+    Returns:
+        数值、日期或日期时间
+    """
+    if isinstance(value, str):
+        try:
+            parsed = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"无法解析的分片边界值: {value}")
+        # 只包含日期部分时按日期处理
+        return parsed.date() if len(value) <= 10 else parsed
+    return value
+
+
+def compute_range_boundaries(min_value: RangeValue, max_value: RangeValue,
+                             num_shards: int) -> List[RangeValue]:
+    """
+    将[min_value, max_value]均匀切分为num_shards段
+
+    Args:
+        min_value: 切分列的最小值，支持数值、日期、日期时间或ISO格式字符串
+        max_value: 切分列的最大值
+        num_shards: 分片数量
+
+    Returns:
+        num_shards + 1个递增的边界值（相邻值重复时会去重，分片数可能减少）
+    """
+    if num_shards < 1:
+        raise ValueError(f"分片数量必须大于0: {num_shards}")
+
+    low = _normalize_value(min_value)
+    high = _normalize_value(max_value)
+    if high < low:
+        raise ValueError(f"分片范围的最大值小于最小值: {min_value} > {max_value}")
+
+    if isinstance(low, datetime.datetime):
+        step = (high - low) / num_shards
+        boundaries = [low + step * i for i in range(num_shards)] + [high]
+    elif isinstance(low, datetime.date):
+        days = (high - low).days
+        boundaries = [low + datetime.timedelta(days=days * i // num_shards) for i in range(num_shards)] + [high]
+    elif isinstance(low, int) and isinstance(high, int):
+        span = high - low
+        boundaries = [low + span * i // num_shards for i in range(num_shards)] + [high]
+    else:
+        step = (high - low) / num_shards
+        boundaries = [low + step * i for i in range(num_shards)] + [high]
+
+    # 范围小于分片数时相邻边界会重复
+    deduplicated = []
+    for boundary in boundaries:
+        if not deduplicated or boundary != deduplicated[-1]:
+            deduplicated.append(boundary)
+    if len(deduplicated) == 1:
+        deduplicated.append(deduplicated[0])
+    return deduplicated
+
+
+def _format_sql_value(value: RangeValue) -> str:
+    """
+    将边界值格式化为SQL字面量
+
+    Args:
+        value: 边界值
+
+    Returns:
+        SQL字面量字符串
+    """
+    value = _normalize_value(value)
+    if isinstance(value, datetime.datetime):
+        return f"'{value.strftime('%Y-%m-%d %H:%M:%S')}'"
+    if isinstance(value, datetime.date):
+        return f"'{value.strftime('%Y-%m-%d')}'"
+    return str(value)
+
+
+def build_range_conditions(column: str, boundaries: List[RangeValue]) -> List[str]:
+    """
+    根据边界值生成每个分片的where条件
+
+    第一个分片不设下界并包含NULL值，最后一个分片不设上界，保证所有行恰好落入一个分片。
+
+    Args:
+        column: 切分列名
+        boundaries: 严格递增的边界值列表，长度至少为2（只有一个分片时两个边界值可以相等）
+
+    Returns:
+        每个分片的where条件列表，长度为len(boundaries) - 1
+
+    Raises:
+        ValueError: 边界值少于2个、无法比较或不是严格递增
+    """
+    if len(boundaries) < 2:
+        raise ValueError("分片边界值至少需要2个")
+    values = [_normalize_value(boundary) for boundary in boundaries]
+    for index in range(1, len(values)):
+        try:
+            # compute_range_boundaries在最小值等于最大值时返回两个相同的边界值
+            increasing = values[index - 1] < values[index] or (len(values) == 2 and values[0] == values[1])
+        except TypeError:
+            raise ValueError(f"分片边界值类型不一致: {boundaries[index - 1]!r}, {boundaries[index]!r}")
+        if not increasing:
+            raise ValueError(f"分片边界值必须严格递增: {boundaries[index - 1]} >= {boundaries[index]}")
+
+    literals = [_format_sql_value(boundary) for boundary in boundaries]
+    shard_count = len(literals) - 1
+    if shard_count == 1:
+        return ['1=1']
+
+    conditions = []
+    for index in range(shard_count):
+        if index == 0:
+            conditions.append(f"({column} < {literals[1]} OR {column} IS NULL)")
+        elif index == shard_count - 1:
+            conditions.append(f"{column} >= {literals[index]}")
+        else:
+            conditions.append(f"{column} >= {literals[index]} AND {column} < {literals[index + 1]}")
+    return conditions
+
+
+def split_job_config(job_config: Dict[str, Any], column: str,
+                     boundaries: List[RangeValue]) -> List[Dict[str, Any]]:
+    """
+    将作业配置按范围拆分为多个子作业配置，分片条件与reader已有的where条件取交集
+
+    Args:
+        job_config: 已解析的DataX作业配置
+        column: 切分列名
+        boundaries: 严格递增的边界值列表
+
+    Returns:
+        子作业配置列表
+    """
+    conditions = build_range_conditions(column, boundaries)
+
+    for content in job_config['job']['content']:
+        parameter = content['reader'].get('parameter', {})
+        connections = parameter.get('connection', [])
+        if not connections or any('querySql' in connection for connection in connections):
+            raise ValueError(
+                f"reader {content['reader'].get('name')} 不支持分片，只支持按table和where读取的关系型数据库reader"
+            )
+
+    shard_configs = []
+    for condition in conditions:
+        shard_config = copy.deepcopy(job_config)
+        for content in shard_config['job']['content']:
+            parameter = content['reader']['parameter']
+            where = parameter.get('where', '').strip()
+            parameter['where'] = f"({where}) AND ({condition})" if where else condition
+        shard_configs.append(shard_config)
+    return shard_configs
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime.datetime]:
+    """
+    解析DataX汇总块中的时间字符串
+
+    Args:
+        value: 形如"2023-01-01 12:00:00"的时间字符串
+
+    Returns:
+        日期时间，无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def merge_shard_results(shard_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并各分片的执行结果
+
+    Args:
+        shard_results: 各分片execute_job返回的结果字典，顺序与分片顺序一致
+
+    Returns:
+        合并后的结果字典，summary为全部分片的汇总统计；记录数、字节数等为有统计的分片之和，
+        缺少统计（如DataX启动前失败）的分片序号见summary_missing_shards
+    """
+    summaries = [result.get('summary') or {} for result in shard_results]
+    summary_missing_shards = [
+        index for index, summary in enumerate(summaries)
+        if any(summary.get(field) is None for field in ('total_records', 'total_failures', 'total_bytes'))
+    ]
+
+    def total(field: str) -> Optional[int]:
+        values = [summary.get(field) for summary in summaries if summary.get(field) is not None]
+        return sum(values) if values else None
+
+    start_times = [_parse_time(summary.get('start_time')) for summary in summaries]
+    end_times = [_parse_time(summary.get('end_time')) for summary in summaries]
+    start_time = min(start_times) if start_times and None not in start_times else None
+    end_time = max(end_times) if end_times and None not in end_times else None
+
+    # 分片并行执行，整体耗时取最早开始到最晚结束的时间跨度
+    if start_time is not None and end_time is not None:
+        elapsed_seconds = int((end_time - start_time).total_seconds())
+    else:
+        elapsed_values = [summary.get('elapsed_seconds') for summary in summaries]
+        elapsed_seconds = max(elapsed_values) if elapsed_values and None not in elapsed_values else None
+
+    total_records = total('total_records')
+    total_failures = total('total_failures')
+    total_bytes = total('total_bytes')
+
+    summary = {
+        'start_time': start_time.strftime('%Y-%m-%d %H:%M:%S') if start_time else None,
+        'end_time': end_time.strftime('%Y-%m-%d %H:%M:%S') if end_time else None,
+        'elapsed_seconds': elapsed_seconds,
+        'avg_bytes_per_second': (total_bytes // elapsed_seconds
+                                 if total_bytes is not None and elapsed_seconds else None),
+        'records_per_second': (total_records // elapsed_seconds
+                               if total_records is not None and elapsed_seconds else None),
+        'total_records': total_records,
+        'total_failures': total_failures,
+        'total_bytes': total_bytes,
+        'error_rate': None
+    }
+    if total_records is not None and total_failures is not None:
+        summary['error_rate'] = total_failures / total_records if total_records else 0.0
+
+    failed_shards = [index for index, result in enumerate(shard_results) if not result.get('success', False)]
+    quarantined = [result.get('quarantined_records') for result in shard_results]
+    return_codes = [result.get('return_code', -1) for result in shard_results]
+
+    return {
+        'success': not failed_shards,
+        'return_code': next((code for code in return_codes if code != 0), 0),
+        'shard_count': len(shard_results),
+        'failed_shards': failed_shards,
+        'summary_missing_shards': summary_missing_shards,
+        'quarantined_records': (sum(count for count in quarantined if count is not None)
+                                if any(count is not None for count in quarantined) else None),
+        'summary': summary,
+        'shards': [
+            {
+                'return_code': result.get('return_code'),
+                'success': result.get('success', False),
+                'failure_class': result.get('failure_class'),
+                'log_file': result.get('log_file'),
+                'log_key': result.get('log_key'),
+                'quarantine_file': result.get('quarantine_file'),
+                'summary': result.get('summary')
+            }
+            for result in shard_results
+        ]
+    }
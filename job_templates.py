@@ -0,0 +1,115 @@
+"""
+DataX作业配置模板
+
+大量作业只有表名、where条件等少数参数不同时，不必为每个作业生成配置文件：
+模板以<模板ID>.json保存在JOB_TEMPLATE_DIR中，字符串值里用${参数名}引用参数，
+提交作业时只传模板ID和参数，由worker渲染出作业配置。模板按文件修改时间缓存解析结果，
+渲染只需遍历一次已解析的配置树。
+
+未传入的参数原样保留，可以继续由DataX的-p参数替换（如增量同步的${hwm_from}）。
+值恰好为"${参数名}"的字符串会被替换为参数本身，参数可以是列表等非字符串类型，例如列名列表。
+"""
+
+import os
+import re
+from string import Template
+from typing import Dict, Any, Optional
+from config import JOB_TEMPLATE_DIR, JOB_CONFIG_CACHE_SIZE
+from job_config_cache import JobConfigCache
+
+TEMPLATE_ID_PATTERN = re.compile(r'^[\w.-]+$')
+WHOLE_PLACEHOLDER_PATTERN = re.compile(r'^\$\{(\w+)\}$')
+
+
+def render_config(node: Any, params: Dict[str, Any]) -> Any:
+    """
+    用参数渲染已解析的模板，返回新的配置树，不修改模板本身
+
+    Args:
+        node: 模板中的节点
+        params: 模板参数
+
+    Returns:
+        渲染后的节点
+    """
+    if isinstance(node, str):
+        match = WHOLE_PLACEHOLDER_PATTERN.match(node)
+        if match and match.group(1) in params:
+            return params[match.group(1)]
+        if '$' not in node:
+            return node
+        return Template(node).safe_substitute({key: str(value) for key, value in params.items()})
+    if isinstance(node, dict):
+        return {key: render_config(value, params) for key, value in node.items()}
+    if isinstance(node, list):
+        return [render_config(item, params) for item in node]
+    return node
+
+
+def check_job_source(job_config_path: Optional[str], template: Optional[str],
+                     job_config: Optional[Dict[str, Any]]) -> None:
+    """
+    检查作业配置来源，配置文件路径、模板ID和内联配置必须且只能指定一个
+
+    Args:
+        job_config_path: DataX作业配置文件路径
+        template: 作业模板ID
+        job_config: 内联作业配置
+
+    Raises:
+        ValueError: 没有指定或同时指定了多个来源
+    """
+    if sum(source is not None for source in (job_config_path, template, job_config)) != 1:
+        raise ValueError("job_config_path、template和job_config必须且只能指定一个")
+
+
+class JobTemplateStore:
+    """
+    作业配置模板库
+    """
+
+    def __init__(self, template_dir: str = JOB_TEMPLATE_DIR, cache: Optional[JobConfigCache] = None):
+        """
+        初始化模板库
+
+        Args:
+            template_dir: 模板目录
+            cache: 已解析模板的缓存（可选，默认新建）
+        """
+        self.template_dir = template_dir
+        self.cache = cache or JobConfigCache(JOB_CONFIG_CACHE_SIZE)
+
+    def template_path(self, template_id: str) -> str:
+        """
+        获取模板文件路径
+
+        Args:
+            template_id: 模板ID，即模板文件名（不含.json）
+
+        Returns:
+            模板文件路径
+
+        Raises:
+            ValueError: 模板ID包含路径分隔符等非法字符
+            FileNotFoundError: 模板不存在
+        """
+        if not TEMPLATE_ID_PATTERN.match(template_id):
+            raise ValueError(f"无效的模板ID: {template_id}")
+        path = os.path.join(self.template_dir, f"{template_id}.json")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"作业模板不存在: {path}")
+        return path
+
+    def render(self, template_id: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        渲染作业配置
+
+        Args:
+            template_id: 模板ID
+            params: 模板参数（可选）
+
+        Returns:
+            渲染后的作业配置
+        """
+        template = self.cache.load(self.template_path(template_id))
+        return render_config(template, params or {})
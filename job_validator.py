@@ -0,0 +1,316 @@
+"""
+DataX作业配置的深度校验，在分发作业前一次性找出配置中的全部错误
+"""
+
+import os
+from typing import Dict, Any, List, Optional, FrozenSet
+from config import DATAX_HOME
+
+# 关系型数据库插件共用的连接字段规则
+RDBMS_PLUGINS = frozenset([
+    'mysql', 'drds', 'oracle', 'sqlserver', 'postgresql', 'db2', 'rdbms',
+    'kingbasees', 'oceanbasev10', 'clickhouse', 'adbpg', 'doris', 'starrocks', 'gaussdb'
+])
+
+# 非关系型插件必须配置的parameter字段
+REQUIRED_PARAMETERS = {
+    'reader': {
+        'streamreader': ['column'],
+        'txtfilereader': ['path'],
+        'ftpreader': ['host', 'username', 'password', 'path'],
+        'hdfsreader': ['defaultFS', 'path', 'fileType', 'column'],
+        'mongodbreader': ['address', 'collectionName', 'column'],
+        'hbase11xreader': ['hbaseConfig', 'table', 'mode'],
+        'odpsreader': ['accessId', 'accessKey', 'project', 'table', 'column'],
+        'elasticsearchreader': ['endpoint', 'index']
+    },
+    'writer': {
+        'streamwriter': [],
+        'txtfilewriter': ['path', 'fileName', 'writeMode'],
+        'ftpwriter': ['host', 'username', 'password', 'path', 'fileName', 'writeMode'],
+        'hdfswriter': ['defaultFS', 'fileType', 'path', 'fileName', 'column', 'writeMode'],
+        'mongodbwriter': ['address', 'collectionName', 'column'],
+        'hbase11xwriter': ['hbaseConfig', 'table', 'mode', 'rowkeyColumn', 'column'],
+        'odpswriter': ['accessId', 'accessKey', 'project', 'table', 'column'],
+        'elasticsearchwriter': ['endpoint', 'index', 'column']
+    }
+}
+
+SPEED_LIMITS = ('channel', 'byte', 'record')
+
+
+class DataXJobValidator:
+    """
+    DataX作业配置校验器
+
+    已安装插件列表和各插件的字段规则在构造时确定，之后可被反复复用。
+    """
+
+    def __init__(self, datax_home: str = DATAX_HOME):
+        """
+        初始化校验器
+
+        Args:
+            datax_home: DataX安装目录，用于读取已安装的reader/writer插件
+        """
+        self.installed_plugins = {
+            'reader': self._scan_plugins(os.path.join(datax_home, 'plugin', 'reader')),
+            'writer': self._scan_plugins(os.path.join(datax_home, 'plugin', 'writer'))
+        }
+
+    @staticmethod
+    def _scan_plugins(plugin_dir: str) -> Optional[FrozenSet[str]]:
+        """
+        扫描插件目录
+
+        Args:
+            plugin_dir: 插件目录
+
+        Returns:
+            已安装插件名称集合，目录不存在时返回None（跳过插件名称检查）
+        """
+        if not os.path.isdir(plugin_dir):
+            return None
+        return frozenset(
+            name for name in os.listdir(plugin_dir)
+            if os.path.isdir(os.path.join(plugin_dir, name))
+        )
+
+    def validate(self, job_config: Dict[str, Any]) -> List[str]:
+        """
+        校验作业配置
+
+        Args:
+            job_config: 已解析的DataX作业配置
+
+        Returns:
+            错误信息列表，配置有效时为空列表
+        """
+        errors = []
+
+        job = job_config.get('job') if isinstance(job_config, dict) else None
+        if not isinstance(job, dict):
+            return ["作业配置缺少'job'字段"]
+
+        content = job.get('content')
+        if not isinstance(content, list) or not content:
+            errors.append("作业配置缺少'job.content'字段或其为空")
+        else:
+            for index, item in enumerate(content):
+                errors.extend(self._validate_content(index, item))
+
+        errors.extend(self._validate_setting(job.get('setting')))
+        return errors
+
+    def _validate_content(self, index: int, item: Any) -> List[str]:
+        """
+        校验单个content条目中的reader和writer
+
+        Args:
+            index: content条目下标
+            item: content条目
+
+        Returns:
+            错误信息列表
+        """
+        prefix = f"job.content[{index}]"
+        if not isinstance(item, dict):
+            return [f"{prefix}必须是对象"]
+
+        errors = []
+        columns = {}
+        for role in ('reader', 'writer'):
+            plugin = item.get(role)
+            if not isinstance(plugin, dict) or not plugin.get('name'):
+                errors.append(f"{prefix}.{role}缺少name字段")
+                continue
+
+            name = plugin['name']
+            installed = self.installed_plugins[role]
+            if installed is not None and name not in installed:
+                errors.append(f"{prefix}.{role}插件未安装: {name}")
+
+            parameter = plugin.get('parameter')
+            if not isinstance(parameter, dict):
+                errors.append(f"{prefix}.{role}({name})缺少parameter字段")
+                continue
+
+            errors.extend(self._validate_parameter(f"{prefix}.{role}({name})", role, name, parameter))
+            columns[role] = self._column_count(role, parameter)
+
+        reader_count, writer_count = columns.get('reader'), columns.get('writer')
+        if reader_count is not None and writer_count is not None and reader_count != writer_count:
+            errors.append(f"{prefix}的reader列数({reader_count})与writer列数({writer_count})不一致")
+        return errors
+
+    def _validate_parameter(self, prefix: str, role: str, name: str,
+                            parameter: Dict[str, Any]) -> List[str]:
+        """
+        按插件类型校验parameter中的必填字段
+
+        Args:
+            prefix: 错误信息前缀
+            role: 'reader'或'writer'
+            name: 插件名称
+            parameter: 插件参数
+
+        Returns:
+            错误信息列表
+        """
+        if name[:-len(role)] in RDBMS_PLUGINS:
+            return self._validate_rdbms_parameter(prefix, role, parameter)
+
+        required = REQUIRED_PARAMETERS[role].get(name, [])
+        return [f"{prefix}缺少必填参数: {field}" for field in required if field not in parameter]
+
+    def _validate_rdbms_parameter(self, prefix: str, role: str,
+                                  parameter: Dict[str, Any]) -> List[str]:
+        """
+        校验关系型数据库插件的连接参数
+
+        Args:
+            prefix: 错误信息前缀
+            role: 'reader'或'writer'
+            parameter: 插件参数
+
+        Returns:
+            错误信息列表
+        """
+        errors = [f"{prefix}缺少必填参数: {field}" for field in ('username', 'password')
+                  if field not in parameter]
+
+        connections = parameter.get('connection')
+        if not isinstance(connections, list) or not connections:
+            errors.append(f"{prefix}缺少connection配置")
+            return errors
+
+        uses_query_sql = False
+        for index, connection in enumerate(connections):
+            conn_prefix = f"{prefix}.connection[{index}]"
+            if not isinstance(connection, dict):
+                errors.append(f"{conn_prefix}必须是对象")
+                continue
+
+            jdbc_url = connection.get('jdbcUrl')
+            # reader的jdbcUrl为列表（支持多个备选地址），writer为字符串
+            if not jdbc_url or (role == 'reader' and not isinstance(jdbc_url, list)):
+                errors.append(f"{conn_prefix}缺少jdbcUrl或格式错误")
+
+            if role == 'reader' and 'querySql' in connection:
+                uses_query_sql = True
+            elif not connection.get('table'):
+                errors.append(f"{conn_prefix}缺少table配置")
+
+        if not uses_query_sql and not parameter.get('column'):
+            errors.append(f"{prefix}缺少必填参数: column")
+        return errors
+
+    @staticmethod
+    def _column_count(role: str, parameter: Dict[str, Any]) -> Optional[int]:
+        """
+        获取插件显式配置的列数
+
+        Args:
+            role: 'reader'或'writer'
+            parameter: 插件参数
+
+        Returns:
+            列数，使用querySql或通配符"*"等无法确定列数时返回None
+        """
+        column = parameter.get('column')
+        if not isinstance(column, list) or not column or '*' in column:
+            return None
+        if role == 'reader' and any('querySql' in connection
+                                    for connection in parameter.get('connection', [])
+                                    if isinstance(connection, dict)):
+            return None
+        return len(column)
+
+    @staticmethod
+    def _as_int(value: Any) -> Optional[int]:
+        """
+        按DataX的Configuration.getInt读取整数，数字字符串（如"2"）也是有效的整数
+
+        Args:
+            value: 配置值
+
+        Returns:
+            整数值，布尔值、小数和无法转换的字符串返回None
+        """
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                return None
+        return None
+
+    @staticmethod
+    def _as_float(value: Any) -> Optional[float]:
+        """
+        按DataX的Configuration.getDouble读取数值，数字字符串也是有效的数值
+
+        Args:
+            value: 配置值
+
+        Returns:
+            数值，布尔值和无法转换的值返回None
+        """
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value.strip())
+            except ValueError:
+                return None
+        return None
+
+    @staticmethod
+    def _validate_setting(setting: Any) -> List[str]:
+        """
+        校验job.setting中的速度和错误限制
+
+        Args:
+            setting: job.setting配置
+
+        Returns:
+            错误信息列表
+        """
+        if not isinstance(setting, dict) or not isinstance(setting.get('speed'), dict):
+            return ["作业配置缺少'job.setting.speed'字段"]
+
+        errors = []
+        speed = setting['speed']
+        values = {}
+        for limit in SPEED_LIMITS:
+            if limit not in speed:
+                continue
+            value = DataXJobValidator._as_int(speed[limit])
+            if value is None:
+                errors.append(f"job.setting.speed.{limit}必须是整数: {speed[limit]}")
+            elif limit == 'channel' and value <= 0:
+                errors.append(f"job.setting.speed.channel必须是正整数: {speed[limit]}")
+            else:
+                values[limit] = value
+        # byte和record为0或负数（如-1）时DataX视为不限速，此时必须通过channel或另一项确定并发数
+        if not any(value > 0 for value in values.values()):
+            errors.append("job.setting.speed必须设置正的channel，或至少一项正的byte、record限速")
+
+        error_limit = setting.get('errorLimit')
+        if isinstance(error_limit, dict):
+            record = error_limit.get('record')
+            if record is not None:
+                value = DataXJobValidator._as_int(record)
+                if value is None or value < 0:
+                    errors.append(f"job.setting.errorLimit.record必须是非负整数: {record}")
+            percentage = error_limit.get('percentage')
+            if percentage is not None:
+                value = DataXJobValidator._as_float(percentage)
+                if value is None or not 0 <= value <= 1:
+                    errors.append(f"job.setting.errorLimit.percentage必须在0到1之间: {percentage}")
+        return errors
@@ -0,0 +1,171 @@
+"""
+DataX作业完整输出的压缩存储
+
+作业结束后，作业日志文件（包括滚动产生的备份）按时间顺序拼接、压缩后写入存储目录，
+文件名为输出内容的SHA-256摘要，相同的输出只保存一份。任务结果中只记录摘要（log_key），
+完整输出不再进入结果后端。存储目录可以是worker本机目录，也可以是worker和调度端共同挂载的
+共享目录，调度端通过DataXTaskScheduler.iter_job_log按需流式读取。
+
+安装了zstandard时使用zstd压缩，否则使用gzip；读取时按文件扩展名选择解压方式，两种格式可以共存。
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import re
+import tempfile
+from typing import IO, Iterator, List, Optional, Tuple
+from config import LOG_STORE_DIR, LOG_STORE_COMPRESSION
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 压缩格式对应的文件扩展名，读取时按此顺序查找
+COMPRESSION_EXTENSIONS = {'zstd': 'zst', 'gzip': 'gz'}
+LOG_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+# 读写文件的块大小
+CHUNK_SIZE = 1024 * 1024
+
+
+class JobLogStore:
+    """
+    按内容寻址的作业日志存储
+    """
+
+    def __init__(self, root: str = LOG_STORE_DIR, compression: str = LOG_STORE_COMPRESSION):
+        """
+        初始化日志存储
+
+        Args:
+            root: 存储目录
+            compression: 压缩格式，'zstd'或'gzip'，未安装zstandard时'zstd'改用'gzip'
+        """
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"不支持的压缩格式: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            compression = 'gzip'
+        self.root = root
+        self.compression = compression
+
+    def _path(self, key: str, compression: str) -> str:
+        # 按摘要前两位分目录，避免单个目录下文件过多
+        return os.path.join(self.root, key[:2], f"{key}.log.{COMPRESSION_EXTENSIONS[compression]}")
+
+    def _find(self, key: str) -> Optional[Tuple[str, str]]:
+        """
+        查找已保存的日志
+
+        Args:
+            key: 日志摘要
+
+        Returns:
+            (文件路径, 压缩格式)，不存在时返回None
+
+        Raises:
+            ValueError: 摘要格式无效
+        """
+        if not LOG_KEY_PATTERN.match(key):
+            raise ValueError(f"无效的日志摘要: {key}")
+        for compression in COMPRESSION_EXTENSIONS:
+            path = self._path(key, compression)
+            if os.path.exists(path):
+                return path, compression
+        return None
+
+    def exists(self, key: str) -> bool:
+        """
+        日志是否已保存
+
+        Args:
+            key: 日志摘要
+
+        Returns:
+            已保存时返回True
+        """
+        return self._find(key) is not None
+
+    def put(self, paths: List[str]) -> str:
+        """
+        按顺序拼接多个日志文件，压缩后保存
+
+        先压缩到存储目录下的临时文件，同时计算摘要，再改名为摘要对应的文件，
+        并发保存相同内容时不会留下写了一半的文件。
+
+        Args:
+            paths: 日志文件路径列表，按输出的先后顺序排列
+
+        Returns:
+            日志摘要
+        """
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                if self.compression == 'zstd':
+                    writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+                else:
+                    # mtime固定为0，相同内容压缩结果相同
+                    writer = gzip.GzipFile(fileobj=raw, mode='wb', mtime=0)
+                with writer:
+                    for path in paths:
+                        with open(path, 'rb') as f:
+                            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                                digest.update(chunk)
+                                writer.write(chunk)
+            key = digest.hexdigest()
+            if self.exists(key):
+                os.remove(temp_path)
+            else:
+                target = self._path(key, self.compression)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(temp_path, target)
+            return key
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def open(self, key: str) -> IO[bytes]:
+        """
+        打开已保存的日志，读取时逐块解压
+
+        Args:
+            key: 日志摘要
+
+        Returns:
+            解压后内容的二进制流，使用完毕后需要关闭
+
+        Raises:
+            FileNotFoundError: 日志不存在
+            RuntimeError: 日志为zstd格式但未安装zstandard
+        """
+        found = self._find(key)
+        if found is None:
+            raise FileNotFoundError(f"作业日志不存在: {key}")
+        path, compression = found
+        if compression == 'gzip':
+            return gzip.open(path, 'rb')
+        if zstandard is None:
+            raise RuntimeError(f"读取zstd压缩的作业日志需要安装zstandard: {path}")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+
+    def iter_lines(self, key: str, encoding: str = 'utf-8') -> Iterator[str]:
+        """
+        逐行读取已保存的日志，不会一次性解压全部内容
+
+        Args:
+            key: 日志摘要
+            encoding: 文本编码
+
+        Yields:
+            日志行（包含换行符）
+        """
+        with io.TextIOWrapper(self.open(key), encoding=encoding, errors='replace') as stream:
+            for line in stream:
+                yield line
@@ -0,0 +1,243 @@
+"""
+各模块共用的日志配置
+
+日志记录只在调用线程中放入队列，由每个进程一个的后台线程（QueueListener）写入控制台和文件，
+提交、轮询和执行作业的路径上不再同步等待磁盘写入。每个模块仍写入各自的日志文件
+（LOG_DIR/<模块名>.log），LOG_MAX_BYTES大于0时按大小滚动。
+
+fork出的子进程（如prefork模式的worker子进程）会重新启动后台线程；LOG_PER_PROCESS为True时
+子进程写入<模块名>.<pid>.log，避免多个进程同时写入和滚动同一个文件。
+
+LOG_JSON为True时每行输出一个JSON对象，包含task_id、job等关联字段，字段值来自
+log_context/bind_log_context设置的上下文或日志调用的extra参数。
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Dict, Optional
+from config import LOG_LEVEL, LOG_DIR, LOG_JSON, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_PER_PROCESS
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s %(message)s'
+# 写入每条日志的关联字段，未设置时为None
+CONTEXT_FIELDS = ('task_id', 'job')
+
+_log_context = contextvars.ContextVar('datax_log_context', default={})
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    把日志记录格式化为一行JSON
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'process': record.process,
+            'message': record.getMessage()
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _ContextFilter(logging.Filter):
+    """
+    在调用线程中把当前上下文的关联字段写入日志记录，extra中已给出的字段不覆盖
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class _DispatchHandler(logging.Handler):
+    """
+    后台线程中的分发处理器：每条日志写入控制台，并写入产生它的模块对应的文件
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.console = None
+        self.files: Dict[str, logging.Handler] = {}
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if self.console is not None:
+            self.console.handle(record)
+        name = record.name
+        while name:
+            handler = self.files.get(name)
+            if handler is not None:
+                handler.handle(record)
+                break
+            name = name.rpartition('.')[0]
+        return True
+
+    def close(self) -> None:
+        for handler in [self.console, *self.files.values()]:
+            if handler is not None:
+                handler.close()
+        super().close()
+
+
+_lock = threading.Lock()
+_queue = queue.SimpleQueue()
+_dispatcher = _DispatchHandler()
+_queue_handlers: Dict[str, logging.handlers.QueueHandler] = {}
+_file_names: Dict[str, str] = {}
+_listener: Optional[logging.handlers.QueueListener] = None
+_child_process = False
+
+
+def _formatter() -> logging.Formatter:
+    return JsonFormatter() if LOG_JSON else logging.Formatter(TEXT_FORMAT)
+
+
+def _open_file_handler(file_name: str) -> logging.Handler:
+    """
+    打开模块的日志文件
+
+    Args:
+        file_name: 文件名（位于LOG_DIR）
+
+    Returns:
+        文件处理器，LOG_MAX_BYTES大于0时按大小滚动
+    """
+    if _child_process and LOG_PER_PROCESS:
+        base, extension = os.path.splitext(file_name)
+        file_name = f"{base}.{os.getpid()}{extension}"
+    path = os.path.join(LOG_DIR, file_name)
+    if LOG_MAX_BYTES:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True)
+    else:
+        handler = logging.FileHandler(path, encoding='utf-8', delay=True)
+    handler.setFormatter(_formatter())
+    return handler
+
+
+def _start_listener() -> None:
+    global _listener
+    if _dispatcher.console is None:
+        _dispatcher.console = logging.StreamHandler()
+        _dispatcher.console.setFormatter(_formatter())
+    _listener = logging.handlers.QueueListener(_queue, _dispatcher)
+    _listener.start()
+
+
+def setup_logging(name: str, file_name: Optional[str] = None) -> logging.Logger:
+    """
+    设置模块的日志记录器
+
+    Args:
+        name: 记录器名称，通常为模块的__name__
+        file_name: 日志文件名（可选，默认为<name>.log）
+
+    Returns:
+        日志记录器
+    """
+    os.makedirs(LOG_DIR, exist_ok=True)
+    logger = logging.getLogger(name)
+    logger.setLevel(LOG_LEVEL)
+    logger.handlers.clear()
+
+    with _lock:
+        file_name = file_name or f"{name}.log"
+        previous = _dispatcher.files.pop(name, None)
+        if previous is not None:
+            previous.close()
+        _dispatcher.files[name] = _open_file_handler(file_name)
+        _file_names[name] = file_name
+        handler = logging.handlers.QueueHandler(_queue)
+        handler.addFilter(_ContextFilter())
+        _queue_handlers[name] = handler
+        if _listener is None:
+            _start_listener()
+
+    logger.addHandler(handler)
+    return logger
+
+
+def stop_logging() -> None:
+    """
+    写完队列中剩余的日志并停止后台线程，进程退出前调用
+    """
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        _dispatcher.flush()
+        for handler in _dispatcher.files.values():
+            handler.flush()
+
+
+def _reinit_after_fork() -> None:
+    """
+    fork后的子进程中重建队列和后台线程（父进程的线程不会被复制到子进程）
+    """
+    global _queue, _listener, _child_process, _lock
+    _lock = threading.Lock()
+    _child_process = True
+    _queue = queue.SimpleQueue()
+    for handler in _queue_handlers.values():
+        handler.queue = _queue
+    if LOG_PER_PROCESS:
+        for name, file_name in _file_names.items():
+            # 父进程的文件由父进程继续使用，这里只替换子进程中的处理器
+            _dispatcher.files[name] = _open_file_handler(file_name)
+    _listener = None
+    if _queue_handlers:
+        _start_listener()
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """
+    在with块内为当前线程（或协程）的日志设置关联字段
+
+    Args:
+        **fields: 关联字段，如task_id、job
+    """
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def bind_log_context(**fields) -> None:
+    """
+    为当前线程（或协程）之后的日志追加关联字段，直到调用clear_log_context
+
+    Args:
+        **fields: 关联字段，如task_id、job
+    """
+    _log_context.set({**_log_context.get(), **fields})
+
+
+def clear_log_context() -> None:
+    """
+    清除当前线程（或协程）的日志关联字段
+    """
+    _log_context.set({})
+
+
+atexit.register(stop_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
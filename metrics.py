@@ -0,0 +1,205 @@
+"""
+Prometheus监控指标
+
+安装了prometheus_client时，作业执行、Celery任务和调度器在关键路径上记录以下指标：
+
+- datax_queue_wait_seconds：作业从提交到开始执行的排队等待时间，按队列和优先级
+- datax_spawn_seconds：启动DataX进程（或交给预热引擎）的耗时，按启动方式
+- datax_startup_seconds：从启动到开始执行作业（JVM启动、加载插件）的时间，按启动方式
+- datax_job_duration_seconds：DataX进程运行时间，按结束方式
+- datax_job_records_per_second / datax_job_bytes_per_second：DataX汇总中的记录和字节速度
+- datax_jobs_total / datax_job_timeouts_total：结束的作业数、因超时或停滞被终止的作业数
+- datax_quarantined_records_total：隔离模式下写入隔离文件的脏数据条数
+- datax_job_failures_total：失败的作业数，按失败分类（见failure_classifier.py）
+- datax_task_retries_total：任务交还broker重试的次数，按原因（资源不足或失败分类）
+- datax_jobs_in_flight：正在执行的作业数，按队列
+- datax_validations_total：作业配置验证次数，按结果
+- datax_submitted_jobs_total / datax_submit_seconds：调度端提交的作业数和提交耗时
+
+未安装prometheus_client或METRICS_ENABLED为False（默认）时，全部指标为不做任何事的空对象。
+
+prefork模式的worker有多个子进程，需要在启动worker前设置环境变量PROMETHEUS_MULTIPROC_DIR
+（指向一个空目录），各子进程的指标写入该目录，由worker主进程的HTTP服务汇总输出；
+solo、threads等单进程模式不需要设置。
+"""
+
+import glob
+import os
+from config import METRICS_ENABLED, METRICS_PORT, METRICS_ADDR
+from logging_utils import setup_logging
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+logger = setup_logging(__name__)
+
+# 耗时类指标的分桶（秒），覆盖从毫秒级的预热启动到数小时的大表同步
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200, 14400)
+# 速度类指标的分桶
+RECORDS_RATE_BUCKETS = (100, 1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+BYTES_RATE_BUCKETS = (1 << 16, 1 << 18, 1 << 20, 1 << 22, 1 << 24, 1 << 26, 1 << 28, 1 << 30)
+
+
+class _NoopMetric:
+    """
+    未启用监控时代替各类指标的空对象
+    """
+
+    def labels(self, *args, **kwargs) -> '_NoopMetric':
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+def enabled() -> bool:
+    """
+    是否记录监控指标
+
+    Returns:
+        启用监控且已安装prometheus_client时返回True
+    """
+    return METRICS_ENABLED and prometheus_client is not None
+
+
+def multiprocess_mode() -> bool:
+    """
+    是否以多进程模式记录指标
+
+    Returns:
+        设置了PROMETHEUS_MULTIPROC_DIR环境变量时返回True
+    """
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+if enabled():
+    QUEUE_WAIT_SECONDS = prometheus_client.Histogram(
+        'datax_queue_wait_seconds', '作业从提交到开始执行的排队等待时间',
+        ['queue', 'priority'], buckets=DURATION_BUCKETS)
+    SPAWN_SECONDS = prometheus_client.Histogram(
+        'datax_spawn_seconds', '启动DataX进程或交给预热引擎的耗时',
+        ['launch_mode'], buckets=DURATION_BUCKETS)
+    STARTUP_SECONDS = prometheus_client.Histogram(
+        'datax_startup_seconds', '从启动DataX到开始执行作业的时间',
+        ['launch_mode'], buckets=DURATION_BUCKETS)
+    JOB_DURATION_SECONDS = prometheus_client.Histogram(
+        'datax_job_duration_seconds', 'DataX进程运行时间',
+        ['outcome'], buckets=DURATION_BUCKETS)
+    JOB_RECORDS_PER_SECOND = prometheus_client.Histogram(
+        'datax_job_records_per_second', 'DataX汇总中的记录写入速度',
+        buckets=RECORDS_RATE_BUCKETS)
+    JOB_BYTES_PER_SECOND = prometheus_client.Histogram(
+        'datax_job_bytes_per_second', 'DataX汇总中的平均流量',
+        buckets=BYTES_RATE_BUCKETS)
+    JOBS_TOTAL = prometheus_client.Counter(
+        'datax_jobs_total', '结束的DataX作业数', ['outcome'])
+    JOB_TIMEOUTS_TOTAL = prometheus_client.Counter(
+        'datax_job_timeouts_total', '因超时或停滞被终止的DataX作业数', ['outcome'])
+    QUARANTINED_RECORDS_TOTAL = prometheus_client.Counter(
+        'datax_quarantined_records_total', '隔离模式下写入隔离文件的脏数据条数')
+    JOB_FAILURES_TOTAL = prometheus_client.Counter(
+        'datax_job_failures_total', '失败的DataX作业数', ['failure_class'])
+    TASK_RETRIES_TOTAL = prometheus_client.Counter(
+        'datax_task_retries_total', '任务交还broker重试的次数', ['reason'])
+    JOBS_IN_FLIGHT = prometheus_client.Gauge(
+        'datax_jobs_in_flight', '正在执行的DataX作业数', ['queue'], multiprocess_mode='livesum')
+    VALIDATIONS_TOTAL = prometheus_client.Counter(
+        'datax_validations_total', '作业配置验证次数', ['result'])
+    SUBMITTED_JOBS_TOTAL = prometheus_client.Counter(
+        'datax_submitted_jobs_total', '调度端提交的作业数', ['queue', 'mode'])
+    SUBMIT_SECONDS = prometheus_client.Histogram(
+        'datax_submit_seconds', '调度端一次提交调用的耗时', ['mode'], buckets=DURATION_BUCKETS)
+else:
+    QUEUE_WAIT_SECONDS = SPAWN_SECONDS = STARTUP_SECONDS = JOB_DURATION_SECONDS = _NoopMetric()
+    JOB_RECORDS_PER_SECOND = JOB_BYTES_PER_SECOND = _NoopMetric()
+    JOBS_TOTAL = JOB_TIMEOUTS_TOTAL = JOB_FAILURES_TOTAL = TASK_RETRIES_TOTAL = JOBS_IN_FLIGHT = _NoopMetric()
+    VALIDATIONS_TOTAL = SUBMITTED_JOBS_TOTAL = SUBMIT_SECONDS = QUARANTINED_RECORDS_TOTAL = _NoopMetric()
+
+
+def observe_job_result(result: dict) -> None:
+    """
+    根据DataXExecutor.execute_job的结果记录作业指标
+
+    Args:
+        result: 作业执行结果
+    """
+    outcome = result.get('outcome', 'UNKNOWN')
+    JOBS_TOTAL.labels(outcome=outcome).inc()
+    JOB_DURATION_SECONDS.labels(outcome=outcome).observe(result.get('elapsed_seconds') or 0)
+    if result.get('failure_class'):
+        JOB_FAILURES_TOTAL.labels(failure_class=result['failure_class']).inc()
+    if result.get('quarantined_records'):
+        QUARANTINED_RECORDS_TOTAL.inc(result['quarantined_records'])
+    if result.get('timed_out'):
+        JOB_TIMEOUTS_TOTAL.labels(outcome=outcome).inc()
+    if result.get('startup_seconds') is not None:
+        STARTUP_SECONDS.labels(launch_mode=result.get('launch_mode')).observe(result['startup_seconds'])
+    summary = result.get('summary') or {}
+    if summary.get('records_per_second') is not None:
+        JOB_RECORDS_PER_SECOND.observe(summary['records_per_second'])
+    if summary.get('avg_bytes_per_second') is not None:
+        JOB_BYTES_PER_SECOND.observe(summary['avg_bytes_per_second'])
+
+
+def clear_multiprocess_dir() -> None:
+    """
+    清除多进程模式下上次运行留下的指标文件，应在worker主进程启动时、子进程创建前调用
+    """
+    if not enabled() or not multiprocess_mode():
+        return
+    for path in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    多进程模式下清理已退出进程的livesum类指标文件
+
+    Args:
+        pid: 已退出的进程ID
+    """
+    if enabled() and multiprocess_mode():
+        multiprocess.mark_process_dead(pid)
+
+
+def start_metrics_server(port: int = METRICS_PORT, addr: str = METRICS_ADDR) -> bool:
+    """
+    启动输出监控指标的HTTP服务（后台线程）
+
+    多进程模式下汇总PROMETHEUS_MULTIPROC_DIR中全部进程的指标，否则只输出当前进程的指标。
+
+    Args:
+        port: 监听端口，为None时不启动
+        addr: 监听地址
+
+    Returns:
+        是否已启动
+    """
+    if not enabled() or not port:
+        return False
+    registry = prometheus_client.REGISTRY
+    if multiprocess_mode():
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    try:
+        prometheus_client.start_http_server(port, addr=addr, registry=registry)
+    except OSError as e:
+        logger.warning("启动监控指标HTTP服务失败，端口: %s: %s", port, e)
+        return False
+    logger.info("监控指标HTTP服务已启动: http://%s:%s/metrics", addr, port)
+    return True
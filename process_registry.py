@@ -0,0 +1,273 @@
+"""
+本机运行中DataX进程的登记表，以及按进程组终止DataX进程树的工具函数
+
+DataX在独立的进程组中运行（datax.py及其启动的JVM），执行作业的worker子进程把进程组ID
+登记到RUN_DIR下以作业标识命名的文件中。worker主进程、其他worker子进程或控制命令
+都可以按作业标识找到进程组并终止，不依赖执行作业的进程是否仍然存活。
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set
+from config import RUN_DIR, PROCESS_KILL_GRACE_SECONDS
+
+
+def _pid_file(job_id: str) -> str:
+    return os.path.join(RUN_DIR, f"{job_id}.pid")
+
+
+def register_process(job_id: str, pgid: int) -> None:
+    """
+    登记作业的进程组
+
+    Args:
+        job_id: 作业标识
+        pgid: DataX进程组ID（即datax.py进程的PID）
+    """
+    os.makedirs(RUN_DIR, exist_ok=True)
+    pid_file = _pid_file(job_id)
+    temp_file = f"{pid_file}.{os.getpid()}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(f"{pgid} {os.getpid()}\n")
+    # 先写临时文件再改名，读取方不会读到写了一半的内容
+    os.replace(temp_file, pid_file)
+
+
+def unregister_process(job_id: str) -> None:
+    """
+    注销作业的进程组登记
+
+    Args:
+        job_id: 作业标识
+    """
+    try:
+        os.remove(_pid_file(job_id))
+    except FileNotFoundError:
+        pass
+
+
+def get_process(job_id: str) -> Optional[Dict[str, int]]:
+    """
+    查询作业登记的进程组
+
+    Args:
+        job_id: 作业标识
+
+    Returns:
+        包含pgid和owner（执行作业的进程PID）的字典，未登记时返回None
+    """
+    try:
+        with open(_pid_file(job_id), 'r', encoding='utf-8') as f:
+            pgid, owner = f.read().split()
+    except (FileNotFoundError, ValueError):
+        return None
+    return {'pgid': int(pgid), 'owner': int(owner)}
+
+
+def list_processes() -> Dict[str, Dict[str, int]]:
+    """
+    列出本机登记的全部作业进程组
+
+    Returns:
+        作业标识到登记信息的映射
+    """
+    if not os.path.isdir(RUN_DIR):
+        return {}
+    processes = {}
+    for name in os.listdir(RUN_DIR):
+        if not name.endswith('.pid'):
+            continue
+        job_id = name[:-len('.pid')]
+        process = get_process(job_id)
+        if process is not None:
+            processes[job_id] = process
+    return processes
+
+
+def _pid_exists(pid: int) -> bool:
+    if os.name == 'nt':
+        # Windows上的os.kill会直接结束进程，改用tasklist查询
+        result = subprocess.run(['tasklist', '/FI', f'PID eq {pid}', '/NH'],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                universal_newlines=True)
+        return str(pid) in result.stdout
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _group_members(pgid: int) -> Optional[Set[int]]:
+    """
+    获取进程组中仍在运行的进程
+
+    Args:
+        pgid: 进程组ID
+
+    Returns:
+        进程PID集合（不含僵尸进程），不支持/proc的平台返回None
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    members = set()
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # 进程名可能包含空格和括号，从最后一个右括号之后开始解析
+        fields = stat[stat.rfind(')') + 2:].split()
+        if fields[0] != 'Z' and int(fields[2]) == pgid:
+            members.add(int(name))
+    return members
+
+
+def _is_datax_group(pgid: int) -> bool:
+    """
+    判断进程组是否仍是DataX进程组，避免登记文件过期后误杀复用了相同ID的其他进程
+
+    Args:
+        pgid: 进程组ID
+
+    Returns:
+        进程组中存在命令行包含datax的进程时返回True，无法判断时也返回True
+    """
+    members = _group_members(pgid)
+    if members is None:
+        return True
+    for pid in members:
+        try:
+            with open(f"/proc/{pid}/cmdline", 'rb') as f:
+                if b'datax' in f.read().lower():
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+def kill_process_group(pgid: int, grace_seconds: float = PROCESS_KILL_GRACE_SECONDS,
+                       reap: Optional[Callable[[], Any]] = None, wait: bool = True) -> int:
+    """
+    终止整个进程组
+
+    POSIX系统上先向进程组发送SIGTERM，宽限期内未全部退出时再发送SIGKILL；
+    Windows上使用taskkill结束以pgid为根的整个进程树。
+
+    Args:
+        pgid: 进程组ID（Windows上为进程树根进程的PID）
+        grace_seconds: SIGTERM之后的宽限时间（秒）
+        reap: 回收子进程的函数（可选），由启动DataX的进程传入，避免其留下僵尸进程
+        wait: 是否等待进程组退出，为False时发送SIGTERM后立即返回，宽限期和SIGKILL在后台线程中进行
+
+    Returns:
+        被终止的进程数，wait为False时为发送SIGTERM时进程组中的进程数
+    """
+    if os.name == 'nt':
+        result = subprocess.run(['taskkill', '/F', '/T', '/PID', str(pgid)],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                universal_newlines=True)
+        # taskkill每终止一个进程输出一行
+        return len(result.stdout.splitlines()) if result.returncode == 0 else 0
+
+    members = _group_members(pgid)
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except ProcessLookupError:
+        return 0
+    reaped = set(members) if members is not None else set()
+    if not wait:
+        threading.Thread(target=_await_group_exit, args=(pgid, grace_seconds, reap, reaped),
+                         daemon=True).start()
+        return max(len(reaped), 1)
+    return _await_group_exit(pgid, grace_seconds, reap, reaped)
+
+
+def _await_group_exit(pgid: int, grace_seconds: float, reap: Optional[Callable[[], Any]],
+                      reaped: Set[int]) -> int:
+    """
+    等待已收到SIGTERM的进程组退出，宽限期内未全部退出时发送SIGKILL
+
+    Args:
+        pgid: 进程组ID
+        grace_seconds: 宽限时间（秒）
+        reap: 回收子进程的函数（可选）
+        reaped: 已知的进程组成员，原地更新
+
+    Returns:
+        被终止的进程数
+    """
+    deadline = time.monotonic() + grace_seconds
+    while time.monotonic() < deadline:
+        if reap is not None:
+            reap()
+        members = _group_members(pgid)
+        if members is None:
+            # 无法枚举进程组成员时，进程组不存在即视为全部退出（僵尸进程会使其一直存在）
+            try:
+                os.killpg(pgid, 0)
+            except ProcessLookupError:
+                return max(len(reaped), 1)
+        elif not members:
+            return len(reaped)
+        else:
+            reaped.update(members)
+        time.sleep(0.1)
+
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    return max(len(reaped), 1)
+
+
+def kill_registered_job(job_id: str, grace_seconds: float = PROCESS_KILL_GRACE_SECONDS,
+                        wait: bool = True) -> int:
+    """
+    按作业标识终止本机登记的DataX进程组
+
+    先注销登记再终止进程，执行作业的进程据此判断作业是被外部取消的。
+
+    Args:
+        job_id: 作业标识
+        grace_seconds: SIGTERM之后的宽限时间（秒）
+        wait: 是否等待进程组退出，见kill_process_group
+
+    Returns:
+        被终止的进程数，本机没有该作业时返回0
+    """
+    process = get_process(job_id)
+    if process is None:
+        return 0
+    unregister_process(job_id)
+    if not _is_datax_group(process['pgid']):
+        return 0
+    return kill_process_group(process['pgid'], grace_seconds, wait=wait)
+
+
+def kill_orphaned_jobs(grace_seconds: float = PROCESS_KILL_GRACE_SECONDS) -> Dict[str, int]:
+    """
+    终止执行进程已经退出的DataX进程组
+
+    worker子进程被强制终止时来不及清理自己启动的DataX，这些进程组会一直占用数据库连接和CPU。
+
+    Args:
+        grace_seconds: SIGTERM之后的宽限时间（秒）
+
+    Returns:
+        作业标识到被终止进程数的映射
+    """
+    reaped = {}
+    for job_id, process in list_processes().items():
+        if _pid_exists(process['owner']):
+            continue
+        reaped[job_id] = kill_registered_job(job_id, grace_seconds)
+    return reaped
@@ -0,0 +1,213 @@
+"""
+DataX脏数据隔离与重放
+
+默认情况下，作业的脏数据超过errorLimit时整个作业失败，重试时重新同步全部数据。
+隔离模式下执行器修改作业配置：把errorLimit放宽到QUARANTINE_MAX_RECORDS条，
+并让DataX的脏数据收集器（StdoutPluginCollector）输出全部脏数据（最多同样条数）。
+收集器以"脏数据: "一行加下一行JSON的形式把每条脏数据打印到输出中，执行器读取输出时
+把这些JSON写入作业专属的隔离文件（QUARANTINE_DIR/<任务ID>.jsonl），作业本身照常完成。
+
+修复数据或作业配置后，按隔离文件中记录的主键生成只读取这些行的重放作业，不必重新同步整张表。
+"""
+
+import copy
+import datetime
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+from config import QUARANTINE_MAX_RECORDS, QUARANTINE_REPLAY_BATCH_SIZE
+
+# 脏数据收集器打印的标记行以此结尾，下一行为脏数据的JSON
+DIRTY_RECORD_MARKER = '脏数据:'
+# 列名两侧可能带有的引用符号
+IDENTIFIER_QUOTES = '`"[]'
+SIMPLE_IDENTIFIER_PATTERN = re.compile(r'^[\w.]+$')
+
+
+def enable_quarantine(job_config: Dict[str, Any], max_records: int = QUARANTINE_MAX_RECORDS) -> Dict[str, Any]:
+    """
+    生成隔离模式的作业配置，不修改原配置
+
+    作业配置中的core设置优先于DataX的全局配置，这里设置脏数据收集器最多输出的条数，
+    并把errorLimit替换为同样的条数（不再按比例限制），超过后作业仍按errorLimit失败。
+
+    Args:
+        job_config: 已解析的DataX作业配置
+        max_records: 最多隔离的脏数据条数
+
+    Returns:
+        隔离模式的作业配置
+    """
+    config = copy.deepcopy(job_config)
+    collector = (config.setdefault('core', {}).setdefault('statistics', {})
+                 .setdefault('collector', {}).setdefault('plugin', {}))
+    collector['maxDirtyNumber'] = max_records
+    config['job'].setdefault('setting', {})['errorLimit'] = {'record': max_records}
+    return config
+
+
+class QuarantineWriter:
+    """
+    从DataX输出中提取脏数据并写入隔离文件，逐行喂入输出
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化隔离文件写入器，有脏数据时才创建文件
+
+        Args:
+            path: 隔离文件路径
+        """
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._pending = False
+
+    def feed(self, line: str) -> None:
+        """
+        检查一行DataX输出
+
+        Args:
+            line: DataX输出的一行
+        """
+        if self._pending:
+            self._pending = False
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._file = open(self.path, 'w', encoding='utf-8')
+                self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+                self.count += 1
+                return
+        if DIRTY_RECORD_MARKER in line and line.rstrip().endswith(DIRTY_RECORD_MARKER):
+            self._pending = True
+
+    def close(self) -> None:
+        """
+        关闭隔离文件
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _column_name(column: Any) -> str:
+    if isinstance(column, dict):
+        column = column.get('name', '')
+    return str(column).strip().strip(IDENTIFIER_QUOTES).lower()
+
+
+def _format_key(column: Dict[str, Any]) -> Optional[str]:
+    """
+    将脏数据中的一列格式化为SQL字面量
+
+    Args:
+        column: 脏数据中的列，包含rawData和type
+
+    Returns:
+        SQL字面量，值为空时返回None
+    """
+    value = column.get('rawData')
+    if value is None:
+        return None
+    if column.get('type') == 'DATE' and isinstance(value, (int, float)):
+        # DataX的日期列以毫秒时间戳输出
+        value = datetime.datetime.fromtimestamp(value / 1000).strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def load_quarantined_keys(path: str, key_index: int) -> List[Optional[str]]:
+    """
+    读取隔离文件中各条脏数据的主键
+
+    Args:
+        path: 隔离文件路径
+        key_index: 主键在reader列中的位置
+
+    Returns:
+        去重后的主键SQL字面量列表（保持出现顺序），主键为空的记录为None，缺少主键列的记录被跳过
+    """
+    keys = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            columns = json.loads(line).get('record') or []
+            if key_index < len(columns) and isinstance(columns[key_index], dict):
+                keys.setdefault(_format_key(columns[key_index]), None)
+    return list(keys)
+
+
+def build_key_condition(key_column: str, keys: List[Optional[str]],
+                        batch_size: int = QUARANTINE_REPLAY_BATCH_SIZE) -> str:
+    """
+    生成只匹配指定主键的where条件，主键较多时拆分为多个IN列表（部分数据库限制IN列表的长度）
+
+    Args:
+        key_column: 主键列名
+        keys: 主键SQL字面量列表，None表示主键为空
+        batch_size: 每个IN列表包含的主键数
+
+    Returns:
+        where条件
+    """
+    literals = [key for key in keys if key is not None]
+    conditions = [f"{key_column} IN ({', '.join(literals[start:start + batch_size])})"
+                  for start in range(0, len(literals), batch_size)]
+    if len(literals) < len(keys):
+        conditions.append(f"{key_column} IS NULL")
+    return ' OR '.join(conditions)
+
+
+def build_replay_config(job_config: Dict[str, Any], path: str, key_column: str,
+                        batch_size: int = QUARANTINE_REPLAY_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    生成只重新同步隔离文件中各条脏数据的作业配置
+
+    reader的where条件与主键条件取交集；writer的preSql和postSql被移除，避免重放时再次执行
+    清空目标表之类的语句。
+
+    Args:
+        job_config: 原作业的配置（可以是修复后的配置）
+        path: 原作业的隔离文件路径
+        key_column: 主键列名，必须出现在reader的column中
+        batch_size: 每个IN列表包含的主键数
+
+    Returns:
+        重放作业的配置
+
+    Raises:
+        ValueError: reader不是按table和where读取的关系型数据库reader、找不到主键列或隔离文件中没有主键
+    """
+    if not SIMPLE_IDENTIFIER_PATTERN.match(key_column.strip(IDENTIFIER_QUOTES)):
+        raise ValueError(f"无效的主键列名: {key_column}")
+    replay_config = copy.deepcopy(job_config)
+    for content in replay_config['job']['content']:
+        parameter = content['reader'].get('parameter', {})
+        connections = parameter.get('connection', [])
+        if not connections or any('querySql' in connection for connection in connections):
+            raise ValueError(
+                f"reader {content['reader'].get('name')} 不支持重放，只支持按table和where读取的关系型数据库reader"
+            )
+        names = [_column_name(column) for column in parameter.get('column', [])]
+        if _column_name(key_column) not in names:
+            raise ValueError(f"主键列 {key_column} 不在reader的column中: {parameter.get('column')}")
+
+        keys = load_quarantined_keys(path, names.index(_column_name(key_column)))
+        if not keys:
+            raise ValueError(f"隔离文件中没有可重放的主键: {path}")
+        condition = build_key_condition(key_column, keys, batch_size)
+        where = parameter.get('where', '').strip()
+        parameter['where'] = f"({where}) AND ({condition})" if where else condition
+
+        writer_parameter = content['writer'].get('parameter', {})
+        writer_parameter.pop('preSql', None)
+        writer_parameter.pop('postSql', None)
+    return replay_config
@@ -0,0 +1,91 @@
+"""
+按队列和优先级统计作业的排队等待时间
+
+作业从提交到真正开始执行（通过全部准入检查）的时间作为一个样本，写入Redis列表
+datax:queue-wait:<队列>:<优先级>，每个列表只保留最近QUEUE_WAIT_SAMPLES个样本。
+因资源不足或公平共享而交还broker重试的时间也计入等待时间。
+"""
+
+import math
+from typing import Dict, List, Optional
+from config import QUEUE_WAIT_SAMPLES
+from redis_utils import get_redis_client
+
+INDEX_KEY = 'datax:queue-wait:index'
+SAMPLES_KEY_PREFIX = 'datax:queue-wait:'
+
+
+def record_queue_wait(queue: str, priority: str, wait_seconds: float) -> None:
+    """
+    记录一个排队等待时间样本
+
+    Args:
+        queue: 队列名称
+        priority: 优先级级别名称
+        wait_seconds: 排队等待时间（秒）
+    """
+    key = f"{SAMPLES_KEY_PREFIX}{queue}:{priority}"
+    pipeline = get_redis_client().pipeline(transaction=False)
+    pipeline.lpush(key, f"{wait_seconds:.3f}")
+    pipeline.ltrim(key, 0, QUEUE_WAIT_SAMPLES - 1)
+    pipeline.sadd(INDEX_KEY, f"{queue}:{priority}")
+    pipeline.execute()
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    计算已排序样本的百分位数（最近秩法）
+
+    Args:
+        samples: 升序排列的样本
+        fraction: 百分位，如0.99
+
+    Returns:
+        百分位数，样本为空时返回0
+    """
+    if not samples:
+        return 0.0
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+def summarize_waits(samples: List[float]) -> Dict[str, float]:
+    """
+    汇总排队等待时间样本
+
+    Args:
+        samples: 等待时间样本（秒）
+
+    Returns:
+        包含count、avg、p50、p95、p99、max的统计
+    """
+    samples = sorted(samples)
+    return {
+        'count': len(samples),
+        'avg': round(sum(samples) / len(samples), 3) if samples else 0.0,
+        'p50': percentile(samples, 0.50),
+        'p95': percentile(samples, 0.95),
+        'p99': percentile(samples, 0.99),
+        'max': samples[-1] if samples else 0.0
+    }
+
+
+def get_queue_wait_stats(queue: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    获取各队列、各优先级最近的排队等待时间统计
+
+    Args:
+        queue: 只统计该队列（可选，默认全部队列）
+
+    Returns:
+        队列名称 -> 优先级级别名称 -> summarize_waits的统计
+    """
+    client = get_redis_client()
+    stats = {}
+    for member in sorted(name.decode() for name in client.smembers(INDEX_KEY)):
+        queue_name, priority = member.rsplit(':', 1)
+        if queue is not None and queue_name != queue:
+            continue
+        samples = [float(value) for value in client.lrange(SAMPLES_KEY_PREFIX + member, 0, -1)]
+        if samples:
+            stats.setdefault(queue_name, {})[priority] = summarize_waits(samples)
+    return stats
@@ -0,0 +1,71 @@
+"""
+Redis客户端工具，worker侧的资源协调功能共用同一个连接池
+"""
+
+import threading
+from typing import Callable
+from config import CELERY_BROKER_URL
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis_client():
+    """
+    获取连接到broker所在Redis的客户端，首次调用时创建
+
+    Returns:
+        redis.Redis实例
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import redis
+                _client = redis.Redis.from_url(CELERY_BROKER_URL)
+    return _client
+
+
+class RedisLease:
+    """
+    保存在Redis中的作业租约，持有期间由后台线程定期续期
+
+    持有者异常退出时不再续期，租约在到期后自动失效。
+    """
+
+    def __init__(self, job_id: str, renew: Callable[[str], None],
+                 release: Callable[[str], None], renew_interval: float):
+        """
+        初始化租约并启动续期线程
+
+        Args:
+            job_id: 作业标识
+            renew: 续期函数，参数为作业标识
+            release: 释放函数，参数为作业标识
+            renew_interval: 续期间隔（秒），应小于租约时长
+        """
+        self.job_id = job_id
+        self._renew = renew
+        self._release = release
+        self._renew_interval = renew_interval
+        self._stopped = threading.Event()
+        self._heartbeat = threading.Thread(target=self._renew_loop, daemon=True)
+        self._heartbeat.start()
+
+    def _renew_loop(self) -> None:
+        """
+        定期续期，直到租约被释放
+        """
+        while not self._stopped.wait(self._renew_interval):
+            try:
+                self._renew(self.job_id)
+            except Exception:
+                # 续期失败时等待下一次续期，租约时长留有余量
+                pass
+
+    def release(self) -> None:
+        """
+        停止续期并释放租约
+        """
+        self._stopped.set()
+        self._release(self.job_id)
@@ -1,49 +1,27 @@
-from celery_app import execute_datax_job, validate_datax_job
-import logging
+from celery import chord
+from celery_app import execute_datax_job, validate_datax_job, merge_datax_shard_results
+import asyncio
 import os
-from typing import Optional
-from config import LOG_LEVEL, LOG_DIR
-
-def setup_logging():
-    """
-    设置日志配置
-    """
-    # 确保日志目录存在
-    os.makedirs(LOG_DIR, exist_ok=True)
-    
-    # 获取当前模块的logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(LOG_LEVEL)
-    
-    # 清除现有的处理器
-    logger.handlers.clear()
-    
-    # 创建文件处理器
-    file_handler = logging.FileHandler(
-        os.path.join(LOG_DIR, 'tasks_scheduler.log'), 
-        encoding='utf-8'
-    )
-    file_handler.setLevel(LOG_LEVEL)
-    
-    # 创建控制台处理器
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(LOG_LEVEL)
-    
-    # 创建格式化器
-    formatter = logging.Formatter(
-        '%(asctime)s %(levelname)s %(name)s %(message)s'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # 添加处理器到记录器
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+import time
+import uuid
+from collections import Counter
+from typing import Optional, List, Dict, Any, Union, Iterator
+from config import JOB_CONFIG_CACHE_SIZE, LOG_STORE_DIR
+from execution_backends import ExecutionBackend, CeleryExecutionBackend, CancelResult
+from job_config_cache import JobConfigCache
+from job_sharding import compute_range_boundaries, split_job_config, RangeValue
+from quarantine import build_replay_config
+from job_validator import DataXJobValidator
+from job_templates import JobTemplateStore, check_job_source
+from log_store import JobLogStore
+import metrics
+from incremental_sync import WatermarkStore, references_watermark, check_watermark_key
+from fair_share import TenantFairShare, resolve_priority
+from queue_metrics import get_queue_wait_stats
+from logging_utils import setup_logging
 
 # 设置日志
-logger = setup_logging()
+logger = setup_logging(__name__)
 
 
 class DataXTaskScheduler:
@@ -51,40 +29,289 @@ class DataXTaskScheduler:
     DataX任务调度器，提供便捷的方法来调度和执行DataX作业
     """
 
-    def __init__(self):
+    def __init__(self, backend: Optional[ExecutionBackend] = None):
         """
         初始化任务调度器
+        
+        Args:
+            backend: 作业执行后端（可选），默认为CeleryExecutionBackend；
+                     没有broker的环境可以使用LocalExecutionBackend在本机执行
         """
-        pass
+        self.backend = backend or CeleryExecutionBackend()
+        # 用于分发前的本地配置校验，避免无效配置占用worker
+        self.config_cache = JobConfigCache(JOB_CONFIG_CACHE_SIZE)
+        self.validator = DataXJobValidator()
+        # 模板和已解析的作业配置共用同一缓存
+        self.templates = JobTemplateStore(cache=self.config_cache)
+        # 增量作业的高水位存储，首次使用时创建
+        self._watermark_store = None
+        # 作业完整输出的压缩存储，需要与worker使用同一目录
+        self.log_store = JobLogStore() if LOG_STORE_DIR else None
 
-    def schedule_job_execution(self, job_config_path: str, jvm_params: Optional[str] = None,
-                              job_params: Optional[str] = None, queue: str = 'celery') -> str:
+    def check_job_config(self, job_config_path: str) -> None:
         """
-        调度执行DataX作业
+        在本地校验DataX作业配置，配置无效时抛出异常
         
         Args:
             job_config_path: DataX作业配置文件路径
+            
+        Raises:
+            ValueError: 配置无效，异常信息包含全部错误
+        """
+        errors = self.config_cache.verdict(job_config_path, 'schema', self.validator.validate)
+        if errors:
+            raise ValueError(f"作业配置无效: {job_config_path}\n" + "\n".join(errors))
+
+    def load_job_source(self, job_config_path: Optional[str] = None, template: Optional[str] = None,
+                        template_params: Optional[Dict[str, Any]] = None,
+                        job_config: Optional[Dict[str, Any]] = None,
+                        validate: bool = True) -> Dict[str, Any]:
+        """
+        加载作业配置文件、渲染模板或直接使用内联配置，并在本地校验
+        
+        Args:
+            job_config_path: DataX作业配置文件路径（可选）
+            template: 作业模板ID（可选）
+            template_params: 模板参数（可选）
+            job_config: 内联作业配置（可选）
+            validate: 是否校验作业配置
+            
+        Returns:
+            作业配置
+            
+        Raises:
+            ValueError: 没有指定或同时指定了多个来源，或配置无效
+        """
+        check_job_source(job_config_path, template, job_config)
+        if job_config_path is not None:
+            if validate:
+                self.check_job_config(job_config_path)
+            return self.config_cache.load(job_config_path)
+        config = self.templates.render(template, template_params) if template is not None else job_config
+        if validate:
+            errors = self.validator.validate(config)
+            if errors:
+                raise ValueError(f"作业配置无效: {template or 'inline'}\n" + "\n".join(errors))
+        return config
+
+    def schedule_job_execution(self, job_config_path: Optional[str] = None, jvm_params: Optional[str] = None,
+                              job_params: Optional[str] = None, queue: str = 'celery',
+                              validate: bool = False, job_timeout: Optional[float] = None,
+                              stall_timeout: Optional[float] = None,
+                              incremental: Optional[Dict[str, Any]] = None,
+                              priority: Union[str, int, None] = None,
+                              tenant: Optional[str] = None,
+                              template: Optional[str] = None,
+                              template_params: Optional[Dict[str, Any]] = None,
+                              job_config: Optional[Dict[str, Any]] = None,
+                              quarantine: bool = False) -> str:
+        """
+        调度执行DataX作业
+        
+        作业配置可以是配置文件路径、模板ID加参数或内联配置三者之一。模板和内联配置不写入共享目录，
+        由worker渲染后直接交给DataX。
+        
+        Args:
+            job_config_path: DataX作业配置文件路径（可选）
             jvm_params: JVM参数（可选）
             job_params: 作业参数（可选）
             queue: 任务队列名称，默认为'datax'
+            validate: 是否在分发前校验作业配置，配置无效时抛出ValueError
+            job_timeout: 作业最长运行时间（秒），超时后终止作业，为None时使用JOB_TIMEOUT，为0时不限制
+            stall_timeout: 读写记录数持续多久没有变化时终止作业（秒），为None时使用JOB_STALL_TIMEOUT，
+                           为0时不检测
+            incremental: 增量配置（可选），指定时只同步上次成功运行之后的数据，见WatermarkStore.open_window
+            priority: 优先级（可选），'critical'、'high'、'normal'、'low'或0-9的数值，数值越小越优先，
+                      默认为DEFAULT_PRIORITY
+            tenant: 作业所属租户（可选），集群繁忙时按TENANT_WEIGHTS中的权重公平分配运行名额
+            template: 作业模板ID（可选），模板文件位于JOB_TEMPLATE_DIR
+            template_params: 模板参数（可选），替换模板中的${参数名}
+            job_config: 内联作业配置（可选）
+            quarantine: 是否隔离脏数据（可选），隔离模式下脏数据超过errorLimit时作业不会失败，
+                        脏数据写入隔离文件，可以用schedule_quarantine_replay在修复后只重放这些行
             
         Returns:
             任务ID
         """
-        logger.info(f"调度执行DataX作业: {job_config_path}")
+        job_name = job_config_path or template or 'inline'
+        logger.info("调度执行DataX作业: %s", job_name)
+        
+        check_job_source(job_config_path, template, job_config)
+        if incremental:
+            check_watermark_key(job_config_path, incremental)
+        if validate:
+            config = self.load_job_source(job_config_path, template, template_params, job_config)
+            if incremental and not references_watermark(config):
+                raise ValueError(f"增量作业的reader的where或querySql必须引用${{hwm_from}}: {job_name}")
         
         # 异步执行任务
-        task = execute_datax_job.apply_async(
-            args=[job_config_path],
-            kwargs={
-                'jvm_params': jvm_params,
-                'job_params': job_params
-            },
-            queue=queue
-        )
+        start = time.perf_counter()
+        task_id = self.backend.submit(job_config_path, jvm_params, job_params, queue,
+                                      job_timeout, stall_timeout, incremental, priority, tenant,
+                                      template, template_params, job_config, quarantine)
+        metrics.SUBMIT_SECONDS.labels(mode='single').observe(time.perf_counter() - start)
+        metrics.SUBMITTED_JOBS_TOTAL.labels(queue=queue, mode='single').inc()
         
-        logger.info(f"已提交作业执行任务，任务ID: {task.id}")
-        return task.id
+        logger.info("已提交作业执行任务，任务ID: %s", task_id)
+        return task_id
+
+    def schedule_jobs_bulk(self, job_specs: List[Dict[str, Any]], queue: str = 'celery',
+                           chunk_size: int = 500, validate: bool = False) -> List[str]:
+        """
+        批量调度执行DataX作业
+        
+        Celery执行后端下每个分块只从连接池获取一次生产者并复用同一个broker连接发布全部消息，
+        整批只记录一条汇总日志，避免逐个调用schedule_job_execution的连接和日志开销。
+        
+        Args:
+            job_specs: 作业描述列表，每项为包含job_config_path（或template、template_params，
+                       或job_config）以及可选的jvm_params、job_params、queue、job_timeout、
+                       stall_timeout、incremental、priority、tenant、quarantine的字典
+            queue: 作业描述中未指定queue时使用的任务队列名称，默认为'celery'
+            chunk_size: 每次获取生产者后连续发布的消息数
+            validate: 是否在分发前校验全部作业配置，任一配置无效时不提交任何作业并抛出ValueError
+            
+        Returns:
+            与job_specs顺序一致的任务ID列表
+        """
+        if validate:
+            for spec in job_specs:
+                self.load_job_source(spec.get('job_config_path'), spec.get('template'),
+                                     spec.get('template_params'), spec.get('job_config'))
+        
+        start = time.perf_counter()
+        task_ids = self.backend.submit_many(job_specs, queue, chunk_size)
+        metrics.SUBMIT_SECONDS.labels(mode='bulk').observe(time.perf_counter() - start)
+        for spec_queue, count in Counter(spec.get('queue', queue) for spec in job_specs).items():
+            metrics.SUBMITTED_JOBS_TOTAL.labels(queue=spec_queue, mode='bulk').inc(count)
+        
+        logger.info("已批量提交作业执行任务，作业数: %s", len(task_ids))
+        return task_ids
+
+    def schedule_sharded_job_execution(self, job_config_path: Optional[str], split_column: str,
+                                       num_shards: Optional[int] = None,
+                                       min_value: Optional[RangeValue] = None,
+                                       max_value: Optional[RangeValue] = None,
+                                       boundaries: Optional[List[RangeValue]] = None,
+                                       jvm_params: Optional[str] = None,
+                                       job_params: Optional[str] = None,
+                                       queue: str = 'celery',
+                                       priority: Union[str, int, None] = None,
+                                       tenant: Optional[str] = None,
+                                       template: Optional[str] = None,
+                                       template_params: Optional[Dict[str, Any]] = None,
+                                       job_config: Optional[Dict[str, Any]] = None,
+                                       quarantine: bool = False) -> str:
+        """
+        按切分列的取值范围将DataX作业拆分为多个子作业并行执行
+        
+        子作业以Celery group分发到集群中的各个worker，全部完成后由chord回调合并结果。
+        边界值可以直接通过boundaries给出，也可以通过min_value、max_value和num_shards均匀切分。
+        各分片的配置随任务消息内联发送，不需要共享目录。
+        
+        Args:
+            job_config_path: DataX作业配置文件路径，使用template或job_config时为None
+            split_column: 切分列名，必须是数值或日期类型的列
+            num_shards: 分片数量（与min_value、max_value一起使用）
+            min_value: 切分列的最小值
+            max_value: 切分列的最大值
+            boundaries: 递增的分片边界值列表（可选，优先于均匀切分）
+            jvm_params: JVM参数（可选）
+            job_params: 作业参数（可选）
+            queue: 任务队列名称，默认为'celery'
+            priority: 各分片的优先级（可选），见schedule_job_execution
+            tenant: 作业所属租户（可选），各分片分别占用租户的运行名额
+            template: 作业模板ID（可选），在本地渲染后切分
+            template_params: 模板参数（可选）
+            job_config: 内联作业配置（可选）
+            quarantine: 各分片是否隔离脏数据（可选），合并结果中的quarantined_records为各分片之和
+            
+        Returns:
+            合并结果任务的ID，可通过get_task_result_by_id(task_id, "merge")获取合并结果
+        """
+        logger.info("调度分片执行DataX作业: %s, 切分列: %s", job_config_path or template or 'inline', split_column)
+        
+        if not isinstance(self.backend, CeleryExecutionBackend):
+            raise ValueError("分片执行依赖Celery chord，只支持CeleryExecutionBackend")
+        
+        if boundaries is None:
+            if num_shards is None or min_value is None or max_value is None:
+                raise ValueError("未指定boundaries时必须同时指定num_shards、min_value和max_value")
+            boundaries = compute_range_boundaries(min_value, max_value, num_shards)
+        
+        priority = resolve_priority(priority)
+        config = self.load_job_source(job_config_path, template, template_params, job_config)
+        shard_configs = split_job_config(config, split_column, boundaries)
+        
+        shard_ids = [str(uuid.uuid4()) for _ in shard_configs]
+        shard_tasks = []
+        for index, shard_config in enumerate(shard_configs):
+            shard_tasks.append(execute_datax_job.signature(
+                kwargs={
+                    'jvm_params': jvm_params,
+                    'job_params': job_params,
+                    'tenant': tenant,
+                    'submitted_at': time.time(),
+                    'job_config': shard_config,
+                    'quarantine': quarantine
+                },
+                queue=queue,
+                priority=priority,
+                task_id=shard_ids[index]
+            ))
+        
+        self.backend.record_queued([(shard_id, tenant) for shard_id in shard_ids])
+        start = time.perf_counter()
+        result = chord(shard_tasks)(merge_datax_shard_results.signature(queue=queue, priority=priority))
+        metrics.SUBMIT_SECONDS.labels(mode='sharded').observe(time.perf_counter() - start)
+        metrics.SUBMITTED_JOBS_TOTAL.labels(queue=queue, mode='sharded').inc(len(shard_tasks))
+        
+        logger.info("已提交分片作业，分片数: %s，合并任务ID: %s", len(shard_tasks), result.id)
+        return result.id
+
+    def schedule_quarantine_replay(self, quarantine_file: str, key_column: str,
+                                   job_config_path: Optional[str] = None,
+                                   jvm_params: Optional[str] = None,
+                                   job_params: Optional[str] = None,
+                                   queue: str = 'celery',
+                                   priority: Union[str, int, None] = None,
+                                   tenant: Optional[str] = None,
+                                   template: Optional[str] = None,
+                                   template_params: Optional[Dict[str, Any]] = None,
+                                   job_config: Optional[Dict[str, Any]] = None,
+                                   quarantine: bool = True) -> str:
+        """
+        只重放隔离文件中的脏数据对应的行
+        
+        按隔离文件中记录的主键限定reader的where条件，生成的作业配置随任务消息内联发送。
+        作业来源通常与原作业相同，也可以是修复后的配置；writer的preSql和postSql不会执行。
+        
+        Args:
+            quarantine_file: 原作业结果中的quarantine_file，需要能从调度端读取
+            key_column: 主键列名，必须出现在reader的column中
+            job_config_path: DataX作业配置文件路径，使用template或job_config时为None
+            jvm_params: JVM参数（可选）
+            job_params: 作业参数（可选）
+            queue: 任务队列名称，默认为'celery'
+            priority: 优先级（可选），见schedule_job_execution
+            tenant: 作业所属租户（可选）
+            template: 作业模板ID（可选）
+            template_params: 模板参数（可选）
+            job_config: 内联作业配置（可选）
+            quarantine: 重放作业是否继续隔离脏数据，默认为True，仍无法写入的行写入新的隔离文件
+            
+        Returns:
+            重放作业的任务ID
+            
+        Raises:
+            ValueError: reader不支持按主键重放，或隔离文件中没有主键
+        """
+        config = self.load_job_source(job_config_path, template, template_params, job_config)
+        replay_config = build_replay_config(config, quarantine_file, key_column)
+        logger.info("重放隔离的脏数据: %s, 主键列: %s", quarantine_file, key_column)
+        return self.schedule_job_execution(jvm_params=jvm_params, job_params=job_params, queue=queue,
+                                           priority=priority, tenant=tenant, job_config=replay_config,
+                                           quarantine=quarantine)
 
     def schedule_job_validation(self, job_config_path: str, queue: str = 'celery') -> str:
         """
@@ -97,7 +324,7 @@ class DataXTaskScheduler:
         Returns:
             任务ID
         """
-        logger.info(f"调度验证DataX作业配置: {job_config_path}")
+        logger.info("调度验证DataX作业配置: %s", job_config_path)
         
         # 异步执行任务
         task = validate_datax_job.apply_async(
@@ -105,7 +332,7 @@ class DataXTaskScheduler:
             queue=queue
         )
         
-        logger.info(f"已提交作业验证任务，任务ID: {task.id}")
+        logger.info("已提交作业验证任务，任务ID: %s", task.id)
         return task.id
 
     def get_task_result(self, task_id: str):
@@ -118,10 +345,10 @@ class DataXTaskScheduler:
         Returns:
             任务执行结果
         """
-        logger.info(f"获取任务执行结果，任务ID: {task_id}")
+        logger.info("获取任务执行结果，任务ID: %s", task_id)
         
         # 获取任务结果
-        result = execute_datax_job.AsyncResult(task_id)
+        result = self.backend.get_result(task_id)
         return result
 
     def get_task_result_by_id(self, task_id: str, task_type: str = "execute"):
@@ -130,19 +357,22 @@ class DataXTaskScheduler:
         
         Args:
             task_id: 任务ID
-            task_type: 任务类型，"execute" 或 "validate"
+            task_type: 任务类型，"execute"、"validate" 或 "merge"（分片作业的合并结果）
             
         Returns:
             任务执行结果
         """
-        logger.info(f"获取{task_type}类型任务执行结果，任务ID: {task_id}")
+        logger.info("获取%s类型任务执行结果，任务ID: %s", task_type, task_id)
         
         if task_type == "execute":
             # 获取execute_datax_job任务结果
-            result = execute_datax_job.AsyncResult(task_id)
+            result = self.backend.get_result(task_id)
         elif task_type == "validate":
             # 获取validate_datax_job任务结果
             result = validate_datax_job.AsyncResult(task_id)
+        elif task_type == "merge":
+            # 获取merge_datax_shard_results任务结果
+            result = merge_datax_shard_results.AsyncResult(task_id)
         else:
             raise ValueError(f"不支持的任务类型: {task_type}")
             
@@ -158,8 +388,8 @@ class DataXTaskScheduler:
         Returns:
             任务执行结果
         """
-        logger.info(f"获取execute_datax_job任务执行结果，任务ID: {task_id}")
-        return execute_datax_job.AsyncResult(task_id)
+        logger.info("获取execute_datax_job任务执行结果，任务ID: %s", task_id)
+        return self.backend.get_result(task_id)
 
     def get_validate_datax_job_result(self, task_id: str):
         """
@@ -171,21 +401,161 @@ class DataXTaskScheduler:
         Returns:
             任务执行结果（布尔值，表示配置文件是否有效）
         """
-        logger.info(f"获取validate_datax_job任务执行结果，任务ID: {task_id}")
+        logger.info("获取validate_datax_job任务执行结果，任务ID: %s", task_id)
         return validate_datax_job.AsyncResult(task_id)
 
-    def cancel_task(self, task_id: str) -> bool:
+    def iter_job_log(self, task_id: str, encoding: str = 'utf-8') -> Iterator[str]:
+        """
+        逐行读取已结束作业的完整输出
+        
+        结果中有log_key时从作业日志存储中边解压边读取，不会把完整输出一次性载入内存；
+        否则读取结果中的本地日志文件（只在运行作业的主机上可用）。
+        
+        Args:
+            task_id: 作业执行任务的ID
+            encoding: 文本编码
+            
+        Returns:
+            日志行（包含换行符）的迭代器
+            
+        Raises:
+            ValueError: 任务尚未结束或结果不是作业执行结果
+            FileNotFoundError: 日志已不存在
+        """
+        result = self.backend.get_result(task_id)
+        info = result.result if result.ready() else None
+        if not isinstance(info, dict) or 'log_key' not in info:
+            raise ValueError(f"任务尚未结束或不是作业执行任务: {task_id}")
+        if info['log_key'] and self.log_store is not None:
+            if not self.log_store.exists(info['log_key']):
+                raise FileNotFoundError(f"作业日志不存在: {info['log_key']}")
+            return self.log_store.iter_lines(info['log_key'], encoding)
+        log_file = info.get('log_file')
+        if not log_file or not os.path.exists(log_file):
+            raise FileNotFoundError(f"作业日志不存在: {task_id}")
+        
+        def read_lines():
+            with open(log_file, 'r', encoding=encoding, errors='replace') as f:
+                yield from f
+        
+        return read_lines()
+
+    def get_task_statuses(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取作业执行任务的状态
+        
+        Celery执行后端下，键值型结果后端（如Redis）按分块使用MGET一次取回多个任务的状态。
+        
+        Args:
+            task_ids: 任务ID列表
+            
+        Returns:
+            任务ID到状态信息的映射，状态信息包含state和info（进度信息、执行结果或异常）
+        """
+        statuses = self.backend.get_statuses(task_ids)
+        logger.info("批量获取任务状态，任务数: %s", len(task_ids))
+        return statuses
+
+    async def wait_any(self, task_ids: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        异步等待任意一个任务结束
+        
+        Args:
+            task_ids: 任务ID列表
+            timeout: 最长等待时间（秒），超时抛出asyncio.TimeoutError
+            
+        Returns:
+            已结束任务的ID到状态信息的映射（至少包含一个任务）
+        """
+        return await asyncio.wait_for(self.backend.wait_for(task_ids, 1), timeout)
+
+    async def wait_all(self, task_ids: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        异步等待全部任务结束
+        
+        Celery执行后端使用Redis结果后端时订阅结果频道等待通知，不需要轮询。
+        
+        Args:
+            task_ids: 任务ID列表
+            timeout: 最长等待时间（秒），超时抛出asyncio.TimeoutError
+            
+        Returns:
+            全部任务的ID到状态信息的映射
+        """
+        return await asyncio.wait_for(self.backend.wait_for(task_ids, len(set(task_ids))), timeout)
+
+    def _watermarks(self) -> WatermarkStore:
+        if self._watermark_store is None:
+            self._watermark_store = WatermarkStore()
+        return self._watermark_store
+
+    def get_watermark(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        获取增量作业的高水位
+        
+        Args:
+            key: 高水位名称，默认为作业配置文件名（不含扩展名）
+            
+        Returns:
+            包含value、type、updated_at、task_id的字典，尚未成功运行过时返回None
+        """
+        return self._watermarks().get(key)
+
+    def reset_watermark(self, key: str, value: Optional[str] = None,
+                        watermark_type: str = 'datetime') -> None:
+        """
+        重置增量作业的高水位，用于首次初始化或重新同步某个区间
+        
+        Args:
+            key: 高水位名称
+            value: 新的高水位，为None时删除高水位，下一次运行从增量配置的initial开始
+            watermark_type: 高水位类型，'int'或'datetime'
+        """
+        logger.info("重置增量作业高水位: %s, 新值: %s", key, value)
+        if value is None:
+            self._watermarks().delete(key)
+        else:
+            self._watermarks().set(key, value, watermark_type)
+
+    def get_queue_wait_stats(self, queue: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        获取各队列、各优先级最近的排队等待时间统计（从提交到开始执行）
+        
+        Args:
+            queue: 只统计该队列（可选，默认全部队列）
+            
+        Returns:
+            队列名称 -> 优先级级别名称 -> 包含count、avg、p50、p95、p99、max（秒）的统计
+        """
+        return get_queue_wait_stats(queue)
+
+    def get_tenant_usage(self) -> Dict[str, Dict[str, int]]:
+        """
+        查询各租户运行中和排队中的作业数
+        
+        Returns:
+            租户到{'running': 运行数, 'queued': 排队数}的映射
+        """
+        return TenantFairShare().usage()
+
+    def cancel_task(self, task_id: str) -> CancelResult:
         """
         取消任务执行
         
+        正在运行的作业由所在worker终止整个DataX进程组（datax.py及其JVM），
+        先发送SIGTERM，宽限期后仍未退出的进程发送SIGKILL。
+        
         Args:
             task_id: 任务ID
             
         Returns:
-            是否成功取消
+            CancelResult，包含cancelled（是否已发出取消）和reaped（被终止的DataX相关进程数），
+            作为条件判断时取cancelled，与原先返回布尔值时的写法兼容
         """
-        logger.info(f"取消任务执行，任务ID: {task_id}")
+        logger.info("取消任务执行，任务ID: %s", task_id)
         
         # 取消任务
-        result = execute_datax_job.control.revoke(task_id, terminate=True)
-        return result is not None
\ No newline at end of file
+        result = self.backend.cancel(task_id)
+        
+        logger.info("已取消任务，任务ID: %s, 终止进程数: %s", task_id, result['reaped'])
+        return result
\ No newline at end of file